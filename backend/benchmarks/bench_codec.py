@@ -0,0 +1,66 @@
+"""
+Decode cost per item: dynamo_codec vs boto3's TypeDeserializer, on a
+roster-sized page of assignment items as the low-level client returns them.
+
+    python benchmarks/bench_codec.py [--items 200] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "common", "python"))
+
+from boto3.dynamodb.types import TypeDeserializer  # noqa: E402
+
+import dynamo_codec  # noqa: E402
+
+
+def assignment(i):
+    event_id = f"0190b6b2-{i:04x}-7000-8000-000000000001"
+    return dynamo_codec.encode_item({
+        "PK": f"USER#0190b6b2-{i:04x}-7000-8000-00000000abcd",
+        "SK": f"EVENT#{event_id}",
+        "GSI1PK": f"EVENT#{event_id}",
+        "GSI1SK": f"USER#0190b6b2-{i:04x}-7000-8000-00000000abcd",
+        "GSI2PK": f"USER#0190b6b2-{i:04x}-7000-8000-00000000abcd",
+        "GSI2SK": f"2026-05-17T18:00:00Z#{event_id}",
+        "eventId": event_id,
+        "userId": f"0190b6b2-{i:04x}-7000-8000-00000000abcd",
+        "email": f"guest{i}@example.com",
+        "title": "Match day",
+        "date": "2026-05-17T18:00:00Z",
+        "location": "San Siro",
+        "status": "CONFIRMED",
+        "assignedBy": "admin",
+        "assignedAt": "2026-05-01T09:30:00",
+        "attendeeCount": 120 + i,
+        "confirmedCount": 118 + i,
+        "checkedIn": i % 2 == 0,
+        "meta": {"seat": i, "tags": ["vip", "press"]},
+    })
+
+
+def main():
+    args = argparse.ArgumentParser()
+    args.add_argument("--items", type=int, default=200)
+    args.add_argument("--repeat", type=int, default=5)
+    opts = args.parse_args()
+
+    page = [assignment(i) for i in range(opts.items)]
+    deserializer = TypeDeserializer()
+
+    def boto3_decode():
+        return [{k: deserializer.deserialize(v) for k, v in item.items()} for item in page]
+
+    def codec_decode():
+        return [dynamo_codec.decode_item(item) for item in page]
+
+    for name, fn in (("TypeDeserializer", boto3_decode), ("dynamo_codec", codec_decode)):
+        number = max(1, 20_000 // opts.items)
+        best = min(timeit.repeat(fn, number=number, repeat=opts.repeat))
+        print(f"{name:<18} {best / number / opts.items * 1e6:8.2f} µs/item")
+
+
+if __name__ == "__main__":
+    main()
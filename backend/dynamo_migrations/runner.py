@@ -0,0 +1,213 @@
+"""
+Run a DynamoDB data migration from dynamo_migrations/versions over the
+whole table: a segmented parallel Scan, writes throttled to a capacity
+budget, and a checkpoint file so an interrupted run resumes where it
+stopped.
+
+    python dynamo_migrations/runner.py 0005_normalize_event_dates --table flycalcio-app-dev-table \
+        [--segments 8] [--write-rate 100] [--checkpoint-dir .migrations] [--dry-run] [--restart]
+
+A migration module defines:
+
+    SCAN = {...}              # extra Scan kwargs (FilterExpression, ProjectionExpression, ...)
+    def apply(ctx, item):     # migrate one item, return an outcome name for the stats
+        ...
+
+and writes through ctx.update_item / ctx.put_item / ctx.delete_item,
+which take a write token and do nothing under --dry-run. apply must be
+idempotent: after a resume, the items of the page in flight are seen again.
+"""
+import argparse
+import importlib.util
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+import boto3
+from botocore.exceptions import ClientError
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+VERSIONS_DIR = os.path.join(HERE, "versions")
+# Migrations may import the shared Lambda layer (dates, dynamo_batch, ...)
+sys.path.insert(0, os.path.join(HERE, "..", "src", "common", "python"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second, bursts up to `capacity`."""
+
+    def __init__(self, rate, capacity=None, clock=time.monotonic, sleep=time.sleep):
+        self.rate = rate
+        self.capacity = capacity or rate
+        self.tokens = self.capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        # Take the tokens now, going into debt if needed, then wait the debt off:
+        # concurrent callers queue up behind each other instead of racing.
+        with self._lock:
+            now = self._clock()
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self.tokens -= n
+            wait = -self.tokens / self.rate
+        if wait > 0:
+            self._sleep(wait)
+
+
+class Checkpoint:
+    """
+    Per-segment progress in a JSON file: the last fully processed page's
+    LastEvaluatedKey, whether the segment is done, and its stats.
+    Written atomically after every page.
+    """
+
+    def __init__(self, path, total_segments):
+        self.path = path
+        self._lock = threading.Lock()
+        self.state = {"segments": total_segments, "progress": {}}
+        if path and os.path.exists(path):
+            with open(path) as f:
+                saved = json.load(f)
+            if saved["segments"] != total_segments:
+                raise ValueError(
+                    f"Checkpoint {path} was written with {saved['segments']} segments; "
+                    "resume with the same --segments or pass --restart"
+                )
+            self.state = saved
+
+    def segment(self, segment):
+        return self.state["progress"].get(str(segment), {"lastKey": None, "done": False, "stats": {}})
+
+    def save(self, segment, last_key, stats):
+        with self._lock:
+            self.state["progress"][str(segment)] = {
+                "lastKey": last_key,
+                "done": last_key is None,
+                "stats": dict(stats),
+            }
+            if not self.path:
+                return
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump(self.state, f)
+            os.replace(tmp, self.path)
+
+
+class MigrationContext:
+    """What apply() gets: the table plus throttled, dry-run aware writes."""
+
+    def __init__(self, table, limiter=None, dry_run=False):
+        self.table = table
+        self.dry_run = dry_run
+        self._limiter = limiter
+
+    def _write(self, method, kwargs):
+        if self.dry_run:
+            return True
+        if self._limiter:
+            self._limiter.acquire()
+        try:
+            method(**kwargs)
+            return True
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    # Each returns False if the write's condition failed
+    def update_item(self, **kwargs):
+        return self._write(self.table.update_item, kwargs)
+
+    def put_item(self, **kwargs):
+        return self._write(self.table.put_item, kwargs)
+
+    def delete_item(self, **kwargs):
+        return self._write(self.table.delete_item, kwargs)
+
+
+def load_migration(name):
+    path = os.path.join(VERSIONS_DIR, name if name.endswith(".py") else f"{name}.py")
+    spec = importlib.util.spec_from_file_location(f"dynamo_migration_{name}", path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    if not hasattr(module, "apply"):
+        raise ValueError(f"{name} has no apply(ctx, item); run it as a script instead")
+    return module
+
+
+def run(table, migration, segments=8, write_rate=None, checkpoint=None, dry_run=False,
+        page_size=None, log=print):
+    """
+    Apply `migration` to every item of the table. Returns the outcome counts.
+    `checkpoint` is a Checkpoint (or None to run without one).
+    """
+    checkpoint = checkpoint or Checkpoint(None, segments)
+    ctx = MigrationContext(table, TokenBucket(write_rate) if write_rate else None, dry_run)
+    scan_kwargs = dict(getattr(migration, "SCAN", {}))
+    if page_size:
+        scan_kwargs["Limit"] = page_size
+
+    def run_segment(segment):
+        progress = checkpoint.segment(segment)
+        stats = Counter(progress["stats"])
+        if progress["done"]:
+            return stats
+
+        kwargs = {**scan_kwargs, "Segment": segment, "TotalSegments": segments}
+        if progress["lastKey"]:
+            kwargs["ExclusiveStartKey"] = progress["lastKey"]
+        while True:
+            resp = table.scan(**kwargs)
+            for item in resp["Items"]:
+                stats[migration.apply(ctx, item) or "skipped"] += 1
+            stats["scanned"] += resp.get("ScannedCount", len(resp["Items"]))
+            last_key = resp.get("LastEvaluatedKey")
+            checkpoint.save(segment, last_key, stats)
+            if not last_key:
+                log(f"segment {segment}: done {dict(stats)}")
+                return stats
+            kwargs["ExclusiveStartKey"] = last_key
+
+    totals = Counter()
+    with ThreadPoolExecutor(max_workers=segments) as pool:
+        for stats in pool.map(run_segment, range(segments)):
+            totals.update(stats)
+    return dict(totals)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("migration", help="file name in dynamo_migrations/versions, without .py")
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--segments", type=int, default=8)
+    parser.add_argument("--write-rate", type=float, help="max writes per second across all segments")
+    parser.add_argument("--page-size", type=int)
+    parser.add_argument("--checkpoint-dir", default=".migrations")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    migration = load_migration(args.migration)
+    path = None
+    if not args.dry_run:
+        os.makedirs(args.checkpoint_dir, exist_ok=True)
+        path = os.path.join(args.checkpoint_dir, f"{args.table}.{args.migration}.json")
+        if args.restart and os.path.exists(path):
+            os.remove(path)
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    print(run(
+        table, migration,
+        segments=args.segments,
+        write_rate=args.write_rate,
+        checkpoint=Checkpoint(path, args.segments),
+        dry_run=args.dry_run,
+        page_size=args.page_size,
+    ))
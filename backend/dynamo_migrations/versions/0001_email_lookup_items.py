@@ -0,0 +1,77 @@
+"""
+Backfill EMAIL#<email> / EMAIL login records for users registered before
+they existed (see src/auth/src/users.py).
+
+    python dynamo_migrations/versions/0001_email_lookup_items.py --table flycalcio-app-dev-table [--dry-run]
+
+Safe to re-run: items are written with attribute_not_exists(PK). Two
+profiles whose emails only differ by case are reported as conflicts and
+must be merged by hand.
+"""
+import argparse
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+
+def normalize_email(email):
+    # Must match src/auth/src/users.normalize_email
+    return email.strip().lower()
+
+
+def email_item(profile):
+    item = {
+        "PK": f"EMAIL#{normalize_email(profile['email'])}",
+        "SK": "EMAIL",
+        "userId": profile["userId"],
+        "email": profile["email"],
+        "role": profile["role"],
+    }
+    if profile.get("password"):
+        item["password"] = profile["password"]
+    return item
+
+
+def user_profiles(table):
+    kwargs = {
+        "IndexName": "GSI1",
+        "KeyConditionExpression": Key("GSI1PK").eq("USER"),
+    }
+    while True:
+        resp = table.query(**kwargs)
+        yield from resp["Items"]
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def migrate(table, dry_run=False):
+    stats = {"created": 0, "existing": 0, "conflicts": []}
+    for profile in user_profiles(table):
+        item = email_item(profile)
+        if dry_run:
+            stats["created"] += 1
+            continue
+        try:
+            table.put_item(Item=item, ConditionExpression="attribute_not_exists(PK)")
+            stats["created"] += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+            existing = table.get_item(Key={"PK": item["PK"], "SK": "EMAIL"}, ConsistentRead=True)["Item"]
+            if existing["userId"] == profile["userId"]:
+                stats["existing"] += 1
+            else:
+                stats["conflicts"].append({"email": profile["email"], "userIds": [existing["userId"], profile["userId"]]})
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    print(migrate(table, dry_run=args.dry_run))
@@ -0,0 +1,84 @@
+"""
+Copy the event summary (title, date, location), the user's email and the
+GSI2 "my events" keys onto USER#<id> / EVENT#<id> assignments written before they carried
+them (see assign_user_to_event in src/events/handler.py).
+
+    python dynamo_migrations/versions/0002_assignment_event_summaries.py --table flycalcio-app-dev-table [--dry-run]
+
+Safe to re-run: assignments are rewritten from the current event item.
+"""
+import argparse
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+SUMMARY_FIELDS = ("title", "date", "location")
+
+
+def assignments(table):
+    kwargs = {
+        "FilterExpression": Attr("PK").begins_with("USER#") & Attr("SK").begins_with("EVENT#"),
+    }
+    while True:
+        resp = table.scan(**kwargs)
+        yield from resp["Items"]
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def migrate(table, dry_run=False):
+    events = {}
+    emails = {}
+    stats = {"updated": 0, "orphans": 0}
+    for assignment in assignments(table):
+        event_id = assignment["SK"].split("#", 1)[1]
+        user_id = assignment["PK"].split("#", 1)[1]
+        if event_id not in events:
+            events[event_id] = table.get_item(Key={"PK": f"EVENT#{event_id}", "SK": "METADATA"}).get("Item")
+        event_item = events[event_id]
+        if user_id not in emails:
+            profile = table.get_item(Key={"PK": f"USER#{user_id}", "SK": "PROFILE"}).get("Item") or {}
+            emails[user_id] = profile.get("email")
+        if event_item is None:
+            stats["orphans"] += 1
+            continue
+        if dry_run:
+            stats["updated"] += 1
+            continue
+
+        values = {f":{f}": event_item.get(f) for f in SUMMARY_FIELDS}
+        values.update({
+            ":gsi2pk": f"USER#{user_id}",
+            ":gsi2sk": f"{event_item['date']}#{event_id}",
+            ":eventId": event_id,
+            ":userId": user_id,
+            ":email": emails[user_id],
+        })
+        try:
+            table.update_item(
+                Key={"PK": assignment["PK"], "SK": assignment["SK"]},
+                UpdateExpression=(
+                    "SET " + ", ".join(f"#{f} = :{f}" for f in SUMMARY_FIELDS)
+                    + ", GSI2PK = :gsi2pk, GSI2SK = :gsi2sk, eventId = :eventId, userId = :userId, email = :email"
+                ),
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeNames={f"#{f}": f for f in SUMMARY_FIELDS},
+                ExpressionAttributeValues=values,
+            )
+            stats["updated"] += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    print(migrate(table, dry_run=args.dry_run))
@@ -0,0 +1,83 @@
+"""
+Initialise attendeeCount and the per-status counters on EVENT#<id> /
+METADATA from the current roster (see assign_user_to_event in
+src/events/handler.py, which maintains them from then on).
+
+    python dynamo_migrations/versions/0003_event_attendee_counts.py --table flycalcio-app-dev-table [--dry-run]
+
+Counts are recomputed from scratch, so the script is safe to re-run, but
+it must run while no assignments are being changed: an assign/remove
+landing between the roster count and the write is overwritten.
+"""
+import argparse
+from collections import Counter
+
+import boto3
+from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+
+
+def status_count_field(status):
+    # Must match src/events/handler._status_count_field
+    return f"{status.lower()}Count"
+
+
+def paginate(method, **kwargs):
+    while True:
+        resp = method(**kwargs)
+        yield from resp["Items"]
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def roster_counts(table, event_id):
+    counts = Counter({"CONFIRMED": 0})
+    counts.update(
+        a.get("status", "CONFIRMED")
+        for a in paginate(
+            table.query,
+            IndexName="GSI1",
+            KeyConditionExpression=Key("GSI1PK").eq(f"EVENT#{event_id}") & Key("GSI1SK").begins_with("USER#"),
+            ProjectionExpression="#status",
+            ExpressionAttributeNames={"#status": "status"},
+        )
+    )
+    return counts
+
+
+def migrate(table, dry_run=False):
+    stats = {"events": 0, "assignments": 0}
+    events = paginate(table.query, IndexName="GSI1", KeyConditionExpression=Key("GSI1PK").eq("EVENT"))
+    for event_item in events:
+        counts = roster_counts(table, event_item["eventId"])
+        stats["events"] += 1
+        stats["assignments"] += sum(counts.values())
+        if dry_run:
+            continue
+
+        names = {f"#s{i}": status_count_field(s) for i, s in enumerate(counts)}
+        values = {f":s{i}": n for i, n in enumerate(counts.values())}
+        values[":total"] = sum(counts.values())
+        try:
+            table.update_item(
+                Key={"PK": event_item["PK"], "SK": "METADATA"},
+                UpdateExpression="SET attendeeCount = :total" + "".join(f", #s{i} = :s{i}" for i in range(len(counts))),
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    print(migrate(table, dry_run=args.dry_run))
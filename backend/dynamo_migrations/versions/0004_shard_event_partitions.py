@@ -0,0 +1,74 @@
+"""
+Move EVENT#<id> / METADATA items out of the single GSI1 partition
+GSI1PK="EVENT" into the sharded month buckets EVENTS#<yyyy-mm>#<shard>,
+with GSI1SK=<date>#<eventId> (see event_index_keys in
+src/common/python/repositories.py). Run 0003 first: it still reads the old partition.
+
+    python dynamo_migrations/versions/0004_shard_event_partitions.py --table flycalcio-app-dev-table [--shards 4] [--dry-run]
+
+--shards must match the EVENT_SHARDS of the deployed handler. Also use
+this script to re-shard: it rewrites the keys of every event it finds in
+either layout, so it is safe to re-run.
+"""
+import argparse
+import os
+import sys
+
+import boto3
+from boto3.dynamodb.conditions import Attr
+from botocore.exceptions import ClientError
+
+# The key builders of the shared Lambda layer, as the runner does
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..", "src", "common", "python"))
+from repositories import event_index_keys  # noqa: E402
+
+
+def events(table):
+    kwargs = {
+        "FilterExpression": Attr("PK").begins_with("EVENT#") & Attr("SK").eq("METADATA"),
+        "ProjectionExpression": "PK, eventId, #date, GSI1PK, GSI1SK",
+        "ExpressionAttributeNames": {"#date": "date"},
+    }
+    while True:
+        resp = table.scan(**kwargs)
+        yield from resp["Items"]
+        if "LastEvaluatedKey" not in resp:
+            return
+        kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+
+def migrate(table, shards, dry_run=False):
+    stats = {"moved": 0, "unchanged": 0}
+    for event_item in events(table):
+        keys = event_index_keys(event_item["date"], event_item["eventId"], shards)
+        if all(event_item.get(k) == v for k, v in keys.items()):
+            stats["unchanged"] += 1
+            continue
+        if dry_run:
+            stats["moved"] += 1
+            continue
+        try:
+            table.update_item(
+                Key={"PK": event_item["PK"], "SK": "METADATA"},
+                UpdateExpression="SET GSI1PK = :pk, GSI1SK = :sk",
+                # Skip events whose date changed since the scan read them
+                ConditionExpression="#date = :date",
+                ExpressionAttributeNames={"#date": "date"},
+                ExpressionAttributeValues={":pk": keys["GSI1PK"], ":sk": keys["GSI1SK"], ":date": event_item["date"]},
+            )
+            stats["moved"] += 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+                raise
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--table", required=True)
+    parser.add_argument("--shards", type=int, default=4)
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+
+    table = boto3.resource("dynamodb").Table(args.table)
+    print(migrate(table, args.shards, dry_run=args.dry_run))
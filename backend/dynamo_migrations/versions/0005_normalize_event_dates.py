@@ -0,0 +1,53 @@
+"""
+Rewrite event dates stored verbatim from clients as UTC sort keys
+(2026-05-17T18:00:00Z, see src/common/python/dates.py), together with the
+keys derived from them: GSI1 on EVENT#/METADATA and GSI2SK on USER#/EVENT#
+assignments.
+
+    python dynamo_migrations/runner.py 0005_normalize_event_dates --table flycalcio-app-dev-table [--write-rate 100]
+
+Old values are parsed leniently; set DATES_DAYFIRST=1 if they were
+written as dd/mm/yyyy. EVENT_SHARDS must match the deployed handler.
+Dates that cannot be parsed are counted as "unparseable" and left alone.
+"""
+import os
+
+from dates import to_sort_key
+from repositories import event_index_keys, user_events_sort_key
+
+DAYFIRST = os.environ.get("DATES_DAYFIRST") == "1"
+
+SCAN = {
+    "FilterExpression": "attribute_exists(#date) AND (SK = :metadata OR begins_with(SK, :event))",
+    "ProjectionExpression": "PK, SK, eventId, #date, GSI1PK, GSI1SK, GSI2SK",
+    "ExpressionAttributeNames": {"#date": "date"},
+    "ExpressionAttributeValues": {":metadata": "METADATA", ":event": "EVENT#"},
+}
+
+
+def apply(ctx, item):
+    if not (item["PK"].startswith("EVENT#") or item["PK"].startswith("USER#")):
+        return "skipped"
+    try:
+        date = to_sort_key(item["date"], lenient=True, dayfirst=DAYFIRST)
+    except ValueError:
+        return "unparseable"
+
+    event_id = item.get("eventId") or item["PK" if item["SK"] == "METADATA" else "SK"].split("#", 1)[1]
+    if item["SK"] == "METADATA":
+        keys = event_index_keys(date, event_id)
+    else:
+        keys = {"GSI2SK": user_events_sort_key(date, event_id)}
+
+    if item["date"] == date and all(item.get(k) == v for k, v in keys.items()):
+        return "unchanged"
+
+    updated = ctx.update_item(
+        Key={"PK": item["PK"], "SK": item["SK"]},
+        UpdateExpression="SET #date = :new, " + ", ".join(f"{k} = :{k}" for k in keys),
+        # An event edited since the scan already holds a normalized date
+        ConditionExpression="#date = :old",
+        ExpressionAttributeNames={"#date": "date"},
+        ExpressionAttributeValues={":new": date, ":old": item["date"], **{f":{k}": v for k, v in keys.items()}},
+    )
+    return "normalized" if updated else "changed_concurrently"
@@ -0,0 +1,38 @@
+"""
+Delete USER#<id> / EVENT#<id> assignments left behind by events deleted
+before delete_event purged the roster (see src/events/handler.py).
+
+    python dynamo_migrations/runner.py 0006_purge_orphaned_assignments --table flycalcio-app-dev-table [--dry-run]
+"""
+import threading
+
+SCAN = {
+    "FilterExpression": "begins_with(PK, :user) AND begins_with(SK, :event)",
+    "ProjectionExpression": "PK, SK",
+    "ExpressionAttributeValues": {":user": "USER#", ":event": "EVENT#"},
+}
+
+# eventId -> METADATA exists, shared by the scan segments
+_events = {}
+_lock = threading.Lock()
+
+
+def event_exists(table, event_id):
+    with _lock:
+        if event_id in _events:
+            return _events[event_id]
+    exists = "Item" in table.get_item(
+        Key={"PK": f"EVENT#{event_id}", "SK": "METADATA"},
+        ProjectionExpression="PK",
+    )
+    with _lock:
+        _events[event_id] = exists
+    return exists
+
+
+def apply(ctx, item):
+    event_id = item["SK"].split("#", 1)[1]
+    if event_exists(ctx.table, event_id):
+        return "kept"
+    ctx.delete_item(Key={"PK": item["PK"], "SK": item["SK"]})
+    return "deleted"
@@ -0,0 +1,32 @@
+"""
+Add the GSI2 "recently created" keys (CREATED#<kind>#<shard> / creation
+sort key, see src/common/python/created_index.py) to event METADATA and
+user PROFILE items written before ids were time-ordered. Their uuid4 ids
+are ordered by createdAt instead.
+
+    python dynamo_migrations/runner.py 0007_creation_order_keys --table flycalcio-app-dev-table [--dry-run]
+
+CREATED_SHARDS must match the deployed functions.
+"""
+from created_index import created_keys
+
+SCAN = {
+    "FilterExpression": "(SK = :metadata OR SK = :profile) AND attribute_not_exists(GSI2PK)",
+    "ProjectionExpression": "PK, SK, createdAt",
+    "ExpressionAttributeValues": {":metadata": "METADATA", ":profile": "PROFILE"},
+}
+
+KINDS = {"METADATA": "EVENT", "PROFILE": "USER"}
+
+
+def apply(ctx, item):
+    if not item.get("createdAt"):
+        return "no_created_at"
+    keys = created_keys(KINDS[item["SK"]], item["PK"].split("#", 1)[1], item["createdAt"])
+    updated = ctx.update_item(
+        Key={"PK": item["PK"], "SK": item["SK"]},
+        UpdateExpression="SET GSI2PK = :pk, GSI2SK = :sk",
+        ConditionExpression="attribute_exists(PK) AND attribute_not_exists(GSI2PK)",
+        ExpressionAttributeValues={":pk": keys["GSI2PK"], ":sk": keys["GSI2SK"]},
+    )
+    return "indexed" if updated else "skipped"
@@ -0,0 +1,32 @@
+"""
+Stamp updatedAt and the GSI3 change-feed keys (CHANGES#EVENT#<shard> /
+<updatedAt>#<eventId>, see change_keys in src/common/python/repositories.py)
+on event METADATA items written before the change feed existed. updatedAt
+is taken from createdAt.
+
+    python dynamo_migrations/runner.py 0008_event_change_keys --table flycalcio-app-dev-table [--dry-run]
+
+EVENT_SHARDS must match the deployed handler.
+"""
+from dates import timestamp_key, parse_datetime
+from repositories import change_keys
+
+SCAN = {
+    "FilterExpression": "SK = :metadata AND attribute_not_exists(GSI3PK)",
+    "ProjectionExpression": "PK, SK, eventId, createdAt",
+    "ExpressionAttributeValues": {":metadata": "METADATA"},
+}
+
+
+def apply(ctx, item):
+    event_id = item.get("eventId") or item["PK"].split("#", 1)[1]
+    updated_at = timestamp_key(parse_datetime(item["createdAt"])) if item.get("createdAt") else timestamp_key()
+    keys = change_keys(event_id, updated_at)
+    updated = ctx.update_item(
+        Key={"PK": item["PK"], "SK": item["SK"]},
+        UpdateExpression="SET " + ", ".join(f"{k} = :{k}" for k in keys),
+        # Any write since the scan already stamped newer keys
+        ConditionExpression="attribute_exists(PK) AND attribute_not_exists(GSI3PK)",
+        ExpressionAttributeValues={f":{k}": v for k, v in keys.items()},
+    )
+    return "stamped" if updated else "skipped"
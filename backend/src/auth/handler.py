@@ -1,30 +1,45 @@
-import json
-from utils import  get_secret,JWT_REFRESH_NAME,JWT_SECRET_NAME
-from src.register import register_user
-from src.login import login
-from src.loging_google import login_google
-from src.refresh_token import refresh_access_token
-from utils import generate_response
-
-
-
+import importlib
 
-def lambda_handler(event, context):
-    method = event.get("httpMethod")
-    path = event.get("path")
+import aws_clients
+from utils import generate_response
 
-    if method == 'POST' and path == '/auth/register':
-        return register_user(event,context)
-    if method == 'POST' and path == '/auth/login':
-        return login(event,context)
-    if method == 'POST' and path == '/auth/google':
-        return login_google(event,context)
+# (method, path) → (module, function). Route modules are imported on first
+# use: a login never pays for google.auth or the registration path.
+ROUTES = {
+    ("POST", "/auth/register"): ("src.register", "register_user"),
+    ("POST", "/auth/login"): ("src.login", "login"),
+    ("POST", "/auth/google"): ("src.loging_google", "login_google"),
+    ("POST", "/auth/refresh"): ("src.refresh_token", "refresh_access_token"),
+    ("POST", "/auth/logout"): ("src.refresh_token", "logout"),
+}
+# Routes wrapped in idempotent_request
+IDEMPOTENT_ROUTES = {("POST", "/auth/register")}
 
-    if method == 'POST' and path == '/auth/refresh':
-        return refresh_access_token(event,context)
+_handlers = {}
 
-    
-    return generate_response(400, {"msg": "Invalid route or method."})
 
+def _route_handler(route):
+    handler = _handlers.get(route)
+    if handler is None:
+        module_name, name = ROUTES[route]
+        handler = _handlers[route] = getattr(importlib.import_module(module_name), name)
+    return handler
 
 
+@aws_clients.log_connection_stats
+def lambda_handler(event, context):
+    # Direct invocation only (API Gateway events never carry "action"):
+    # benchmark password hashing at this function's memory size
+    if event.get("action") == "calibrate_password_hash":
+        import passwords
+        return passwords.calibrate(target_ms=float(event.get("target_ms", 250)))
+
+    route = (event.get("httpMethod"), event.get("path"))
+    if route not in ROUTES:
+        return generate_response(400, {"msg": "Invalid route or method."})
+
+    handler = _route_handler(route)
+    if route in IDEMPOTENT_ROUTES:
+        from idempotency import register_context
+        register_context(context)
+    return handler(event, context)
@@ -0,0 +1,122 @@
+import re
+import threading
+import time
+
+import jwt
+import requests
+from requests.adapters import HTTPAdapter
+from google.auth import jwt as google_jwt
+
+from utils import logger
+from settings import settings
+
+GOOGLE_CERTS_URL = settings.google_certs_url
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+# Used when Google's response carries no usable Cache-Control
+DEFAULT_CERTS_MAX_AGE = 3600
+# Seconds between forced refetches, so tokens with unknown kids cannot
+# turn into a request to Google each
+GOOGLE_CERTS_MIN_REFRESH_INTERVAL = settings.google_certs_min_refresh_interval
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+def parse_max_age(headers, default=DEFAULT_CERTS_MAX_AGE):
+    """Seconds the response stays fresh: Cache-Control max-age minus Age."""
+    match = _MAX_AGE.search(headers.get("Cache-Control", ""))
+    if not match:
+        return default
+    age = int(headers.get("Age", 0) or 0)
+    return max(int(match.group(1)) - age, 0)
+
+
+def _pooled_session():
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+class GoogleCertCache:
+    """
+    Google's ID token signing certs, kept for as long as Google's Cache-Control
+    allows and fetched over one pooled session reused across warm invocations.
+    Verification itself is local.
+    """
+
+    def __init__(self, url=GOOGLE_CERTS_URL, session=None, clock=time.time, timeout=5,
+                 min_refresh_interval=GOOGLE_CERTS_MIN_REFRESH_INTERVAL):
+        self.url = url
+        self.session = session or _pooled_session()
+        self.timeout = timeout
+        self.min_refresh_interval = min_refresh_interval
+        self._clock = clock
+        self._certs = None
+        self._expires_at = 0
+        self._forced_at = None
+        self._lock = threading.Lock()
+        self.fetches = 0
+
+    def _fresh(self, force):
+        if self._certs is None:
+            return False
+        if force:
+            # One forced refetch per interval, however many unknown kids arrive
+            return self._forced_at is not None and self._clock() - self._forced_at < self.min_refresh_interval
+        return self._clock() < self._expires_at
+
+    def certs(self, force=False):
+        if self._fresh(force):
+            return self._certs
+        with self._lock:
+            if self._fresh(force):
+                return self._certs
+            try:
+                response = self.session.get(self.url, timeout=self.timeout)
+                response.raise_for_status()
+            except requests.RequestException:
+                if self._certs is None:
+                    raise
+                logger.warning("Google certs refresh failed, using cached certs")
+                return self._certs
+            self.fetches += 1
+            self._certs = response.json()
+            self._expires_at = self._clock() + parse_max_age(response.headers)
+            if force:
+                self._forced_at = self._clock()
+            return self._certs
+
+    def verify(self, token, audience):
+        """Verify a Google ID token and return its claims. Raises ValueError when invalid."""
+        if not audience:
+            # google.auth skips the audience check without one
+            raise ValueError("No audience to verify the Google token against")
+        try:
+            kid = jwt.get_unverified_header(token).get("kid")
+        except jwt.InvalidTokenError as e:
+            raise ValueError(f"Malformed Google token: {e}")
+
+        certs = self.certs()
+        if kid not in certs:
+            # Google rotated its keys before our cached copy expired
+            certs = self.certs(force=True)
+
+        claims = google_jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=10)
+        if claims.get("iss") not in GOOGLE_ISSUERS:
+            raise ValueError(f"Wrong issuer: {claims.get('iss')}")
+        return claims
+
+
+_cert_cache = None
+
+
+def get_cert_cache():
+    global _cert_cache
+    if _cert_cache is None:
+        _cert_cache = GoogleCertCache()
+    return _cert_cache
+
+
+def verify_google_token(token, audience):
+    return get_cert_cache().verify(token, audience)
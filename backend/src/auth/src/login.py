@@ -1,20 +1,16 @@
 import json
 
-from utils import verify_password, generate_access_token, generate_refresh_token,generate_response,tracer,logger,hash_password
-import os
-from dotenv import load_dotenv
-import boto3
-from boto3.dynamodb.conditions import Key
-load_dotenv()
+from utils import verify_password, generate_access_token, generate_refresh_token,generate_response,tracer,logger
+import passwords
+from settings import settings
+from src.refresh_store import start_family
+from src.users import get_login, update_password_hash
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["DB_TABLE"])
 
 
 
-
-ACCESS_TOKEN_EXPIRATION= os.environ.get("ACCESS_TOKEN_EXPIRATION",120)
-REFRESH_TOKEN_EXPIRATION= os.environ.get("REFRESH_TOKEN_EXPIRATION",600)
+ACCESS_TOKEN_EXPIRATION = settings.access_token_expiration
+REFRESH_TOKEN_EXPIRATION = settings.refresh_token_expiration
 
 @tracer.capture_lambda_handler
 def login(event: dict, context):
@@ -35,39 +31,40 @@ def login(event: dict, context):
                 400, {"msg": "Email and password required"}
             )
 
-        # 🔍 Fetch user by email (GSI)
-        response = table.query(
-            IndexName="GSI1",
-            KeyConditionExpression=(
-                Key("GSI1PK").eq("USER") &
-                Key("GSI1SK").eq(email)
-            ),
-            Limit=1
-        )
+        # 🔍 Fetch login record by email (one consistent get_item)
+        user = get_login(email)
 
-        if response["Count"] == 0:
+        if user is None:
             logger.info("User not found", extra={"email": email})
             return generate_response(
                 401, {"msg": "Invalid credentials"}
             )
 
-        user = response["Items"][0]
-
         # 🔐 Password check
-        if user["password"] != hash_password(password):
+        valid, new_hash = passwords.verify_password(password, user.get("password"))
+        if not valid:
             logger.info("Invalid password", extra={"email": email})
             return generate_response(
                 401, {"msg": "Invalid credentials"}
             )
 
+        if new_hash:
+            try:
+                if update_password_hash(user, new_hash):
+                    logger.info("Password hash upgraded", extra={"userId": user["userId"]})
+            except Exception:
+                # The login itself succeeded, retry the upgrade next time
+                logger.exception("Password hash upgrade failed", extra={"userId": user["userId"]})
+
         # if not user.get("confirmed", False):
         #     logger.info("User not confirmed", extra={"email": email})
         #     return generate_response(
         #         403, {"msg": "Account not confirmed"}
         #     )
 
-        access_token=generate_access_token(user['userId'],email,user["role"],int(ACCESS_TOKEN_EXPIRATION))
-        refresh_token = generate_refresh_token(user['userId'],email,user["role"],int(REFRESH_TOKEN_EXPIRATION))
+        tokens = start_family(user['userId'],email,user["role"])
+        access_token = tokens["access_token"]
+        refresh_token = tokens["refresh_token"]
 
         logger.info(
             "User logged in successfully",
@@ -107,8 +104,8 @@ def login(event: dict, context):
         if not verify_password(password, user["password_hash"]):
 
             return generate_response(401,{"msg": "Invalid credentials"})
-        access_token = generate_access_token(user["id"],user['email'],duration=int(ACCESS_TOKEN_EXPIRATION))
-        refresh_token = generate_refresh_token(user["id"],user['email'],duration=int(REFRESH_TOKEN_EXPIRATION))
+        access_token = generate_access_token(user["id"],user['email'],duration=ACCESS_TOKEN_EXPIRATION)
+        refresh_token = generate_refresh_token(user["id"],user['email'],duration=REFRESH_TOKEN_EXPIRATION)
         return generate_response(200,{
                 "access_token": access_token,
                 "refresh_token": refresh_token
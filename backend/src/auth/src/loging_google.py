@@ -1,48 +1,61 @@
 import json
 
-from utils import verify_password, generate_access_token, generate_refresh_token,generate_response
-from google.oauth2 import id_token
-from google.auth.transport import requests
-from dotenv import load_dotenv
-import os
-load_dotenv()
+from utils import generate_response,logger
+from src.google_certs import verify_google_token
+from src.refresh_store import start_family
+from src.users import get_login, create_user, EmailAlreadyRegistered
+from settings import settings
 
 
-ACCESS_TOKEN_EXPIRATION= os.environ.get("ACCESS_TOKEN_EXPIRATION",600)
-REFRESH_TOKEN_EXPIRATION= os.environ.get("REFRESH_TOKEN_EXPIRATION",600)
+def get_or_create_google_user(email):
+    user = get_login(email)
+    if user is not None:
+        return user
+    try:
+        user = create_user(email, provider="google", confirmed=True)
+    except EmailAlreadyRegistered:
+        # Concurrent first login with the same account
+        return get_login(email)
+    logger.info("Google user created", extra={"userId": user["userId"]})
+    return user
 
 
+def login_google(event, context=None):
+    if not settings.google_client_id:
+        # Without an audience, tokens issued to any OAuth client would pass
+        logger.error("GOOGLE_CLIENT_ID is not set, Google sign-in disabled")
+        return generate_response(503, {"msg": "Google sign-in is not available"})
 
-def login_google(event):
     try:
         data = json.loads(event["body"])
         google_token = data["google_token"]
-        idinfo = id_token.verify_oauth2_token(
+        # Verified locally against Google's certs, cached per container
+        idinfo = verify_google_token(
             google_token,
-            requests.Request(),
-            audience=os.getenv("GOOGLE_CLIENT_ID")
+            audience=settings.google_client_id
         )
 
         email = idinfo.get("email")
-        
-
-        access_token = generate_access_token(id,email,duration=int(ACCESS_TOKEN_EXPIRATION))
-        refresh_token = generate_refresh_token(id,email,duration=int(REFRESH_TOKEN_EXPIRATION))
-        response = generate_response(200,{
-                "access_token": access_token,
-                "refresh_token": refresh_token
+        if not email or not idinfo.get("email_verified", False):
+            return generate_response(401, {"msg": "Google account email not verified"})
+
+        user = get_or_create_google_user(email)
+
+        tokens = start_family(user["userId"],email,user["role"])
+        return generate_response(200,{
+                "access_token": tokens["access_token"],
+                "refresh_token": tokens["refresh_token"],
+                "user": {
+                    "userId": user["userId"],
+                    "email": user["email"],
+                    "role": user["role"],
+                }
             })
-        print(response)
 
-        return response
-        
-    except Exception as e:
-        print(e)
-        return generate_response(500,{"msg": str(e)})
     except ValueError as e:
         # Token verification failed
-        print(e)
-        return generate_response(500,{"msg": "Invalid Google token"})
-    except Exception as e:
-        print(e)
-        return generate_response(500,{"msg": str(e)})
\ No newline at end of file
+        logger.info("Invalid Google token", extra={"error": str(e)})
+        return generate_response(401,{"msg": "Invalid Google token"})
+    except Exception:
+        logger.exception("Unhandled Google login error")
+        return generate_response(500,{"msg": "Internal server error"})
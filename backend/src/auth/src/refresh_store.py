@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import time
+import uuid
+
+from botocore.exceptions import ClientError
+from cryptography.exceptions import InvalidTag
+from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+from utils import generate_access_token, generate_refresh_token, logger
+import aws_clients
+from settings import settings
+from revocation import family_key, get_revocation_list, REVOKED_PARTITION
+
+dynamodb = aws_clients.resource("dynamodb")
+table = dynamodb.Table(settings.db_table)
+
+ACCESS_TOKEN_EXPIRATION = settings.access_token_expiration
+REFRESH_TOKEN_EXPIRATION = settings.refresh_token_expiration
+# Seconds during which the token just rotated out may be presented again
+# (parallel refreshes from tabs of the same client) and gets the same new pair
+REFRESH_REUSE_GRACE_SECONDS = settings.refresh_reuse_grace_seconds
+
+
+class RefreshTokenRevoked(Exception):
+    pass
+
+
+def _issue(user_id, email, role, family_id):
+    token_id = str(uuid.uuid4())
+    pair = {
+        "access_token": generate_access_token(user_id, email, role, ACCESS_TOKEN_EXPIRATION, family_id=family_id),
+        "refresh_token": generate_refresh_token(user_id, email, role, REFRESH_TOKEN_EXPIRATION,
+                                                family_id=family_id, token_id=token_id),
+    }
+    return token_id, pair
+
+
+def _sealing_key(refresh_token):
+    return AESGCM(hashlib.sha256(refresh_token.encode()).digest())
+
+
+def _seal(pair, refresh_token, family_id):
+    """
+    Encrypt the pair handed out for refresh_token. The key is derived from
+    the token itself, which is never stored, so the pair kept on the family
+    item can only be read back by whoever presents that token again.
+    """
+    nonce = os.urandom(12)
+    return nonce + _sealing_key(refresh_token).encrypt(nonce, json.dumps(pair).encode(), family_id.encode())
+
+
+def _unseal(sealed, refresh_token, family_id):
+    sealed = bytes(sealed)
+    try:
+        return json.loads(_sealing_key(refresh_token).decrypt(sealed[:12], sealed[12:], family_id.encode()))
+    except InvalidTag:
+        return None
+
+
+def start_family(user_id, email, role):
+    """
+    Start a refresh-token family on login and return its first token pair.
+
+    REFRESH#<familyId> / FAMILY tracks the one refresh token of the family
+    that may currently be exchanged (currentJti).
+    """
+    family_id = str(uuid.uuid4())
+    token_id, pair = _issue(user_id, email, role, family_id)
+    now = int(time.time())
+    table.put_item(Item={
+        **family_key(family_id),
+        "userId": user_id,
+        "currentJti": token_id,
+        "createdAt": now,
+        "rotatedAt": now,
+        "ttl": now + REFRESH_TOKEN_EXPIRATION,
+    })
+    return pair
+
+
+def rotate(claims, refresh_token):
+    """
+    Exchange a verified refresh token (claims and the encoded token) for a new pair.
+
+    Common path: one conditional update_item, no read. When the condition
+    fails the family is read to tell a parallel refresh within the grace
+    window (same pair returned) from a replayed token (family revoked).
+    The pair is kept on the family only sealed with refresh_token.
+    """
+    family_id = claims.get("fid")
+    token_id = claims.get("jti")
+    if not family_id:
+        # Issued before refresh-token families existed
+        return start_family(claims["id"], claims["email"], claims["role"])
+
+    if get_revocation_list().is_revoked(family_id):
+        raise RefreshTokenRevoked()
+
+    new_token_id, pair = _issue(claims["id"], claims["email"], claims["role"], family_id)
+    now = int(time.time())
+    try:
+        table.update_item(
+            Key=family_key(family_id),
+            UpdateExpression=(
+                "SET currentJti = :new, previousJti = :old, rotatedAt = :now, "
+                "lastIssued = :pair, #ttl = :ttl"
+            ),
+            ConditionExpression="currentJti = :old AND attribute_not_exists(revokedAt)",
+            ExpressionAttributeNames={"#ttl": "ttl"},
+            ExpressionAttributeValues={
+                ":new": new_token_id,
+                ":old": token_id,
+                ":now": now,
+                ":pair": _seal(pair, refresh_token, family_id),
+                ":ttl": now + REFRESH_TOKEN_EXPIRATION,
+            },
+        )
+        return pair
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+
+    family = table.get_item(Key=family_key(family_id), ConsistentRead=True).get("Item")
+    if family is None or "revokedAt" in family:
+        raise RefreshTokenRevoked()
+
+    if family.get("previousJti") == token_id and now - int(family["rotatedAt"]) <= REFRESH_REUSE_GRACE_SECONDS:
+        pair = _unseal(family["lastIssued"], refresh_token, family_id)
+        if pair is not None:
+            logger.info("Refresh within grace window", extra={"familyId": family_id})
+            return pair
+
+    logger.warning("Refresh token reuse detected", extra={"familyId": family_id, "userId": family.get("userId")})
+    revoke_family(family_id, "reuse")
+    raise RefreshTokenRevoked()
+
+
+def revoke_family(family_id, reason):
+    """Revoke every token of a family; the family moves to the REVOKED#REFRESH partition."""
+    table.update_item(
+        Key=family_key(family_id),
+        UpdateExpression="SET revokedAt = :now, revokeReason = :reason, GSI1PK = :pk, GSI1SK = :fid REMOVE lastIssued",
+        ExpressionAttributeValues={
+            ":now": int(time.time()),
+            ":reason": reason,
+            ":pk": REVOKED_PARTITION,
+            ":fid": family_id,
+        },
+    )
+    get_revocation_list().add(family_id)
@@ -1,14 +1,8 @@
 import json
 
-from utils import verify_password, generate_access_token, generate_refresh_token,generate_response,get_secret,decode_token,get_cookie
+from utils import generate_response,decode_token,logger
+from src.refresh_store import rotate, revoke_family, RefreshTokenRevoked
 import jwt
-import os
-from dotenv import load_dotenv
-load_dotenv()
-
-
-ACCESS_TOKEN_EXPIRATION= os.environ.get("ACCESS_TOKEN_EXPIRATION",600)
-REFRESH_TOKEN_EXPIRATION= os.environ.get("REFRESH_TOKEN_EXPIRATION",600)
 
 
 def refresh_access_token(event,context):
@@ -17,23 +11,36 @@ def refresh_access_token(event,context):
         # refresh_token = get_cookie(event, "refresh_token")
         refresh_token = json.loads(event['body'])['refresh_token']
         decoded = decode_token(refresh_token,'refresh')
-        principal_id = decoded['id']
-        email = decoded['email']
-        role = decoded['role']
-        access_token = generate_access_token(principal_id,email,role,duration=int(ACCESS_TOKEN_EXPIRATION))
-        refresh_token = generate_refresh_token(principal_id,email,role,duration=int(REFRESH_TOKEN_EXPIRATION))
-        
-        
-        
-        
+        pair = rotate(decoded, refresh_token)
+
         return generate_response(200,{
                 'msg':'new_token',
-                "access_token": access_token,
-                "refresh_token": refresh_token
+                "access_token": pair["access_token"],
+                "refresh_token": pair["refresh_token"]
             })
-        
+
     except jwt.ExpiredSignatureError:
         return generate_response(401, {"error": "Refresh token expired"})
 
     except jwt.InvalidTokenError:
-        return generate_response(401, {"error": "Invalid refresh token"})
\ No newline at end of file
+        return generate_response(401, {"error": "Invalid refresh token"})
+
+    except RefreshTokenRevoked:
+        return generate_response(401, {"error": "Refresh token revoked"})
+
+
+def logout(event,context):
+    try:
+        refresh_token = json.loads(event['body'])['refresh_token']
+        decoded = decode_token(refresh_token,'refresh')
+        if decoded.get('fid'):
+            revoke_family(decoded['fid'], "logout")
+        return generate_response(200, {"msg": "Logged out"})
+
+    except jwt.InvalidTokenError:
+        # Expired or invalid: nothing left to revoke
+        return generate_response(200, {"msg": "Logged out"})
+
+    except Exception:
+        logger.exception("Logout failed")
+        return generate_response(500, {"msg": "Internal server error"})
@@ -1,19 +1,13 @@
 import json
 
 from utils import hash_password, send_email,generate_response,tracer,logger
-import uuid
-from datetime import datetime
-from boto3.dynamodb.conditions import Key
-import boto3
-import os
-from dotenv import load_dotenv
-load_dotenv()
-
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["DB_TABLE"])
+from passwords import MAX_PASSWORD_BYTES
+from idempotency import idempotent_request
+from src.users import create_user, EmailAlreadyRegistered
 
 
 @tracer.capture_lambda_handler
+@idempotent_request
 def register_user(event,context):
     try:
         logger.info("Incoming request", extra={"event": event})
@@ -29,39 +23,20 @@ def register_user(event,context):
             logger.warning("Missing email or password")
             return generate_response(400, {"msg": "Email and password are required"})
 
-        # 🔍 Check if user already exists (GSI)
-        existing_user = table.query(
-            IndexName="GSI1",
-            KeyConditionExpression=Key("GSI1PK").eq("USER") & Key("GSI1SK").eq(email),
-            Limit=1
-        )
-
-        if existing_user["Count"] > 0:
+        if len(password.encode()) > MAX_PASSWORD_BYTES:
+            return generate_response(400, {"msg": f"Password must be at most {MAX_PASSWORD_BYTES} bytes"})
+
+        # ✍️ Profile + EMAIL# item in one conditional transaction
+        try:
+            user = create_user(
+                email,
+                password=hash_password(password),
+                confirmed=False,
+            )
+        except EmailAlreadyRegistered:
             logger.info("User already exists", extra={"email": email})
             return generate_response(409, {"msg": "User already exists"})
-
-        user_id = str(uuid.uuid4())
-        hashed_password = hash_password(password)
-
-        item = {
-            "PK": f"USER#{user_id}",
-            "SK": "PROFILE",
-            "GSI1PK": "USER",
-            "GSI1SK": email,
-            "userId": user_id,
-            "email": email,
-            "password": hashed_password,
-            "role": "USER",
-            "createdAt": datetime.utcnow().isoformat(),
-            "confirmed": False,
-        }
-
-        #  DynamoDB write (traced)
-
-        table.put_item(
-            Item=item,
-            ConditionExpression="attribute_not_exists(PK)"
-        )
+        user_id = user["userId"]
 
         send_email(
             email,
@@ -0,0 +1,173 @@
+from datetime import datetime
+
+from botocore.exceptions import ClientError
+
+from utils import logger
+from settings import settings
+from ids import new_id
+import created_index
+from repositories import UserRepository, profile_key
+
+users_repo = UserRepository()
+
+
+class EmailAlreadyRegistered(Exception):
+    pass
+
+
+def normalize_email(email):
+    return email.strip().lower()
+
+
+def email_key(email):
+    """
+    EMAIL#<email> / EMAIL is the login record of a user: it enforces email
+    uniqueness and carries what login needs (userId, role, password hash),
+    so a login is a single strongly consistent get_item. Tokens take the
+    role from this copy: change roles with set_role, never on the profile alone.
+    """
+    return {"PK": f"EMAIL#{normalize_email(email)}", "SK": "EMAIL"}
+
+
+def email_item(profile, password=None):
+    item = {
+        **email_key(profile["email"]),
+        "userId": profile["userId"],
+        "email": profile["email"],
+        "role": profile["role"],
+    }
+    if password:
+        item["password"] = password
+    return item
+
+
+def create_user(email, password=None, role="USER", **attributes):
+    """
+    Write the profile and its EMAIL# item in one transaction; either both
+    exist afterwards or neither does. Raises EmailAlreadyRegistered.
+    """
+    user_id = new_id()
+    profile = {
+        **profile_key(user_id),
+        "GSI1PK": "USER",
+        "GSI1SK": email,
+        # Newest users: GSI2 sorted by the time-ordered id
+        **created_index.created_keys("USER", user_id),
+        "userId": user_id,
+        "email": email,
+        "role": role,
+        "createdAt": datetime.utcnow().isoformat(),
+        **attributes,
+    }
+    try:
+        users_repo.transact_write([
+            {"Put": {
+                "Item": email_item(profile, password),
+                "ConditionExpression": "attribute_not_exists(PK)",
+            }},
+            {"Put": {
+                "Item": profile,
+                "ConditionExpression": "attribute_not_exists(PK)",
+            }},
+        ])
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        reasons = e.response.get("CancellationReasons", [])
+        if reasons and reasons[0].get("Code") == "ConditionalCheckFailed":
+            raise EmailAlreadyRegistered(email)
+        raise
+    return profile
+
+
+def set_role(user_id, role):
+    """
+    Set the role on the profile and on its EMAIL# item in one transaction.
+    Applies from the next login; open sessions keep their role until their
+    refresh-token family ends. Returns False if the user does not exist.
+    """
+    profile = users_repo.get_profile(user_id, fields=("email",), consistent=True)
+    if profile is None or get_login(profile["email"]) is None:
+        return False
+    update = {
+        "UpdateExpression": "SET #role = :role",
+        "ExpressionAttributeNames": {"#role": "role"},
+    }
+    try:
+        users_repo.transact_write([
+            {"Update": {
+                **update,
+                "Key": profile_key(user_id),
+                "ConditionExpression": "attribute_exists(PK)",
+                "ExpressionAttributeValues": {":role": role},
+            }},
+            {"Update": {
+                **update,
+                "Key": email_key(profile["email"]),
+                "ConditionExpression": "userId = :userId",
+                "ExpressionAttributeValues": {":role": role, ":userId": user_id},
+            }},
+        ])
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "TransactionCanceledException":
+            raise
+        # Deleted or re-registered meanwhile
+        logger.warning("Role not changed", extra={"userId": user_id})
+        return False
+    logger.info("Role changed", extra={"userId": user_id, "role": role})
+    return True
+
+
+def get_login(email):
+    """Return the EMAIL# login record for an email, or None."""
+    item = users_repo.get_login(email_key(email))
+    if item is not None or not settings.login_repair_enabled:
+        return item
+    return _repair_login(email)
+
+
+def _repair_login(email):
+    """
+    Users registered before EMAIL# items existed and not yet backfilled
+    (dynamo_migrations 0001): find them through GSI1 and write their item.
+    """
+    profile = users_repo.find_by_email(email)
+    if profile is None:
+        return None
+
+    item = email_item(profile, profile.get("password"))
+    try:
+        users_repo.put(item, ConditionExpression="attribute_not_exists(PK)")
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        return users_repo.get_login(email_key(email))
+    logger.info("EMAIL# item repaired", extra={"userId": item["userId"]})
+    return item
+
+
+def update_password_hash(login, new_hash):
+    """
+    Replace the hash on the EMAIL# item, conditional on the hash we verified
+    so a concurrent password change is never overwritten.
+    Returns False if the condition failed.
+    """
+    try:
+        users_repo.update(
+            email_key(login["email"]),
+            UpdateExpression="SET #password = :new",
+            ConditionExpression="#password = :old",
+            ExpressionAttributeNames={"#password": "password"},
+            ExpressionAttributeValues={":new": new_hash, ":old": login["password"]},
+        )
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+            return False
+        raise
+    # Profiles written before EMAIL# items still hold a copy of the old hash
+    users_repo.update(
+        profile_key(login["userId"]),
+        UpdateExpression="REMOVE #password",
+        ExpressionAttributeNames={"#password": "password"},
+    )
+    return True
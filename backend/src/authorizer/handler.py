@@ -1,12 +1,20 @@
 import json
 import jwt
-from botocore.exceptions import ClientError
-import os
-from dotenv import load_dotenv
-from utils import get_secret,get_cookie
-load_dotenv()
+from aws_lambda_powertools import Logger
+import secret_cache
+import jwt_keys
+from token_cache import TokenCache
+from revocation import get_revocation_list
+from settings import settings
 
-JWT_SECRET_NAME = os.environ.get("JWT_SECRET_NAME",'jwtkey-dev-secret')
+JWT_SECRET_NAME = settings.jwt_secret_name
+
+# Debug entries are off unless POWERTOOLS_LOG_LEVEL=DEBUG, or sampled in
+# by POWERTOOLS_LOGGER_SAMPLE_RATE
+logger = Logger(service="flycalcio-app")
+
+# Verified tokens, reused across warm invocations
+TOKEN_CACHE = TokenCache()
 
 
 
@@ -17,21 +25,84 @@ def authorizer(event, context):
     try:
         token = event['headers']['authorization']
         token = token.split(' ')[-1]
-        secret_value = get_secret(JWT_SECRET_NAME)
         # token = get_cookie(event, "access_token")
-        decoded = jwt.decode(token, secret_value, algorithms=['HS256'])
+        decoded = verify_token(token)
         principal_id = decoded['id']
-        
-        policy = generate_policy(principal_id, 'Allow', event['methodArn'],context=decoded)
+
+        # Bloom filter miss (the common case) costs no DynamoDB read
+        if decoded.get('fid') and get_revocation_list().is_revoked(decoded['fid']):
+            raise Exception('Unauthorized')  # Refresh-token family revoked
+
+        resources = role_resources(decoded.get('role'), event['methodArn'])
+        if not resources:
+            policy = generate_policy(principal_id, 'Deny', api_arn_prefix(event['methodArn']) + '/*', context=None)
+            print(policy)
+            return policy
+
+        policy = generate_policy(principal_id, 'Allow', resources,context=decoded)
         print(policy)
         return policy
     except jwt.ExpiredSignatureError:
-        policy = generate_policy('user', 'Deny', event['methodArn'],context=None)
+        policy = generate_policy('user', 'Deny', api_arn_prefix(event['methodArn']) + '/*',context=None)
         print(policy)
         return policy
     except jwt.InvalidTokenError:
         raise Exception('Unauthorized')  # Invalid token
 
+def verify_token(token):
+    decoded = TOKEN_CACHE.get(token)
+    if decoded is None:
+        decoded = decode_access_token(token)
+        TOKEN_CACHE.put(token, decoded)
+    logger.debug("Token cache", extra={"tokenCache": TOKEN_CACHE.stats()})
+    return decoded
+
+def decode_access_token(token):
+    if jwt_keys.is_asymmetric():
+        # Public key picked by the token's `kid`, no secret lookup
+        return jwt_keys.verify(token)
+    return secret_cache.get_cache().call_with_rotation(
+        JWT_SECRET_NAME,
+        lambda secret_value: jwt.decode(token, secret_value, algorithms=['HS256']),
+        retry_on=jwt.InvalidSignatureError
+    )
+
+# Routes each role may invoke, as "<METHOD>/<resource path>" patterns relative to
+# the API stage. API Gateway caches the policy per Authorization header, so it
+# has to cover every route the caller may hit next, not just event['methodArn'].
+ROLE_ROUTES = {
+    "USER": [
+        "*/private/*",
+        "GET/events",
+        "GET/events/*",
+        "GET/event",
+        "GET/event/*",
+    ],
+    "ADMIN": [
+        "*/private/*",
+        "*/events",
+        "*/events/*",
+        "*/event",
+        "*/event/*",
+        "*/guests",
+        "*/guests/*",
+    ],
+}
+
+
+def api_arn_prefix(method_arn):
+    """
+    arn:aws:execute-api:{region}:{account}:{apiId}/{stage}/{method}/{path}
+    -> arn:aws:execute-api:{region}:{account}:{apiId}/{stage}
+    """
+    return "/".join(method_arn.split("/")[:2])
+
+
+def role_resources(role, method_arn):
+    prefix = api_arn_prefix(method_arn)
+    return [f"{prefix}/{route}" for route in ROLE_ROUTES.get(role, [])]
+
+
 def generate_policy(principal_id, effect, resource,context=None):
     policy = {
         'principalId': principal_id,
@@ -52,6 +123,3 @@ def generate_policy(principal_id, effect, resource,context=None):
         policy['context'] = sanitized_context
 
     return policy
-
-
-
@@ -0,0 +1,82 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from settings import settings
+
+# Max number of verified tokens kept per container
+AUTH_TOKEN_CACHE_SIZE = settings.auth_token_cache_size
+# Upper bound on how long a verified token is trusted without re-verification,
+# whatever its own `exp` says
+AUTH_TOKEN_CACHE_MAX_TTL = settings.auth_token_cache_max_ttl
+
+
+def token_digest(token):
+    return hashlib.sha256(token.encode()).digest()
+
+
+class TokenCache:
+    """
+    In-container LRU of verified JWT claims.
+
+    Keys are SHA-256 digests of the raw token (the token itself is never kept),
+    entries expire at min(token exp, cached_at + max_ttl).
+    """
+
+    def __init__(self, max_size=AUTH_TOKEN_CACHE_SIZE, max_ttl=AUTH_TOKEN_CACHE_MAX_TTL, clock=time.time):
+        self.max_size = max_size
+        self.max_ttl = max_ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, token):
+        key = token_digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims
+
+    def put(self, token, claims):
+        now = self._clock()
+        expires_at = now + self.max_ttl
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]))
+        if expires_at <= now or self.max_size <= 0:
+            return
+
+        key = token_digest(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
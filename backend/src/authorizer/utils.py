@@ -1,10 +1,13 @@
 
 
 
-import boto3
 import json
 import os
 
+from botocore.exceptions import ClientError
+
+import secret_cache
+
 
 
 
@@ -12,26 +15,16 @@ def get_secret(secret_name: str, region_name: str = "eu-central-1"):
     """
     Fetch a secret's value from AWS Secrets Manager by name.
     Returns the secret as a dict if it's JSON, otherwise a string.
+    Values come from the container-wide cache in the common layer (secret_cache).
     """
 
-    client = boto3.client("secretsmanager", region_name=region_name)
-
     try:
-        response = client.get_secret_value(SecretId=secret_name)
-    except client.exceptions.ResourceNotFoundException:
-        raise Exception(f"Secret '{secret_name}' not found")
-    except Exception as e:
+        return secret_cache.get_secret(secret_name, region_name)
+    except ClientError as e:
+        if e.response["Error"]["Code"] == "ResourceNotFoundException":
+            raise Exception(f"Secret '{secret_name}' not found")
         raise Exception(f"Error retrieving secret: {e}")
 
-    # The secret is in the "SecretString" key
-    secret = response["SecretString"]
-
-    # Try to parse JSON secrets automatically
-    try:
-        return json.loads(secret)
-    except json.JSONDecodeError:
-        return secret
-
 def get_cookie(event, name):
     # HTTP API (v2)
     if "cookies" in event:
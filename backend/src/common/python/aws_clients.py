@@ -0,0 +1,124 @@
+import functools
+import threading
+
+import boto3
+from aws_lambda_powertools import Logger
+from botocore.config import Config
+
+from settings import settings
+
+logger = Logger(service="flycalcio-app", child=True)
+
+# One session, and one client/resource per (service, region), per container.
+# Handlers build theirs at import, during the init phase, so warm
+# invocations reuse the client and its open keep-alive connections.
+
+# Function timeout in seconds, set per function by the stack (Lambda's default is 3)
+LAMBDA_TIMEOUT = settings.lambda_timeout
+MAX_ATTEMPTS = settings.aws_max_attempts
+# Every attempt must fit in the function timeout with room to answer:
+# 3 s → 0.5 s connect / 0.75 s read, 30 s → 2 s / 7.5 s, 60+ s → 2 s / 10 s
+CONNECT_TIMEOUT = settings.aws_connect_timeout or max(0.5, min(2.0, LAMBDA_TIMEOUT / 10))
+READ_TIMEOUT = settings.aws_read_timeout or min(10.0, LAMBDA_TIMEOUT / (MAX_ATTEMPTS + 1))
+# At least the widest thread pool of a handler (PROPAGATION_WORKERS), so
+# parallel batches never wait for, or throw away, a connection
+MAX_POOL_CONNECTIONS = settings.aws_max_pool_connections
+
+CONFIG = Config(
+    connect_timeout=CONNECT_TIMEOUT,
+    read_timeout=READ_TIMEOUT,
+    retries={"mode": "adaptive", "total_max_attempts": MAX_ATTEMPTS},
+    max_pool_connections=MAX_POOL_CONNECTIONS,
+    tcp_keepalive=True,
+)
+
+_lock = threading.Lock()
+_session = None
+_clients = {}
+_resources = {}
+
+
+def _get_session():
+    global _session
+    if _session is None:
+        _session = boto3.session.Session()
+    return _session
+
+
+def resource(service, region_name=None):
+    """The container's boto3 resource for `service` (built on first use)."""
+    key = (service, region_name)
+    found = _resources.get(key)
+    if found is not None:
+        return found
+    # Session client/resource creation is not thread-safe
+    with _lock:
+        if key not in _resources:
+            _resources[key] = _get_session().resource(service, region_name=region_name, config=CONFIG)
+        return _resources[key]
+
+
+def client(service, region_name=None):
+    """
+    The container's boto3 client for `service` (built on first use). Never
+    a resource's meta.client: for DynamoDB that one (de)serializes plain
+    Python values itself, and AttributeValues passed to it get wrapped twice.
+    """
+    key = (service, region_name)
+    found = _clients.get(key)
+    if found is not None:
+        return found
+    with _lock:
+        if key not in _clients:
+            _clients[key] = _get_session().client(service, region_name=region_name, config=CONFIG)
+        return _clients[key]
+
+
+def _pools(service_client):
+    # botocore keeps a urllib3 PoolManager per client endpoint
+    manager = getattr(service_client._endpoint.http_session, "_manager", None)
+    if manager is None:
+        return []
+    return [manager.pools[key] for key in manager.pools.keys()]
+
+
+def connection_stats():
+    """
+    Per service: requests sent, connections opened (each one a TCP + TLS
+    handshake) and requests that reused an open connection. On a warm
+    container `connections` should stay flat while `requests` grows.
+    """
+    clients = [*_clients.items(), *((key, r.meta.client) for key, r in _resources.items())]
+    totals = {}
+    for (service, region_name), service_client in clients:
+        # A service's client and resource keep separate pools: report their sum
+        name = f"{service}:{region_name}" if region_name else service
+        requests, connections = totals.get(name, (0, 0))
+        for pool in _pools(service_client):
+            requests += pool.num_requests
+            connections += pool.num_connections
+        totals[name] = (requests, connections)
+    return {
+        name: {"requests": requests, "connections": connections, "reused": max(0, requests - connections)}
+        for name, (requests, connections) in totals.items()
+    }
+
+
+def log_connection_stats(handler):
+    """Log connection_stats() after every invocation of a Lambda handler."""
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            logger.info("AWS connections", extra={"awsConnections": connection_stats()})
+    return wrapper
+
+
+def reset():
+    """Forget every client (tests)."""
+    global _session
+    with _lock:
+        _session = None
+        _clients.clear()
+        _resources.clear()
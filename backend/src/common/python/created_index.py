@@ -0,0 +1,93 @@
+import hashlib
+import heapq
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+
+from boto3.dynamodb.conditions import Key
+
+import dates
+from ids import creation_sort_key, min_id_at, parse_id
+from pagination import query_page
+from settings import settings
+
+# Items listed in creation order live in GSI2 under CREATED#<kind>#<shard>,
+# sorted by their time-ordered id. Changing the shard count needs a backfill.
+CREATED_SHARDS = settings.created_shards
+# Deltas stop this far behind "now": ids minted by other containers with a
+# slightly skewed clock, and GSI replication, land before the watermark passes them
+DELTA_SETTLE = timedelta(milliseconds=settings.delta_settle_ms)
+
+_pool = ThreadPoolExecutor(max_workers=CREATED_SHARDS)
+
+
+def created_partition(kind, shard):
+    return f"CREATED#{kind}#{shard}"
+
+
+def created_keys(kind, item_id, created_at=None):
+    """GSI2 keys listing `kind` items (EVENT, USER) by creation time."""
+    shard = int(hashlib.md5(item_id.encode()).hexdigest(), 16) % CREATED_SHARDS
+    return {
+        "GSI2PK": created_partition(kind, shard),
+        "GSI2SK": creation_sort_key(item_id, created_at),
+    }
+
+
+def since_key(value):
+    """
+    ?since= value → exclusive lower bound on GSI2SK. Accepts a watermark
+    returned by a previous delta (a uuid7) or an ISO-8601 timestamp.
+    Raises ValueError.
+    """
+    try:
+        parsed = parse_id(value)
+    except ValueError:
+        # Everything created at or after the timestamp: start just below its first id
+        return min_id_at(dates.parse_datetime(value))[:-1] + "/"
+    if parsed.version != 7:
+        raise ValueError("since must be a uuid7 watermark or a timestamp")
+    return str(parsed)
+
+
+def _scatter(table, kind, condition, limit, forward, **query_kwargs):
+    """First `limit` items of every shard in parallel, merged in index order."""
+    def query_shard(shard):
+        items, last_key = query_page(
+            table, limit,
+            IndexName="GSI2",
+            KeyConditionExpression=Key("GSI2PK").eq(created_partition(kind, shard)) & condition,
+            ScanIndexForward=forward,
+            **query_kwargs,
+        )
+        return items, last_key is not None
+
+    results = list(_pool.map(query_shard, range(CREATED_SHARDS)))
+    merged = list(heapq.merge(*(items for items, _ in results), key=lambda i: i["GSI2SK"], reverse=not forward))
+    more = len(merged) > limit or any(more for _, more in results)
+    return merged[:limit], more
+
+
+def newest(table, kind, limit, before=None, **query_kwargs):
+    """
+    Most recently created items first. `before` is the GSI2SK the previous
+    page ended at. Returns (items, next `before` or None).
+    """
+    # "~" sorts after every uuid character: no upper bound on the first page
+    condition = Key("GSI2SK").lt(before or "~")
+    items, more = _scatter(table, kind, condition, limit, forward=False, **query_kwargs)
+    return items, (items[-1]["GSI2SK"] if more and items else None)
+
+
+def created_after(table, kind, after, limit, **query_kwargs):
+    """
+    Items created after the exclusive key `after`, oldest first, up to
+    DELTA_SETTLE ago. Returns (items, watermark, has_more); the watermark
+    is the last item's key (None if there was nothing new) for the next ?since=.
+    """
+    settled = min_id_at(datetime.now(timezone.utc) - DELTA_SETTLE)
+    items, more = _scatter(table, kind, Key("GSI2SK").gt(after), limit, forward=True, **query_kwargs)
+    ready = [i for i in items if i["GSI2SK"] < settled]
+    if len(ready) < len(items):
+        more = False
+    watermark = ready[-1]["GSI2SK"] if ready else None
+    return ready, watermark, more
@@ -0,0 +1,49 @@
+from datetime import datetime, timezone
+
+from dateutil import parser
+
+# Fixed-width UTC timestamp: lexical order == chronological order
+SORT_KEY_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+# Write timestamps (updatedAt): microsecond precision, also fixed width
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%fZ"
+
+
+def parse_datetime(value, lenient=False, dayfirst=False, default_tz=timezone.utc):
+    """
+    Parse a client date/datetime into an aware UTC datetime.
+
+    Strict mode accepts ISO-8601 only ("2026-05-17", "2026-05-17T18:00",
+    "2026-05-17T18:00:00+02:00"). Lenient mode, for backfills of old data,
+    accepts anything dateutil understands ("17/05/2026 18:00").
+    Values without an offset are taken to be in `default_tz`.
+    Raises ValueError.
+    """
+    if not isinstance(value, str) or not value.strip():
+        raise ValueError("date must be a non-empty string")
+    try:
+        if lenient:
+            parsed = parser.parse(value, dayfirst=dayfirst)
+        else:
+            parsed = parser.isoparse(value.strip())
+    except (ValueError, OverflowError) as e:
+        raise ValueError(f"Unrecognised date: {value!r}") from e
+
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=default_tz)
+    return parsed.astimezone(timezone.utc)
+
+
+def to_sort_key(value, **parse_options):
+    """'2026-05-17T20:00+02:00' → '2026-05-17T18:00:00Z'. Raises ValueError."""
+    if isinstance(value, datetime):
+        parsed = value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+        return parsed.astimezone(timezone.utc).strftime(SORT_KEY_FORMAT)
+    return parse_datetime(value, **parse_options).strftime(SORT_KEY_FORMAT)
+
+
+def timestamp_key(moment=None):
+    """Sortable UTC write timestamp, '2026-05-17T18:00:00.123456Z'; now by default."""
+    moment = moment or datetime.now(timezone.utc)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
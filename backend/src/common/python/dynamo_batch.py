@@ -0,0 +1,115 @@
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aws_lambda_powertools import Logger
+
+logger = Logger(service="flycalcio-app", child=True)
+
+# DynamoDB limits per call
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+BATCH_MAX_RETRIES = 8
+BATCH_BASE_DELAY = 0.05
+BATCH_MAX_DELAY = 2.0
+
+
+class UnprocessedItemsError(Exception):
+    """Raised when DynamoDB still throttles part of a batch after all retries."""
+
+    def __init__(self, message, unprocessed=()):
+        super().__init__(message)
+        # The keys / write requests that were never applied
+        self.unprocessed = list(unprocessed)
+
+
+def _chunks(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def _backoff(attempt):
+    # Full jitter, as recommended for DynamoDB batch retries
+    time.sleep(random.uniform(0, min(BATCH_MAX_DELAY, BATCH_BASE_DELAY * (2 ** attempt))))
+
+
+def _key_value(value):
+    # Resource items hold plain values, low-level client items {"S": "..."}
+    return next(iter(value.values())) if isinstance(value, dict) else value
+
+
+def _key_id(key, key_names):
+    return tuple(_key_value(key[name]) for name in key_names)
+
+
+def batch_get(dynamodb, table_name, keys, key_names=("PK", "SK"), projection=None,
+              expression_names=None, consistent_read=False):
+    """
+    Fetch many items by primary key with BatchGetItem.
+
+    Keys are deduplicated and sent 100 per call; UnprocessedKeys are retried
+    with exponential backoff. Items come back in the order of `keys`;
+    keys without an item are skipped. A `projection` must include the
+    key attributes.
+    """
+    unique_keys = list({_key_id(k, key_names): k for k in keys}.values())
+    found = {}
+
+    for chunk in _chunks(unique_keys, BATCH_GET_LIMIT):
+        request = {"Keys": chunk, "ConsistentRead": consistent_read}
+        if projection:
+            request["ProjectionExpression"] = projection
+        if expression_names:
+            request["ExpressionAttributeNames"] = expression_names
+        pending = {table_name: request}
+
+        attempt = 0
+        while pending:
+            resp = dynamodb.batch_get_item(RequestItems=pending)
+            for item in resp["Responses"].get(table_name, []):
+                found[_key_id(item, key_names)] = item
+            pending = resp.get("UnprocessedKeys") or {}
+            if pending:
+                if attempt >= BATCH_MAX_RETRIES:
+                    raise UnprocessedItemsError(f"{len(pending[table_name]['Keys'])} keys unprocessed",
+                                                pending[table_name]["Keys"])
+                logger.info("Retrying unprocessed keys", extra={"count": len(pending[table_name]["Keys"]), "attempt": attempt})
+                _backoff(attempt)
+                attempt += 1
+
+    return [found[_key_id(k, key_names)] for k in keys if _key_id(k, key_names) in found]
+
+
+def _write_chunk(dynamodb, table_name, requests):
+    pending = {table_name: requests}
+    attempt = 0
+    while True:
+        resp = dynamodb.batch_write_item(RequestItems=pending)
+        pending = resp.get("UnprocessedItems") or {}
+        if not pending:
+            return len(requests)
+        if attempt >= BATCH_MAX_RETRIES:
+            raise UnprocessedItemsError(f"{len(pending[table_name])} writes unprocessed", pending[table_name])
+        logger.info("Retrying unprocessed writes", extra={"count": len(pending[table_name]), "attempt": attempt})
+        _backoff(attempt)
+        attempt += 1
+
+
+def batch_write(dynamodb, table_name, puts=(), deletes=(), key_names=("PK", "SK"), workers=1):
+    """
+    Put and delete many items with BatchWriteItem, 25 requests per call and
+    up to `workers` calls in flight. UnprocessedItems are retried with
+    exponential backoff. Writes are unconditional; a key may appear only
+    once across `puts` and `deletes`. Returns the number of requests applied.
+    """
+    requests = [{"PutRequest": {"Item": item}} for item in puts]
+    # Duplicate keys in one call are rejected by DynamoDB
+    unique_deletes = {_key_id(k, key_names): k for k in deletes}.values()
+    requests += [{"DeleteRequest": {"Key": {n: k[n] for n in key_names}}} for k in unique_deletes]
+
+    chunks = list(_chunks(requests, BATCH_WRITE_LIMIT))
+    if workers <= 1 or len(chunks) <= 1:
+        return sum(_write_chunk(dynamodb, table_name, chunk) for chunk in chunks)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(lambda chunk: _write_chunk(dynamodb, table_name, chunk), chunks))
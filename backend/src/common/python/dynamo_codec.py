@@ -0,0 +1,100 @@
+from decimal import Decimal
+
+# AttributeValue <-> native Python, for the low-level DynamoDB client.
+#
+# boto3's TypeDeserializer turns every number into a Decimal through a
+# Decimal context with trap checks, and dispatches by building a method
+# name per attribute. Here both directions are a single dict lookup into
+# tables built once at import, and numbers decode to int (or float when
+# they carry a fraction/exponent) so items go straight to json.dumps.
+# Floats are doubles: don't store values that need more than 15-17
+# significant digits through this codec.
+
+
+def _number(text):
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def _list(values):
+    return [_DECODERS[tag](value) for av in values for tag, value in av.items()]
+
+
+def _map(values):
+    return {name: _DECODERS[tag](value) for name, av in values.items() for tag, value in av.items()}
+
+
+_DECODERS = {
+    "S": str,
+    "N": _number,
+    "BOOL": bool,
+    "NULL": lambda value: None,
+    "M": _map,
+    "L": _list,
+    "B": bytes,
+    "SS": set,
+    "NS": lambda values: {_number(v) for v in values},
+    "BS": lambda values: {bytes(v) for v in values},
+}
+
+
+def decode(av):
+    """{"N": "3"} → 3."""
+    for tag, value in av.items():
+        return _DECODERS[tag](value)
+    raise ValueError("Empty AttributeValue")
+
+
+def decode_item(item):
+    """A low-level item ({"PK": {"S": ...}, ...}) as a plain dict; None stays None."""
+    if item is None:
+        return None
+    return _map(item)
+
+
+def _encode_number(value):
+    if isinstance(value, float) and (value != value or value in (float("inf"), float("-inf"))):
+        raise ValueError(f"DynamoDB cannot store {value!r}")
+    return {"N": repr(value) if isinstance(value, float) else str(value)}
+
+
+def _encode_set(values):
+    if not values:
+        raise ValueError("DynamoDB cannot store an empty set")
+    first = next(iter(values))
+    if isinstance(first, str):
+        return {"SS": list(values)}
+    if isinstance(first, (bytes, bytearray)):
+        return {"BS": [bytes(v) for v in values]}
+    return {"NS": [_encode_number(v)["N"] for v in values]}
+
+
+# Exact type → encoder; bool is listed so it never falls through to int
+_ENCODERS = {
+    str: lambda value: {"S": value},
+    bool: lambda value: {"BOOL": value},
+    int: _encode_number,
+    float: _encode_number,
+    Decimal: _encode_number,
+    type(None): lambda value: {"NULL": True},
+    dict: lambda value: {"M": encode_item(value)},
+    list: lambda value: {"L": [encode(v) for v in value]},
+    tuple: lambda value: {"L": [encode(v) for v in value]},
+    bytes: lambda value: {"B": value},
+    bytearray: lambda value: {"B": bytes(value)},
+    set: _encode_set,
+    frozenset: _encode_set,
+}
+
+
+def encode(value):
+    """3 → {"N": "3"}. Raises TypeError for values DynamoDB cannot hold."""
+    encoder = _ENCODERS.get(type(value))
+    if encoder is None:
+        raise TypeError(f"Cannot encode {type(value).__name__} as a DynamoDB attribute")
+    return encoder(value)
+
+
+def encode_item(item):
+    return {name: encode(value) for name, value in item.items()}
@@ -0,0 +1,25 @@
+class InvalidFieldsRequest(ValueError):
+    pass
+
+
+def requested_fields(event, allowed):
+    """
+    ?fields=title,date from an API Gateway event, checked against the
+    resource's `allowed` attributes. Without the parameter, every allowed
+    attribute. Returns a tuple of names. Raises InvalidFieldsRequest.
+    """
+    value = (event.get("queryStringParameters") or {}).get("fields")
+    if value is None:
+        return tuple(allowed)
+    names = list(dict.fromkeys(f.strip() for f in value.split(",") if f.strip()))
+    if not names:
+        raise InvalidFieldsRequest("fields must name at least one attribute")
+    unknown = [n for n in names if n not in allowed]
+    if unknown:
+        raise InvalidFieldsRequest(f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(allowed)})")
+    return tuple(names)
+
+
+def select(items, fields):
+    """Only `fields` of each item: drops the keys fetched for paging and merging."""
+    return [{f: item[f] for f in fields if f in item} for item in items]
@@ -0,0 +1,142 @@
+import functools
+import hashlib
+import json
+
+from aws_lambda_powertools import Logger
+from aws_lambda_powertools.utilities.idempotency import (
+    DynamoDBPersistenceLayer,
+    IdempotencyConfig,
+    idempotent_function,
+)
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyAlreadyInProgressError,
+    IdempotencyValidationError,
+)
+
+import aws_clients
+from utils import generate_response
+from settings import settings
+
+logger = Logger(service="flycalcio-app", child=True)
+
+IDEMPOTENCY_HEADER = "idempotency-key"
+IDEMPOTENCY_TTL = settings.idempotency_ttl
+MAX_KEY_LENGTH = 255
+# Responses are stored in one DynamoDB item (400 KB max, key and
+# attribute names included); larger ones are returned but not stored
+MAX_STORED_RESPONSE_BYTES = 350 * 1024
+
+
+def _mark_replayed(response, data_record):
+    response.setdefault("headers", {})["Idempotent-Replayed"] = "true"
+    return response
+
+
+config = IdempotencyConfig(
+    # Key: the caller's own key, scoped to who sent it and where
+    event_key_jmespath="[principal, method, path, key]",
+    # The same key with a different body is a client bug, not a retry
+    payload_validation_jmespath="bodyHash",
+    raise_on_no_idempotency_key=True,
+    expires_after_seconds=IDEMPOTENCY_TTL,
+    response_hook=_mark_replayed,
+)
+
+_persistence_store = None
+
+
+def _store():
+    """
+    Records live in the app table: PK idempotency#<function>, SK the key
+    hash, removed by the table TTL after IDEMPOTENCY_TTL seconds.
+    """
+    global _persistence_store
+    if _persistence_store is None:
+        _persistence_store = DynamoDBPersistenceLayer(
+            table_name=settings.db_table,
+            key_attr="PK",
+            sort_key_attr="SK",
+            expiry_attr="ttl",
+            status_attr="idempotencyStatus",
+            data_attr="response",
+            boto3_client=aws_clients.client("dynamodb"),
+        )
+    return _persistence_store
+
+
+class _NotCacheable(Exception):
+    """Carries a 5xx or oversized response out of the idempotent call so it is not stored."""
+
+    def __init__(self, response):
+        super().__init__(response["statusCode"])
+        self.response = response
+
+
+def register_context(context):
+    """Call once per invocation: in-progress records then expire with the Lambda timeout."""
+    if context is not None:
+        config.register_lambda_context(context)
+
+
+def _header(event, name):
+    for key, value in (event.get("headers") or {}).items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def idempotent_request(handler):
+    """
+    Replay the stored response when a request repeats its Idempotency-Key.
+
+    Requests without the header run as before. 2xx/4xx responses are
+    stored; 5xx responses, and responses too large for one item, are not,
+    so the retry runs again. A retry that arrives while the first attempt
+    still runs gets 409.
+    """
+    @functools.wraps(handler)
+    def wrapper(event, *args, **kwargs):
+        key = _header(event, IDEMPOTENCY_HEADER)
+        if not key:
+            return handler(event, *args, **kwargs)
+        if len(key) > MAX_KEY_LENGTH:
+            return generate_response(400, {"msg": f"Idempotency-Key must be at most {MAX_KEY_LENGTH} characters"})
+
+        authorizer = (event.get("requestContext") or {}).get("authorizer") or {}
+        request = {
+            "principal": authorizer.get("principalId", "anonymous"),
+            "method": event.get("httpMethod"),
+            "path": event.get("path"),
+            "key": key,
+            "bodyHash": hashlib.sha256((event.get("body") or "").encode()).hexdigest(),
+        }
+
+        @idempotent_function(
+            data_keyword_argument="request",
+            persistence_store=_store(),
+            config=config,
+            key_prefix=handler.__name__,
+        )
+        def run(request):
+            response = handler(event, *args, **kwargs)
+            if response["statusCode"] >= 500:
+                raise _NotCacheable(response)
+            if len(json.dumps(response, default=str).encode()) > MAX_STORED_RESPONSE_BYTES:
+                logger.warning("Response too large to store", extra={"handler": handler.__name__})
+                raise _NotCacheable(response)
+            return response
+
+        try:
+            response = run(request=request)
+        except _NotCacheable as e:
+            return e.response
+        except IdempotencyAlreadyInProgressError:
+            return generate_response(409, {"msg": "A request with this Idempotency-Key is in progress"})
+        except IdempotencyValidationError:
+            return generate_response(422, {"msg": "Idempotency-Key was already used with a different request"})
+        except Exception:
+            logger.exception("Idempotency store failed", extra={"handler": handler.__name__})
+            return generate_response(500, {"msg": "Internal server error"})
+        return response
+
+    return wrapper
@@ -0,0 +1,101 @@
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+# UUIDv7 (RFC 9562): 48-bit unix ms | version 7 | 12-bit rand_a | variant | 62-bit rand_b.
+# rand_a is used as a per-millisecond sequence (RFC 9562 §6.2, method 1), so
+# ids from one container are strictly increasing and their string form
+# sorts in creation order.
+_VERSION = 0x7 << 76
+_VARIANT = 0b10 << 62
+_SEQUENCE_MAX = 0xFFF
+_LOW_BITS = (1 << 76) - 1
+
+_lock = threading.Lock()
+_last_ms = 0
+_sequence = 0
+
+
+def _next_timestamp():
+    """(ms, sequence), never going backwards, even if the clock does."""
+    global _last_ms, _sequence
+    with _lock:
+        now_ms = time.time_ns() // 1_000_000
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # Random start leaves room for ~2k more ids in the same ms
+            _sequence = random.getrandbits(11)
+        elif _sequence < _SEQUENCE_MAX:
+            _sequence += 1
+        else:
+            # Sequence exhausted: borrow the next millisecond
+            _last_ms += 1
+            _sequence = 0
+        return _last_ms, _sequence
+
+
+def uuid7():
+    ms, sequence = _next_timestamp()
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+    return uuid.UUID(int=(ms << 80) | _VERSION | (sequence << 64) | _VARIANT | rand_b)
+
+
+def new_id():
+    """New event/user id: a time-ordered UUIDv7 string."""
+    return str(uuid7())
+
+
+def parse_id(value):
+    """
+    Parse an id in either format we have issued (uuid4 before time-ordered
+    ids, uuid7 since). Raises ValueError.
+    """
+    try:
+        parsed = uuid.UUID(value)
+    except (TypeError, ValueError, AttributeError):
+        raise ValueError(f"Invalid id: {value!r}")
+    if parsed.version not in (4, 7):
+        raise ValueError(f"Unsupported id version: {parsed.version}")
+    return parsed
+
+
+def is_time_ordered(value):
+    return parse_id(value).version == 7
+
+
+def id_timestamp(value):
+    """Creation time encoded in a uuid7 id (UTC), or None for a uuid4."""
+    parsed = parse_id(value)
+    if parsed.version != 7:
+        return None
+    return datetime.fromtimestamp((parsed.int >> 80) / 1000, tz=timezone.utc)
+
+
+def _ms(moment):
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return int(moment.timestamp() * 1000)
+
+
+def min_id_at(moment):
+    """Smallest uuid7 of the millisecond `moment` falls in: a range bound for 'created since'."""
+    return str(uuid.UUID(int=(_ms(moment) << 80) | _VERSION | _VARIANT))
+
+
+def creation_sort_key(value, created_at=None):
+    """
+    Key that sorts ids by creation time. A uuid7 is its own key. A legacy
+    uuid4 gets a uuid7-shaped key built from `created_at` (datetime or
+    ISO string) and the id's own random bits, so keys stay unique.
+    """
+    parsed = parse_id(value)
+    if parsed.version == 7:
+        return str(parsed)
+    if created_at is None:
+        raise ValueError("created_at is required to order a uuid4 id")
+    if isinstance(created_at, str):
+        created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
+    return str(uuid.UUID(int=(_ms(created_at) << 80) | _VERSION | (parsed.int & _LOW_BITS)))
@@ -0,0 +1,152 @@
+"""
+Asymmetric (RS256 / EdDSA) signing for access tokens.
+
+- The auth Lambda signs with a private key read from Secrets Manager
+  (JWT_SIGNING_KEY_SECRET_NAME), stored as {"kid": "...", "private_key": "<PEM>"}.
+- Verifiers (authorizer, decode_token) only need the public key set, a JWKS
+  document bundled with the function (JWT_PUBLIC_KEYS_PATH) or passed inline
+  (JWT_PUBLIC_KEYS). The key is picked by the token's `kid` header, so no
+  secret lookup happens on the verification path.
+
+Rotation: publish the new public key next to the old one and deploy the
+verifiers, then switch the signing secret to the new key, then drop the old
+public key once the longest-lived token signed with it has expired.
+
+Generate a key pair with:
+    python jwt_keys.py generate --kid 2026-10 --alg EdDSA
+"""
+import argparse
+import json
+import threading
+
+import jwt
+from jwt import PyJWK
+
+import secret_cache
+from settings import settings
+
+JWT_ALGORITHM = settings.jwt_algorithm
+JWT_SIGNING_KEY_SECRET_NAME = settings.jwt_signing_key_secret_name
+JWT_PUBLIC_KEYS_PATH = settings.jwt_public_keys_path
+JWT_PUBLIC_KEYS = settings.jwt_public_keys
+
+ASYMMETRIC_ALGORITHMS = ("RS256", "EdDSA")
+
+
+def is_asymmetric(algorithm=None):
+    return (algorithm or JWT_ALGORITHM) in ASYMMETRIC_ALGORITHMS
+
+
+class KeyRing:
+    """Public keys by `kid`, loaded once per container."""
+
+    def __init__(self, jwks):
+        self.keys = {}
+        for jwk in jwks.get("keys", []):
+            key = PyJWK(jwk)
+            if not key.key_id:
+                raise ValueError("Every public key needs a 'kid'")
+            self.keys[key.key_id] = key
+
+    @classmethod
+    def load(cls, path=JWT_PUBLIC_KEYS_PATH, inline=JWT_PUBLIC_KEYS):
+        if inline:
+            return cls(json.loads(inline))
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def verify(self, token, **options):
+        kid = jwt.get_unverified_header(token).get("kid")
+        key = self.keys.get(kid)
+        if key is None:
+            raise jwt.InvalidTokenError(f"Unknown signing key: {kid}")
+        return jwt.decode(token, key.key, algorithms=[key.algorithm_name], **options)
+
+
+class SigningKey:
+    """Private key used by the auth Lambda, re-parsed only when the secret changes."""
+
+    def __init__(self, secret_name=JWT_SIGNING_KEY_SECRET_NAME, algorithm=JWT_ALGORITHM):
+        self.secret_name = secret_name
+        self.algorithm = algorithm
+        self._pem = None
+        self._kid = None
+        self._key = None
+        self._lock = threading.Lock()
+
+    def _current(self):
+        secret = secret_cache.get_secret(self.secret_name)
+        pem = secret["private_key"]
+        if pem != self._pem:
+            with self._lock:
+                self._key = jwt.get_algorithm_by_name(self.algorithm).prepare_key(pem)
+                self._kid = secret["kid"]
+                self._pem = pem
+        return self._kid, self._key
+
+    def sign(self, payload):
+        kid, key = self._current()
+        return jwt.encode(payload, key, algorithm=self.algorithm, headers={"kid": kid})
+
+
+_key_ring = None
+_signing_key = None
+
+
+def get_key_ring():
+    global _key_ring
+    if _key_ring is None:
+        _key_ring = KeyRing.load()
+    return _key_ring
+
+
+def get_signing_key():
+    global _signing_key
+    if _signing_key is None:
+        _signing_key = SigningKey()
+    return _signing_key
+
+
+def sign(payload):
+    return get_signing_key().sign(payload)
+
+
+def verify(token, **options):
+    return get_key_ring().verify(token, **options)
+
+
+def generate_key_pair(kid, algorithm="EdDSA"):
+    """Return (signing secret, public JWK) for a new key."""
+    from cryptography.hazmat.primitives import serialization
+    from cryptography.hazmat.primitives.asymmetric import ed25519, rsa
+
+    if algorithm == "EdDSA":
+        private_key = ed25519.Ed25519PrivateKey.generate()
+    elif algorithm == "RS256":
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    else:
+        raise ValueError(f"Unsupported algorithm: {algorithm}")
+
+    pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_jwk = json.loads(jwt.get_algorithm_by_name(algorithm).to_jwk(private_key.public_key()))
+    public_jwk.update({"kid": kid, "alg": algorithm, "use": "sig"})
+    return {"kid": kid, "private_key": pem}, public_jwk
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JWT signing key tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    gen = sub.add_parser("generate", help="Create a key pair")
+    gen.add_argument("--kid", required=True)
+    gen.add_argument("--alg", choices=ASYMMETRIC_ALGORITHMS, default="EdDSA")
+    args = parser.parse_args()
+
+    secret, public_jwk = generate_key_pair(args.kid, args.alg)
+    print("# Secrets Manager value for JWT_SIGNING_KEY_SECRET_NAME")
+    print(json.dumps(secret))
+    print("# Add to the 'keys' list of jwks.json")
+    print(json.dumps(public_jwk, indent=2))
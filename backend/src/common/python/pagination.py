@@ -0,0 +1,88 @@
+import base64
+import hashlib
+import hmac
+import json
+
+import secret_cache
+from settings import settings
+
+DEFAULT_PAGE_SIZE = settings.default_page_size
+MAX_PAGE_SIZE = settings.max_page_size
+# Secret the cursor signing key is derived from (defaults to the JWT secret)
+CURSOR_SECRET_NAME = settings.cursor_secret_name
+
+
+class InvalidPageRequest(ValueError):
+    pass
+
+
+def _b64encode(data):
+    return base64.urlsafe_b64encode(data).rstrip(b"=").decode()
+
+
+def _b64decode(text):
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _signing_key():
+    secret = secret_cache.get_secret(CURSOR_SECRET_NAME)
+    if isinstance(secret, dict):
+        secret = json.dumps(secret, sort_keys=True)
+    # Derived key: a cursor MAC never doubles as a JWT signature
+    return hmac.new(secret.encode(), b"pagination-cursor", hashlib.sha256).digest()
+
+
+def _mac(payload, scope):
+    return hmac.new(_signing_key(), scope.encode() + b"\0" + payload, hashlib.sha256).digest()
+
+
+def encode_cursor(last_evaluated_key, scope):
+    """
+    Opaque continuation token for a LastEvaluatedKey: base64url(json).base64url(hmac).
+
+    `scope` names the listing (and caller) the cursor belongs to, so a
+    cursor cannot be replayed against another query or user.
+    """
+    if not last_evaluated_key:
+        return None
+    payload = json.dumps(last_evaluated_key, separators=(",", ":"), sort_keys=True).encode()
+    return f"{_b64encode(payload)}.{_b64encode(_mac(payload, scope))}"
+
+
+def decode_cursor(cursor, scope):
+    if not cursor:
+        return None
+    try:
+        payload_part, mac_part = cursor.split(".")
+        payload = _b64decode(payload_part)
+        mac = _b64decode(mac_part)
+    except (ValueError, TypeError):
+        raise InvalidPageRequest("Malformed cursor")
+    if not hmac.compare_digest(mac, _mac(payload, scope)):
+        raise InvalidPageRequest("Invalid cursor")
+    return json.loads(payload)
+
+
+def page_params(event, scope):
+    """
+    Read ?limit= and ?cursor= from an API Gateway event.
+    Returns (limit, exclusive_start_key or None). Raises InvalidPageRequest.
+    """
+    params = event.get("queryStringParameters") or {}
+    try:
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise InvalidPageRequest("limit must be an integer")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise InvalidPageRequest(f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, decode_cursor(params.get("cursor"), scope)
+
+
+def query_page(table, limit, start_key=None, **query_kwargs):
+    """
+    One page of a Query. Returns (items, last_evaluated_key).
+    """
+    if start_key:
+        query_kwargs["ExclusiveStartKey"] = start_key
+    resp = table.query(Limit=limit, **query_kwargs)
+    return resp["Items"], resp.get("LastEvaluatedKey")
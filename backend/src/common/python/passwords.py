@@ -0,0 +1,206 @@
+"""
+Password hashing.
+
+New hashes use PASSWORD_HASHER (bcrypt by default, argon2 when argon2-cffi is
+installed). Stored hashes are recognised by their format, so legacy unsalted
+SHA-256 hex digests still verify and are flagged for an upgrade on the next
+successful login.
+
+The work factor should be calibrated on the Lambda itself, since CPU scales
+with the configured memory size:
+    aws lambda invoke --function-name <auth lambda> \
+        --payload '{"action": "calibrate_password_hash", "target_ms": 250}' out.json
+or locally with `python passwords.py calibrate --target-ms 250`.
+"""
+import argparse
+import hashlib
+import hmac
+import json
+import os
+import re
+import time
+
+import bcrypt
+
+from settings import settings
+
+PASSWORD_HASHER = settings.password_hasher
+# bcrypt log2 rounds; 10 ≈ 100ms on a 1024 MB Lambda
+PASSWORD_HASH_ROUNDS = settings.password_hash_rounds
+# argon2 parameters
+ARGON2_TIME_COST = settings.argon2_time_cost
+ARGON2_MEMORY_COST = settings.argon2_memory_cost
+
+# bcrypt ignores (and bcrypt>=5 rejects) anything past 72 bytes
+MAX_PASSWORD_BYTES = 72
+
+_SHA256_HEX = re.compile(r"^[0-9a-f]{64}$")
+
+
+class BcryptHasher:
+    name = "bcrypt"
+
+    def __init__(self, rounds=PASSWORD_HASH_ROUNDS):
+        self.rounds = rounds
+
+    def identifies(self, hashed):
+        return hashed.startswith(("$2a$", "$2b$", "$2y$"))
+
+    def hash(self, password):
+        return bcrypt.hashpw(password.encode(), bcrypt.gensalt(self.rounds)).decode()
+
+    def verify(self, password, hashed):
+        try:
+            return bcrypt.checkpw(password.encode(), hashed.encode())
+        except ValueError:
+            return False
+
+    def needs_rehash(self, hashed):
+        return int(hashed.split("$")[2]) != self.rounds
+
+
+class Argon2Hasher:
+    name = "argon2"
+
+    def __init__(self, time_cost=ARGON2_TIME_COST, memory_cost=ARGON2_MEMORY_COST):
+        try:
+            from argon2 import PasswordHasher
+            from argon2.exceptions import VerificationError, InvalidHashError
+        except ImportError:
+            raise RuntimeError("PASSWORD_HASHER=argon2 requires the argon2-cffi package")
+        self._hasher = PasswordHasher(time_cost=time_cost, memory_cost=memory_cost)
+        self._errors = (VerificationError, InvalidHashError)
+
+    def identifies(self, hashed):
+        return hashed.startswith("$argon2")
+
+    def hash(self, password):
+        return self._hasher.hash(password)
+
+    def verify(self, password, hashed):
+        try:
+            return self._hasher.verify(hashed, password)
+        except self._errors:
+            return False
+
+    def needs_rehash(self, hashed):
+        return self._hasher.check_needs_rehash(hashed)
+
+
+class LegacySha256Hasher:
+    """Unsalted SHA-256 hex digests written before adaptive hashing. Verify only."""
+
+    name = "sha256"
+
+    def identifies(self, hashed):
+        return bool(_SHA256_HEX.match(hashed))
+
+    def hash(self, password):
+        return hashlib.sha256(password.encode()).hexdigest()
+
+    def verify(self, password, hashed):
+        return hmac.compare_digest(self.hash(password), hashed)
+
+    def needs_rehash(self, hashed):
+        return True
+
+
+HASHERS = {
+    "bcrypt": BcryptHasher,
+    "argon2": Argon2Hasher,
+}
+
+_default_hasher = None
+
+
+def get_hasher():
+    global _default_hasher
+    if _default_hasher is None:
+        if PASSWORD_HASHER not in HASHERS:
+            raise ValueError(f"Unknown PASSWORD_HASHER: {PASSWORD_HASHER}")
+        _default_hasher = HASHERS[PASSWORD_HASHER]()
+    return _default_hasher
+
+
+def identify(hashed):
+    default = get_hasher()
+    if default.identifies(hashed):
+        return default
+    for hasher in (BcryptHasher(), LegacySha256Hasher()):
+        if hasher.identifies(hashed):
+            return hasher
+    if hashed.startswith("$argon2"):
+        return Argon2Hasher()
+    return None
+
+
+def hash_password(password):
+    return get_hasher().hash(password)
+
+
+def verify_password(password, hashed):
+    """
+    Check a password against any supported stored format.
+
+    Returns (valid, new_hash): new_hash is set when the password is valid
+    but the stored hash uses an old scheme or work factor and should be
+    replaced.
+    """
+    hasher = identify(hashed or "")
+    if hasher is None or not hasher.verify(password, hashed):
+        return False, None
+
+    default = get_hasher()
+    if default.name == "bcrypt" and len(password.encode()) > MAX_PASSWORD_BYTES:
+        # Only a legacy hash can hold such a password, and bcrypt cannot
+        # take it: keep the stored hash rather than fail the login
+        return True, None
+    if hasher.name != default.name or default.needs_rehash(hashed):
+        return True, default.hash(password)
+    return True, None
+
+
+# ---------------- calibration ----------------
+
+def _time_hash(hasher, samples):
+    timings = []
+    for _ in range(samples):
+        start = time.perf_counter()
+        hasher.hash("calibration-password")
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)[len(timings) // 2]
+
+
+def calibrate(target_ms=250, samples=3, min_rounds=8, max_rounds=16):
+    """
+    Benchmark bcrypt on this machine and return the highest number of rounds
+    whose median hash time stays within target_ms.
+    Each extra round doubles the cost, so we stop as soon as we overshoot.
+    """
+    results = []
+    chosen = min_rounds
+    for rounds in range(min_rounds, max_rounds + 1):
+        median_ms = _time_hash(BcryptHasher(rounds), samples)
+        results.append({"rounds": rounds, "median_ms": round(median_ms, 1)})
+        if median_ms > target_ms:
+            break
+        chosen = rounds
+
+    return {
+        "hasher": "bcrypt",
+        "target_ms": target_ms,
+        "recommended_rounds": chosen,
+        "memory_mb": os.environ.get("AWS_LAMBDA_FUNCTION_MEMORY_SIZE"),
+        "results": results,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Password hashing tools")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cal = sub.add_parser("calibrate", help="Find the bcrypt rounds for a target latency")
+    cal.add_argument("--target-ms", type=float, default=250)
+    cal.add_argument("--samples", type=int, default=3)
+    args = parser.parse_args()
+
+    print(json.dumps(calibrate(args.target_ms, args.samples), indent=2))
@@ -0,0 +1,303 @@
+import hashlib
+
+import aws_clients
+import dynamo_codec as codec
+from dynamo_batch import batch_get, batch_write, UnprocessedItemsError
+from settings import settings
+
+# ------------------------
+# Keys
+# ------------------------
+
+def event_key(event_id):
+    return {"PK": f"EVENT#{event_id}", "SK": "METADATA"}
+
+
+def tombstone_key(event_id):
+    """EVENT#<id> / TOMBSTONE: left behind by a deleted event for the change feed."""
+    return {"PK": f"EVENT#{event_id}", "SK": "TOMBSTONE"}
+
+
+def profile_key(user_id):
+    return {"PK": f"USER#{user_id}", "SK": "PROFILE"}
+
+
+def assignment_key(user_id, event_id):
+    """USER#<id> / EVENT#<id>: the user → events side of the adjacency list."""
+    return {"PK": f"USER#{user_id}", "SK": f"EVENT#{event_id}"}
+
+
+def removal_key(user_id, event_id):
+    """USER#<id> / REMOVED#<id>: a recent removal, so the user's change feed reports it."""
+    return {"PK": f"USER#{user_id}", "SK": f"REMOVED#{event_id}"}
+
+
+def user_partition(user_id):
+    return f"USER#{user_id}"
+
+
+def event_partition(event_id):
+    return f"EVENT#{event_id}"
+
+
+def event_id_of(sort_key):
+    """'EVENT#<id>' (an assignment SK) or 'REMOVED#<id>' → '<id>'."""
+    return sort_key.split("#", 1)[1]
+
+
+def event_shard(event_id, shards=None):
+    """Stable per event, so updates never move an event between shards."""
+    return int(hashlib.md5(event_id.encode()).hexdigest(), 16) % (shards or settings.event_shards)
+
+
+def event_month_partition(month, shard):
+    return f"EVENTS#{month}#{shard}"
+
+
+def event_index_keys(date, event_id, shards=None):
+    """GSI1 keys of EVENT#/METADATA: month bucket + shard, sorted by date then id."""
+    return {
+        "GSI1PK": event_month_partition(date[:7], event_shard(event_id, shards)),
+        "GSI1SK": f"{date}#{event_id}",
+    }
+
+
+def user_events_sort_key(date, event_id):
+    """GSI2SK of an assignment: a user's events sorted by date."""
+    return f"{date}#{event_id}"
+
+
+def change_partition(shard):
+    return f"CHANGES#EVENT#{shard}"
+
+
+def change_keys(event_id, updated_at, shards=None):
+    """updatedAt and the GSI3 change-feed keys, stamped on every METADATA/TOMBSTONE write."""
+    return {
+        "updatedAt": updated_at,
+        "GSI3PK": change_partition(event_shard(event_id, shards)),
+        "GSI3SK": f"{updated_at}#{event_id}",
+    }
+
+
+# Attributes clients may see, and ask for with ?fields=, per resource.
+# Keys, index attributes and audit fields (createdBy) stay internal.
+EVENT_FIELDS = (
+    "eventId", "title", "date", "location", "createdAt", "updatedAt",
+    "attendeeCount", "confirmedCount",
+)
+ASSIGNMENT_FIELDS = ("eventId", "title", "date", "location", "status", "assignedAt")
+PROFILE_FIELDS = ("userId", "email", "role", "provider", "confirmed", "createdAt")
+
+
+def projection(fields, always=()):
+    """
+    (ProjectionExpression, ExpressionAttributeNames) for attribute names;
+    every name goes through a placeholder, so reserved words ("status",
+    "role", "date") need no special casing. (None, None) for no projection.
+    """
+    if not fields:
+        return None, None
+    names = list(dict.fromkeys([*always, *fields]))
+    placeholders = {f"#p{i}": name for i, name in enumerate(names)}
+    return ", ".join(placeholders), placeholders
+
+# ------------------------
+# Repositories
+# ------------------------
+
+class Repository:
+    """
+    Reads and writes on the low-level DynamoDB client: requests and
+    responses go through dynamo_codec, so items come back as plain dicts of
+    str/int/float/bool/list/dict (no Decimal) and cursors stay
+    JSON-serialisable. Writes take the usual request parameters with
+    native values in Item, Key and ExpressionAttributeValues.
+    """
+
+    def __init__(self, client=None, table_name=None):
+        self.client = client or aws_clients.client("dynamodb")
+        self.table_name = table_name or settings.db_table
+
+    def _get(self, key, fields=None, consistent=False):
+        request = {"TableName": self.table_name, "Key": codec.encode_item(key), "ConsistentRead": consistent}
+        expression, names = projection(fields)
+        if expression:
+            request.update(ProjectionExpression=expression, ExpressionAttributeNames=names)
+        return codec.decode_item(self.client.get_item(**request).get("Item"))
+
+    def _get_many(self, keys, fields=None, consistent=False):
+        """Items for `keys`, in key order, missing ones skipped (chunked BatchGetItem)."""
+        # The key attributes come back too: batch_get matches items to keys by them
+        expression, names = projection(fields, always=("PK", "SK"))
+        items = batch_get(
+            self.client, self.table_name,
+            [codec.encode_item(k) for k in keys],
+            projection=expression, expression_names=names,
+            consistent_read=consistent,
+        )
+        return [codec.decode_item(item) for item in items]
+
+    def get_items(self, keys, fields=None, consistent=False):
+        """Items of any kind by primary key, in key order (one chunked BatchGetItem)."""
+        return self._get_many(keys, fields, consistent)
+
+    def put(self, item, **request):
+        self.client.put_item(**self._request({"Item": item, **request}))
+
+    def update(self, key, **request):
+        """UpdateItem; returns the decoded Attributes asked for with ReturnValues, else None."""
+        response = self.client.update_item(**self._request({"Key": key, **request}))
+        return codec.decode_item(response.get("Attributes"))
+
+    def delete(self, key, **request):
+        self.client.delete_item(**self._request({"Key": key, **request}))
+
+    def transact_write(self, actions):
+        """TransactWriteItems over [{"Put" | "Update" | "Delete" | "ConditionCheck": request}, ...]."""
+        self.client.transact_write_items(TransactItems=[
+            {kind: self._request(request) for kind, request in action.items()}
+            for action in actions
+        ])
+
+    def write_many(self, puts=(), deletes=(), workers=1):
+        """
+        Unconditional puts and deletes through dynamo_batch.batch_write.
+        UnprocessedItemsError carries the unapplied requests decoded.
+        """
+        try:
+            return batch_write(
+                self.client, self.table_name,
+                puts=[codec.encode_item(i) for i in puts],
+                deletes=[codec.encode_item({"PK": k["PK"], "SK": k["SK"]}) for k in deletes],
+                workers=workers,
+            )
+        except UnprocessedItemsError as e:
+            raise UnprocessedItemsError(str(e), [
+                {kind: {part: codec.decode_item(av) for part, av in body.items()} for kind, body in request.items()}
+                for request in e.unprocessed
+            ]) from e
+
+    def _request(self, request):
+        encoded = {"TableName": self.table_name, **request}
+        for field in ("Item", "Key", "ExpressionAttributeValues"):
+            if field in encoded:
+                encoded[field] = codec.encode_item(encoded[field])
+        return encoded
+
+    def _query(self, limit, start_key=None, fields=None, values=None, **query_kwargs):
+        """
+        One page of a Query. `values` are the native ExpressionAttributeValues
+        of the key condition. Returns (items, last_evaluated_key).
+        """
+        request = {"TableName": self.table_name, "Limit": limit, **query_kwargs}
+        if values:
+            request["ExpressionAttributeValues"] = codec.encode_item(values)
+        if start_key:
+            request["ExclusiveStartKey"] = codec.encode_item(start_key)
+        expression, names = projection(fields)
+        if expression:
+            request["ProjectionExpression"] = expression
+            request["ExpressionAttributeNames"] = {**request.get("ExpressionAttributeNames", {}), **names}
+        resp = self.client.query(**request)
+        return [codec.decode_item(i) for i in resp["Items"]], codec.decode_item(resp.get("LastEvaluatedKey"))
+
+
+class EventRepository(Repository):
+
+    def get(self, event_id, fields=None, consistent=False):
+        return self._get(event_key(event_id), fields, consistent)
+
+    def get_many(self, event_ids, fields=None):
+        return self._get_many([event_key(i) for i in event_ids], fields)
+
+    def dated(self, partition, low, high, limit, fields=None):
+        """One GSI1 event partition (EVENTS#<month>#<shard>), GSI1SK between low and high."""
+        items, _ = self._query(
+            limit, fields=fields,
+            IndexName="GSI1",
+            KeyConditionExpression="GSI1PK = :pk AND GSI1SK BETWEEN :low AND :high",
+            values={":pk": partition, ":low": low, ":high": high},
+        )
+        return items
+
+    def changed(self, partition, low, high, limit):
+        """One GSI3 change-feed partition (CHANGES#EVENT#<shard>). Returns (items, last_key)."""
+        return self._query(
+            limit,
+            IndexName="GSI3",
+            KeyConditionExpression="GSI3PK = :pk AND GSI3SK BETWEEN :low AND :high",
+            values={":pk": partition, ":low": low, ":high": high},
+        )
+
+
+class UserRepository(Repository):
+
+    def get_profile(self, user_id, fields=None, consistent=False):
+        return self._get(profile_key(user_id), fields, consistent)
+
+    def get_profiles(self, user_ids, fields=None):
+        return self._get_many([profile_key(i) for i in user_ids], fields)
+
+    def get_login(self, key):
+        """The EMAIL# login record at `key` (see auth users.email_key), strongly consistent."""
+        return self._get(key, consistent=True)
+
+    def find_by_email(self, email):
+        """The PROFILE listed under GSI1 USER / <email>, or None."""
+        items, _ = self._query(
+            1,
+            IndexName="GSI1",
+            KeyConditionExpression="GSI1PK = :pk AND GSI1SK = :email",
+            values={":pk": "USER", ":email": email},
+        )
+        return items[0] if items else None
+
+
+class AssignmentRepository(Repository):
+
+    def get(self, user_id, event_id, fields=None, consistent=False):
+        return self._get(assignment_key(user_id, event_id), fields, consistent)
+
+    def get_many(self, event_id, user_ids, fields=None, consistent=False):
+        """The USER#/EVENT# assignments of `user_ids` to the event that exist."""
+        return self._get_many([assignment_key(u, event_id) for u in user_ids], fields, consistent)
+
+    def for_user(self, user_id, limit, start_key=None, newest_first=False, fields=None):
+        """A user's assignments by event date (GSI2 USER#<id>). Returns (items, last_key)."""
+        return self._query(
+            limit, start_key, fields,
+            IndexName="GSI2",
+            KeyConditionExpression="GSI2PK = :pk",
+            values={":pk": user_partition(user_id)},
+            ScanIndexForward=not newest_first,
+        )
+
+    def event_ids_for_user(self, user_id, page_size=200):
+        """Every event id assigned to the user, across all pages of USER#<id>."""
+        return self._event_ids(user_id, "EVENT#", page_size)
+
+    def removed_event_ids_for_user(self, user_id, page_size=200):
+        """Event ids the user was removed from, while their REMOVED# markers last."""
+        return self._event_ids(user_id, "REMOVED#", page_size)
+
+    def _event_ids(self, user_id, prefix, page_size):
+        event_ids, start_key = [], None
+        while True:
+            items, start_key = self._query(
+                page_size, start_key, ("SK",),
+                KeyConditionExpression="PK = :pk AND begins_with(SK, :prefix)",
+                values={":pk": user_partition(user_id), ":prefix": prefix},
+            )
+            event_ids += [event_id_of(a["SK"]) for a in items]
+            if not start_key:
+                return event_ids
+
+    def roster(self, event_id, limit, start_key=None, fields=None):
+        """The event → users side: GSI1 EVENT#<id>. Returns (items, last_key)."""
+        return self._query(
+            limit, start_key, fields,
+            IndexName="GSI1",
+            KeyConditionExpression="GSI1PK = :pk AND begins_with(GSI1SK, :prefix)",
+            values={":pk": event_partition(event_id), ":prefix": "USER#"},
+        )
@@ -0,0 +1,114 @@
+import hashlib
+import threading
+import time
+
+from boto3.dynamodb.conditions import Key
+
+import aws_clients
+from settings import settings
+
+# Seconds between reloads of the revoked-family list into the filter
+REVOCATION_FILTER_REFRESH = settings.revocation_filter_refresh
+# Filter size in bits (8 KB by default, ~1% false positives at 7k revoked families)
+REVOCATION_FILTER_BITS = settings.revocation_filter_bits
+REVOCATION_FILTER_HASHES = 7
+
+# GSI1 partition holding revoked refresh-token families until their TTL
+REVOKED_PARTITION = "REVOKED#REFRESH"
+
+
+def family_key(family_id):
+    return {"PK": f"REFRESH#{family_id}", "SK": "FAMILY"}
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter: no false negatives, tunable false positives."""
+
+    def __init__(self, bits=REVOCATION_FILTER_BITS, hashes=REVOCATION_FILTER_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+
+    def _positions(self, value):
+        digest = hashlib.sha256(value.encode()).digest()
+        h1 = int.from_bytes(digest[:8], "big")
+        h2 = int.from_bytes(digest[8:16], "big") | 1
+        return [(h1 + i * h2) % self.bits for i in range(self.hashes)]
+
+    def add(self, value):
+        for pos in self._positions(value):
+            self._array[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, value):
+        return all(self._array[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(value))
+
+
+class RevocationList:
+    """
+    Revoked refresh-token families as seen by this container.
+
+    The filter is rebuilt from the REVOKED#REFRESH partition every
+    REVOCATION_FILTER_REFRESH seconds. A miss means "not revoked" with no
+    DynamoDB read; a hit is confirmed with a consistent get_item.
+    """
+
+    def __init__(self, table=None, refresh_interval=REVOCATION_FILTER_REFRESH, clock=time.monotonic):
+        self._table = table
+        self.refresh_interval = refresh_interval
+        self._clock = clock
+        self._filter = BloomFilter()
+        self._loaded_at = None
+        self._lock = threading.Lock()
+
+    @property
+    def table(self):
+        if self._table is None:
+            self._table = aws_clients.resource("dynamodb").Table(settings.db_table)
+        return self._table
+
+    def _reload_if_stale(self):
+        if self._loaded_at is not None and self._clock() - self._loaded_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._loaded_at is not None and self._clock() - self._loaded_at < self.refresh_interval:
+                return
+            fresh = BloomFilter(self._filter.bits, self._filter.hashes)
+            kwargs = {
+                "IndexName": "GSI1",
+                "KeyConditionExpression": Key("GSI1PK").eq(REVOKED_PARTITION),
+                "ProjectionExpression": "GSI1SK",
+            }
+            while True:
+                resp = self.table.query(**kwargs)
+                for item in resp["Items"]:
+                    fresh.add(item["GSI1SK"])
+                if "LastEvaluatedKey" not in resp:
+                    break
+                kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+            self._filter = fresh
+            self._loaded_at = self._clock()
+
+    def add(self, family_id):
+        """Record a revocation made by this container without waiting for a reload."""
+        self._filter.add(family_id)
+
+    def is_revoked(self, family_id):
+        self._reload_if_stale()
+        if family_id not in self._filter:
+            return False
+        item = self.table.get_item(
+            Key=family_key(family_id),
+            ConsistentRead=True,
+            ProjectionExpression="revokedAt",
+        ).get("Item")
+        return bool(item and "revokedAt" in item)
+
+
+_revocation_list = None
+
+
+def get_revocation_list():
+    global _revocation_list
+    if _revocation_list is None:
+        _revocation_list = RevocationList()
+    return _revocation_list
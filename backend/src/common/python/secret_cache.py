@@ -0,0 +1,231 @@
+import base64
+import json
+import threading
+import time
+
+from botocore.exceptions import ClientError
+from aws_lambda_powertools import Logger
+
+import aws_clients
+from settings import settings
+
+logger = Logger(service="flycalcio-app", child=True)
+
+# Seconds a secret is served without contacting Secrets Manager
+SECRET_CACHE_TTL = settings.secret_cache_ttl
+# Extra seconds an expired secret may still be served while it is refreshed
+# in the background, or while Secrets Manager is throttling us
+SECRET_CACHE_MAX_STALE = settings.secret_cache_max_stale
+# Minimum seconds between forced "has it rotated?" checks for one secret
+SECRET_CACHE_MIN_REFRESH_INTERVAL = settings.secret_cache_min_refresh_interval
+
+CURRENT_STAGE = "AWSCURRENT"
+PREVIOUS_STAGE = "AWSPREVIOUS"
+
+THROTTLING_ERRORS = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "RequestLimitExceeded",
+    "InternalServiceError",
+}
+
+
+def parse_secret(response):
+    """
+    Decode a GetSecretValue response: JSON secrets become dicts,
+    anything else is returned as a string.
+    """
+    if "SecretString" in response:
+        raw = response["SecretString"]
+    else:
+        raw = base64.b64decode(response["SecretBinary"]).decode()
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
+
+
+class _Entry:
+    __slots__ = ("value", "version_id", "fetched_at", "checked_at", "refreshing")
+
+    def __init__(self, value, version_id, fetched_at):
+        self.value = value
+        self.version_id = version_id
+        self.fetched_at = fetched_at
+        self.checked_at = fetched_at
+        self.refreshing = False
+
+
+class SecretCache:
+    """
+    Process-wide Secrets Manager cache, one entry per (secret, version stage).
+
+    - fresh (age < ttl): served from memory
+    - stale (age < ttl + max_stale): served from memory and refreshed in a
+      background thread (stale-while-revalidate)
+    - expired or missing: fetched synchronously; if Secrets Manager throttles
+      and a stale value exists, the stale value is served instead
+    """
+
+    def __init__(self, region_name="eu-central-1", client=None, ttl=SECRET_CACHE_TTL,
+                 max_stale=SECRET_CACHE_MAX_STALE,
+                 min_refresh_interval=SECRET_CACHE_MIN_REFRESH_INTERVAL,
+                 clock=time.monotonic):
+        self.region_name = region_name
+        self.ttl = ttl
+        self.max_stale = max_stale
+        self.min_refresh_interval = min_refresh_interval
+        self._clock = clock
+        self._client = client
+        self._entries = {}
+        # (secret, stage) -> when the stage was last found missing
+        self._missing = {}
+        self._lock = threading.Lock()
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = aws_clients.client("secretsmanager", region_name=self.region_name)
+        return self._client
+
+    def get(self, secret_id, version_stage=CURRENT_STAGE):
+        key = (secret_id, version_stage)
+        entry = self._entries.get(key)
+        if entry is None:
+            return self._refresh(key).value
+
+        age = self._clock() - entry.fetched_at
+        if age < self.ttl:
+            return entry.value
+        if age < self.ttl + self.max_stale:
+            self._refresh_in_background(key, entry)
+            return entry.value
+        return self._refresh(key).value
+
+    def get_optional(self, secret_id, version_stage):
+        """
+        Like get(), but returns None when no version carries the stage
+        (e.g. AWSPREVIOUS before the first rotation). A missing stage is
+        remembered for min_refresh_interval, like refresh_if_rotated, so
+        forged tokens cannot each cost a Secrets Manager call.
+        """
+        key = (secret_id, version_stage)
+        missing_at = self._missing.get(key)
+        if missing_at is not None and self._clock() - missing_at < self.min_refresh_interval:
+            return None
+        try:
+            value = self.get(secret_id, version_stage)
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ResourceNotFoundException":
+                self._missing[key] = self._clock()
+                return None
+            raise
+        self._missing.pop(key, None)
+        return value
+
+    def refresh_if_rotated(self, secret_id, version_stage=CURRENT_STAGE):
+        """
+        Re-read a stage and report whether it now points at a different
+        version. Checks are rate limited per secret so a flood of bad
+        signatures cannot turn into a flood of Secrets Manager calls.
+        """
+        key = (secret_id, version_stage)
+        entry = self._entries.get(key)
+        if entry is not None and self._clock() - entry.checked_at < self.min_refresh_interval:
+            return False
+        old_version = entry.version_id if entry else None
+        rotated = self._refresh(key).version_id != old_version
+        if rotated:
+            # A rotation creates the stages that were missing before it
+            self._forget_missing(secret_id)
+        return rotated
+
+    def call_with_rotation(self, secret_id, fn, retry_on):
+        """
+        Run fn(secret) with the current secret. If it fails with one of
+        `retry_on`, the secret may have been rotated under us: retry with the
+        new AWSCURRENT if it changed, otherwise with AWSPREVIOUS so values
+        produced just before a rotation stay valid.
+        """
+        try:
+            return fn(self.get(secret_id))
+        except retry_on as error:
+            if self.refresh_if_rotated(secret_id):
+                return fn(self.get(secret_id))
+            previous = self.get_optional(secret_id, PREVIOUS_STAGE)
+            if previous is None:
+                raise error
+            return fn(previous)
+
+    def invalidate(self, secret_id=None):
+        with self._lock:
+            if secret_id is None:
+                self._entries.clear()
+                self._missing.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == secret_id]:
+                    del self._entries[key]
+                self._forget_missing(secret_id)
+
+    # ---------------- internals ----------------
+
+    def _forget_missing(self, secret_id):
+        for key in [k for k in self._missing if k[0] == secret_id]:
+            self._missing.pop(key, None)
+
+    def _refresh(self, key):
+        secret_id, version_stage = key
+        entry = self._entries.get(key)
+        try:
+            response = self.client.get_secret_value(SecretId=secret_id, VersionStage=version_stage)
+        except ClientError as e:
+            code = e.response["Error"]["Code"]
+            if entry is not None and code in THROTTLING_ERRORS:
+                logger.warning("Secrets Manager throttled, serving stale secret",
+                               extra={"secretId": secret_id, "code": code})
+                return entry
+            raise
+
+        now = self._clock()
+        version_id = response.get("VersionId")
+        if entry is not None and entry.version_id == version_id:
+            # Same version behind the stage: keep the parsed value
+            entry.fetched_at = now
+            entry.checked_at = now
+            return entry
+
+        entry = _Entry(parse_secret(response), version_id, now)
+        with self._lock:
+            self._entries[key] = entry
+        return entry
+
+    def _refresh_in_background(self, key, entry):
+        with self._lock:
+            if entry.refreshing:
+                return
+            entry.refreshing = True
+
+        def run():
+            try:
+                self._refresh(key)
+            except Exception:
+                logger.exception("Background secret refresh failed", extra={"secretId": key[0]})
+            finally:
+                entry.refreshing = False
+
+        threading.Thread(target=run, daemon=True).start()
+
+
+_caches = {}
+
+
+def get_cache(region_name="eu-central-1"):
+    """Return the container-wide cache for a region."""
+    cache = _caches.get(region_name)
+    if cache is None:
+        cache = _caches.setdefault(region_name, SecretCache(region_name=region_name))
+    return cache
+
+
+def get_secret(secret_name, region_name="eu-central-1", version_stage=CURRENT_STAGE):
+    return get_cache(region_name).get(secret_name, version_stage)
@@ -0,0 +1,211 @@
+"""
+Configuration, read from the environment once per container.
+
+    from settings import settings
+    settings.access_token_expiration  # int, seconds
+
+Every value resolves, lowest precedence first, from:
+  1. the defaults on Settings,
+  2. STAGE_OVERRIDES for the stage (ENVIRONMENT: local, test, dev, prod),
+  3. the environment variable named after the field (access_token_expiration
+     → ACCESS_TOKEN_EXPIRATION); off Lambda, a .env file is read first.
+
+Values are parsed and validated at import: a bad value stops the function
+during init with a ConfigError naming every problem, instead of failing
+requests one by one.
+"""
+import dataclasses
+import os
+from dataclasses import dataclass, field
+
+STAGES = ("local", "test", "dev", "prod")
+PASSWORD_HASHERS = ("bcrypt", "argon2")
+JWT_ALGORITHMS = ("HS256", "RS256", "EdDSA")
+
+# Per-stage defaults; an environment variable still wins over these
+STAGE_OVERRIDES = {
+    # Fast hashing and long-lived access tokens for local development
+    "local": {"password_hash_rounds": 4, "access_token_expiration": 3600},
+    "test": {"password_hash_rounds": 4},
+    "dev": {},
+    "prod": {
+        "jwt_secret_name": "flycalcio-jwtkey-prod-secret",
+        "jwt_refresh_secret_name": "flycalcio-jwt-refresh-key-prod-secret",
+        "jwt_signing_key_secret_name": "flycalcio-jwt-signing-key-prod-secret",
+    },
+}
+
+
+class ConfigError(Exception):
+    pass
+
+
+def _derived(**metadata):
+    """A field computed by load(), not read from its own variable."""
+    return field(default=None, metadata={"derived": True, **metadata})
+
+
+def _env(name, default):
+    """A field read from a variable that is not named after it."""
+    return field(default=default, metadata={"env": name})
+
+
+@dataclass(frozen=True)
+class Settings:
+    stage: str = _env("ENVIRONMENT", "dev")
+    on_lambda: bool = _derived()
+    function_name: str | None = _env("AWS_LAMBDA_FUNCTION_NAME", None)
+    # Set per function by the stack; Lambda's default timeout is 3 s
+    lambda_timeout: float = 3.0
+    db_table: str | None = None
+
+    # Tokens (seconds)
+    access_token_expiration: int = 600
+    refresh_token_expiration: int = 86400
+    refresh_reuse_grace_seconds: int = 30
+    jwt_algorithm: str = "HS256"
+    jwt_secret_name: str = "flycalcio-jwtkey-dev-secret"
+    jwt_refresh_secret_name: str = "flycalcio-jwt-refresh-key-dev-secret"
+    jwt_signing_key_secret_name: str = "flycalcio-jwt-signing-key-dev-secret"
+    jwt_public_keys_path: str = "jwks.json"
+    jwt_public_keys: str | None = None
+    # Pagination cursors are signed with a key derived from this secret
+    cursor_secret_name: str | None = None
+
+    # Google sign-in
+    google_client_id: str | None = None
+    google_certs_url: str = "https://www.googleapis.com/oauth2/v1/certs"
+    google_certs_min_refresh_interval: int = 60
+
+    # Passwords
+    password_hasher: str = "bcrypt"
+    password_hash_rounds: int = 10
+    argon2_time_cost: int = 3
+    argon2_memory_cost: int = 65536
+    # Logins without an EMAIL# item fall back to a GSI1 lookup; switch off
+    # once dynamo_migrations 0001 has backfilled every user
+    login_repair_enabled: bool = True
+
+    # Caches
+    secret_cache_ttl: int = 300
+    secret_cache_max_stale: int = 3600
+    secret_cache_min_refresh_interval: int = 30
+    auth_token_cache_size: int = 2048
+    auth_token_cache_max_ttl: int = 300
+    revocation_filter_refresh: int = 60
+    revocation_filter_bits: int = 1 << 16
+
+    # Listings
+    default_page_size: int = 50
+    max_page_size: int = 200
+    created_shards: int = 4
+    delta_settle_ms: int = 2000
+    idempotency_ttl: int = 24 * 3600
+
+    # Events
+    event_shards: int = 4
+    max_roster_size: int = 10000
+    propagation_workers: int = 16
+    delete_sync_limit: int = 500
+    batch_write_workers: int = 8
+    tombstone_ttl: int = 30 * 24 * 3600
+    changes_settle_ms: int = 2000
+    # False until the GSI3 change-feed index is deployed
+    change_feed_enabled: bool = True
+
+    # AWS clients (see aws_clients.py); unset timeouts follow lambda_timeout
+    aws_max_attempts: int = 3
+    aws_connect_timeout: float | None = None
+    aws_read_timeout: float | None = None
+    aws_max_pool_connections: int = 32
+
+    # Tracing is on when running on Lambda unless POWERTOOLS_TRACE_DISABLED
+    tracing_enabled: bool = _derived()
+
+
+# Fields that may be 0; every other number must be positive
+_MAY_BE_ZERO = {
+    "refresh_reuse_grace_seconds", "secret_cache_max_stale",
+    "delta_settle_ms", "changes_settle_ms",
+}
+
+_TRUE = ("1", "true", "yes", "on")
+
+
+def _parse(spec, raw):
+    """Raw variable → the field's type; "" unsets an optional field."""
+    if spec.type is bool:
+        return raw.lower() in _TRUE
+    if spec.type in (int, float):
+        return spec.type(raw)
+    if raw == "" and spec.type != str:
+        return None
+    return float(raw) if spec.type == (float | None) else raw
+
+
+def _env_name(spec):
+    return spec.metadata.get("env", spec.name.upper())
+
+
+def _validate(s):
+    errors = []
+    for spec in dataclasses.fields(s):
+        value = getattr(s, spec.name)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            if value < 0 or (value == 0 and spec.name not in _MAY_BE_ZERO):
+                errors.append(f"{_env_name(spec)} must be {'>= 0' if spec.name in _MAY_BE_ZERO else '> 0'}, got {value}")
+    if s.stage not in STAGES:
+        errors.append(f"ENVIRONMENT must be one of {', '.join(STAGES)}, got {s.stage!r}")
+    if s.on_lambda and not s.db_table:
+        errors.append("DB_TABLE is required")
+    if s.default_page_size > s.max_page_size:
+        errors.append("DEFAULT_PAGE_SIZE must not exceed MAX_PAGE_SIZE")
+    if s.password_hasher not in PASSWORD_HASHERS:
+        errors.append(f"PASSWORD_HASHER must be one of {', '.join(PASSWORD_HASHERS)}")
+    if s.password_hasher == "bcrypt" and not 4 <= s.password_hash_rounds <= 31:
+        errors.append("PASSWORD_HASH_ROUNDS must be between 4 and 31 for bcrypt")
+    if s.stage == "prod" and s.password_hasher == "bcrypt" and s.password_hash_rounds < 10:
+        errors.append("PASSWORD_HASH_ROUNDS must be at least 10 in prod")
+    if s.jwt_algorithm not in JWT_ALGORITHMS:
+        errors.append(f"JWT_ALGORITHM must be one of {', '.join(JWT_ALGORITHMS)}")
+    if s.access_token_expiration > s.refresh_token_expiration:
+        errors.append("ACCESS_TOKEN_EXPIRATION must not exceed REFRESH_TOKEN_EXPIRATION")
+    if errors:
+        raise ConfigError("Invalid configuration: " + "; ".join(errors))
+
+
+def load(environ=None):
+    """Parse and validate Settings from `environ` (default: the process environment). Raises ConfigError."""
+    if environ is None:
+        if "LAMBDA_TASK_ROOT" not in os.environ:
+            # Local runs read .env; on Lambda the stack sets the environment
+            from dotenv import load_dotenv
+            load_dotenv()
+        environ = os.environ
+
+    on_lambda = "LAMBDA_TASK_ROOT" in environ
+    stage = environ.get("ENVIRONMENT") or ("dev" if on_lambda else "local")
+    values = {**STAGE_OVERRIDES.get(stage, {}), "stage": stage, "on_lambda": on_lambda}
+
+    errors = []
+    for spec in dataclasses.fields(Settings):
+        name = _env_name(spec)
+        if spec.metadata.get("derived") or spec.name == "stage" or name not in environ:
+            continue
+        try:
+            values[spec.name] = _parse(spec, environ[name])
+        except ValueError:
+            errors.append(f"{name} must be a number, got {environ[name]!r}")
+    if errors:
+        raise ConfigError("Invalid configuration: " + "; ".join(errors))
+
+    values.setdefault("cursor_secret_name", values.get("jwt_secret_name", Settings.jwt_secret_name))
+    trace_disabled = environ.get("POWERTOOLS_TRACE_DISABLED", "false").lower() in _TRUE
+    values["tracing_enabled"] = on_lambda and not trace_disabled
+
+    result = Settings(**values)
+    _validate(result)
+    return result
+
+
+settings = load()
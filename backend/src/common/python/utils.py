@@ -1,47 +1,51 @@
-import hashlib
 import hmac
-import jwt
-import os
-import boto3
-from botocore.exceptions import ClientError
 import json
-from dotenv import load_dotenv
 from datetime import datetime, date
 from decimal import Decimal
 from dateutil.relativedelta import relativedelta
 from datetime import date, timedelta
 
-load_dotenv()
-
-from aws_lambda_powertools import Logger, Tracer
+from settings import settings
+from aws_lambda_powertools import Logger
+import secret_cache
+# jwt (with cryptography), jwt_keys and passwords (bcrypt) are imported in
+# the functions below: only the auth and authorizer paths need them
 
 logger = Logger(service="flycalcio-app")
-tracer = Tracer(service="flycalcio-app")
+
+
+class _DisabledTracer:
+    """Stands in for the powertools Tracer when tracing is off."""
+
+    def capture_lambda_handler(self, handler):
+        return handler
+
+    def capture_method(self, method):
+        return method
+
+    def put_annotation(self, key, value):
+        pass
+
+
+def _make_tracer():
+    # Importing the Tracer pulls in aws_xray_sdk (~250 ms of cold start):
+    # only pay for it when traces are actually sent
+    if not settings.tracing_enabled:
+        return _DisabledTracer()
+    from aws_lambda_powertools import Tracer
+    return Tracer(service="flycalcio-app")
+
+
+tracer = _make_tracer()
 
 
 def get_secret(secret_name, region_name="eu-central-1"):
     """
-    Retrieve a secret from AWS Secrets Manager
+    Retrieve a secret from AWS Secrets Manager (cached per container, see secret_cache)
     """
-    # Create a Secrets Manager client
-    client = boto3.client("secretsmanager", region_name=region_name)
-
-    try:
-        response = client.get_secret_value(SecretId=secret_name)
-    except ClientError as e:
-        raise e
-    else:
-        # Secret is stored either as string or binary
-        if 'SecretString' in response:
-            try:
-                return json.loads(response['SecretString'])
-            except Exception:
-                return response['SecretString']
-        else:
-            import base64
-            return json.loads(base64.b64decode(response['SecretBinary']))
-JWT_SECRET_NAME = os.environ.get("JWT_SECRET_NAME",'flycalcio-jwtkey-dev-secret')
-JWT_REFRESH_NAME= os.environ.get("JWT_REFRESH_SECRET_NAME",'flycalcio-jwt-refresh-key-dev-secret')
+    return secret_cache.get_secret(secret_name, region_name)
+JWT_SECRET_NAME = settings.jwt_secret_name
+JWT_REFRESH_NAME= settings.jwt_refresh_secret_name
 
 
 
@@ -52,25 +56,50 @@ def start_of_month(d: date) -> date:
     return d.replace(day=1)
 
 def hash_password(password):
-    return hashlib.sha256(password.encode()).hexdigest()
+    import passwords
+    return passwords.hash_password(password)
 
 def verify_password(password, hashed):
-    return hash_password(password) == hashed
-
-def generate_access_token(user_id,email,role,duration):
+    import passwords
+    valid, _ = passwords.verify_password(password, hashed)
+    return valid
+
+def generate_access_token(user_id,email,role,duration,family_id=None):
+    import jwt
+    import jwt_keys
+    payload = {"id": user_id,"email":email,'role':role,"iat":datetime.utcnow() ,"exp":datetime.utcnow() + timedelta(seconds=duration)}
+    if family_id:
+        # Refresh-token family, lets the authorizer honour revocations
+        payload["fid"] = family_id
+    if jwt_keys.is_asymmetric():
+        # RS256 / EdDSA: signed with the private key, `kid` in the header
+        return jwt_keys.sign(payload)
     JWT_SECRET = get_secret(JWT_SECRET_NAME)
-    return jwt.encode({"id": user_id,"email":email,'role':role,"iat":datetime.utcnow() ,"exp":datetime.utcnow() + timedelta(seconds=duration)}, JWT_SECRET, algorithm="HS256")
+    return jwt.encode(payload, JWT_SECRET, algorithm="HS256")
 
 def decode_token(token,token_type='access',algorithms=["HS256"]):
+    import jwt
+    import jwt_keys
+    if token_type == "access" and jwt_keys.is_asymmetric():
+        return jwt_keys.verify(token)
+
     secret_name = JWT_SECRET_NAME if token_type == "access" else JWT_REFRESH_NAME
     
-    jwt_secret = get_secret(secret_name)
-    decoded=jwt.decode(token,jwt_secret,algorithms=algorithms)
+    # Retry with the rotated / previous secret when the signature does not match
+    decoded = secret_cache.get_cache().call_with_rotation(
+        secret_name,
+        lambda jwt_secret: jwt.decode(token,jwt_secret,algorithms=algorithms),
+        retry_on=jwt.InvalidSignatureError
+    )
     return decoded
     
-def generate_refresh_token(user_id,email,role,duration):
+def generate_refresh_token(user_id,email,role,duration,family_id=None,token_id=None):
+    import jwt
     jwt_secret = get_secret(JWT_REFRESH_NAME)
     payload ={"id": user_id, "email":email,'role':role,"type": "refresh","iat":datetime.utcnow() ,"exp":datetime.utcnow() + timedelta(seconds=duration)}
+    if family_id:
+        payload["fid"] = family_id
+        payload["jti"] = token_id
     return jwt.encode(
         payload, 
         jwt_secret, 
@@ -97,11 +126,12 @@ ALLOWED_ORIGINS = [
 
 def generate_response(
     status_code,
-    body
+    body,
+    event=None
 ):
     # ---- Base CORS headers ----
     response_headers = {
-        "Access-Control-Allow-Headers": "Content-Type,Authorization",
+        "Access-Control-Allow-Headers": "Content-Type,Authorization,Idempotency-Key",
         "Access-Control-Allow-Methods": "OPTIONS,GET,POST,PUT,DELETE",
         "Access-Control-Allow-Origin":"*",
         "Content-Type": "application/json"
@@ -1,21 +1,84 @@
+import heapq
 import json
-import os
-import uuid
-from datetime import datetime
+import re
+import time
+from datetime import date as Date, datetime, timedelta, timezone
 
-import boto3
-from boto3.dynamodb.conditions import Key
+from botocore.exceptions import ClientError
+from concurrent.futures import ThreadPoolExecutor
 
 from utils import generate_response, logger, tracer
-from dotenv import load_dotenv
-load_dotenv()
+import aws_clients
+from dynamo_batch import BATCH_WRITE_LIMIT, UnprocessedItemsError
+from dates import to_sort_key, timestamp_key, parse_datetime
+from idempotency import idempotent_request, register_context
+from ids import new_id, parse_id
+import created_index
+from pagination import page_params, encode_cursor, InvalidPageRequest, MAX_PAGE_SIZE
+from repositories import EventRepository, UserRepository, AssignmentRepository
+from repositories import event_key, tombstone_key, profile_key, assignment_key, removal_key, event_partition, user_partition
+from repositories import event_id_of
+from repositories import EVENT_FIELDS, ASSIGNMENT_FIELDS
+from repositories import event_month_partition, event_index_keys, user_events_sort_key, change_partition, change_keys
+from fieldsets import requested_fields, select, InvalidFieldsRequest
+from settings import settings
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["DB_TABLE"])
+# Only for created_index, whose shard queries take a resource Table;
+# every other read and write goes through the repositories
+table = aws_clients.resource("dynamodb").Table(settings.db_table)
+lambda_client = aws_clients.client("lambda")
+events_repo = EventRepository()
+users_repo = UserRepository()
+assignments_repo = AssignmentRepository()
+
+# Max ids accepted by GET /event?ids=...
+MAX_BATCH_IDS = 100
+
+ROSTER_PATH = re.compile(r"/event/([^/]+)/guests")
+# Assignment attributes returned by the roster view
+ROSTER_FIELDS = ("userId", "email", "status", "assignedAt")
+# Largest desired roster accepted by PUT /event/{id}/guests
+MAX_ROSTER_SIZE = settings.max_roster_size
+
+# Event attributes copied onto every USER#/EVENT# assignment
+SUMMARY_FIELDS = ("title", "date", "location")
+PROPAGATION_WORKERS = settings.propagation_workers
+
+# Events are spread over GSI1 partitions EVENTS#<yyyy-mm>#<shard>.
+# Changing the shard count needs a re-shard (dynamo_migrations 0004).
+EVENT_SHARDS = settings.event_shards
+# Longest from/to range of the admin listing, and its default window
+MAX_RANGE_MONTHS = 24
+DEFAULT_HISTORY_MONTHS = 12
+shard_pool = ThreadPoolExecutor(max_workers=EVENT_SHARDS)
+
+# Rosters up to this size are purged inside the DELETE request, larger
+# ones by an asynchronous self-invocation
+DELETE_SYNC_LIMIT = settings.delete_sync_limit
+# Parallel BatchWriteItem calls for roster purges and reconciles
+BATCH_WRITE_WORKERS = settings.batch_write_workers
+# Hand the rest of a purge to a fresh invocation below this much time left
+PURGE_TIME_RESERVE_MS = 10_000
+
+# Deleted events stay in the change feed as tombstones this long; clients
+# whose watermark is older must reload the full list
+TOMBSTONE_TTL = settings.tombstone_ttl
+# The change feed stops this far behind "now" (clock skew between writers, GSI lag)
+CHANGES_SETTLE = timedelta(milliseconds=settings.changes_settle_ms)
+
+# Assignment statuses counted on the event METADATA item
+ASSIGNMENT_STATUSES = ("CONFIRMED",)
 
 @tracer.capture_lambda_handler
+@aws_clients.log_connection_stats
 def lambda_handler(event, context):
-    
+    register_context(context)
+
+    # Asynchronous self-invocations (never sent by API Gateway)
+    if event.get("action") == "propagate_event_summary":
+        return propagate_event_summary(event["eventId"])
+    if event.get("action") == "purge_event_roster":
+        return purge_event_roster(event["eventId"], context)
 
     method = event.get("httpMethod")
     path = event.get("path")
@@ -37,6 +100,17 @@ def lambda_handler(event, context):
             return assign_user_to_event(event)
         if method == "DELETE":
             return remove_user_from_event(event)
+
+    if path == "/event/recent" and method == "GET":
+        return get_recent_events(event)
+    if path == "/event/changes" and method == "GET":
+        return get_event_changes(event)
+
+    roster_match = ROSTER_PATH.fullmatch(path or "")
+    if roster_match and method == "GET":
+        return get_event_guests(event, roster_match.group(1))
+    if roster_match and method == "PUT":
+        return reconcile_event_guests(event, roster_match.group(1))
         
 
     return generate_response(
@@ -49,52 +123,580 @@ def _auth_context(event):
     auth = event["requestContext"]["authorizer"]
     return auth["principalId"], auth.get("role")
 
+def _valid_ids(values):
+    """Every value is an id we issue (uuid4 or time-ordered uuid7)."""
+    try:
+        for value in values:
+            parse_id(value)
+    except ValueError:
+        return False
+    return True
+
+def _event_summary(event_item):
+    return {field: event_item.get(field) for field in SUMMARY_FIELDS}
+
+def _add_months(month, n):
+    """'2026-01' + n months → 'yyyy-mm'."""
+    year, mon = divmod(int(month[:4]) * 12 + int(month[5:7]) - 1 + n, 12)
+    return f"{year:04d}-{mon + 1:02d}"
+
+def _months(first, last):
+    month = first
+    while month <= last:
+        yield month
+        month = _add_months(month, 1)
+
+def _date_range(params):
+    """
+    ?from=YYYY-MM-DD&to=YYYY-MM-DD (both inclusive). Missing bounds default
+    to DEFAULT_HISTORY_MONTHS back and MAX_RANGE_MONTHS forward from there.
+    Raises InvalidPageRequest.
+    """
+    try:
+        start = Date.fromisoformat(params["from"]) if params.get("from") else None
+        end = Date.fromisoformat(params["to"]) if params.get("to") else None
+    except ValueError:
+        raise InvalidPageRequest("from and to must be YYYY-MM-DD dates")
+
+    if start is None:
+        anchor = (end or Date.today()).isoformat()[:7]
+        start = Date.fromisoformat(_add_months(anchor, -DEFAULT_HISTORY_MONTHS) + "-01")
+    if end is None:
+        # Last day of the final month of the window
+        end = Date.fromisoformat(_add_months(start.isoformat()[:7], MAX_RANGE_MONTHS) + "-01") - timedelta(days=1)
+    if start > end:
+        raise InvalidPageRequest("from must not be after to")
+    first, last = start.isoformat()[:7], end.isoformat()[:7]
+    if _add_months(first, MAX_RANGE_MONTHS - 1) < last:
+        raise InvalidPageRequest(f"Date range spans more than {MAX_RANGE_MONTHS} months")
+    return start.isoformat(), end.isoformat()
+
+def _query_event_shards(month, low, high, limit, fields=None):
+    """
+    Scatter-gather: the first `limit` events of every shard of a month in
+    parallel, merge-sorted by GSI1SK. `low` and `high` are inclusive.
+    """
+    # GSI1SK orders the merge and positions the cursor
+    fields = (*fields, "GSI1SK") if fields else None
+
+    def query_shard(shard):
+        return events_repo.dated(event_month_partition(month, shard), low, high, limit, fields)
+
+    shards = shard_pool.map(query_shard, range(EVENT_SHARDS))
+    return list(heapq.merge(*shards, key=lambda item: item["GSI1SK"]))
+
+def _list_events_in_range(start, end, limit, after=None, fields=None):
+    """
+    One page of events dated start..end across month buckets and shards.
+    `after` is the position ({"m": month, "sk": GSI1SK}) the previous page
+    stopped at. Returns (events, position or None).
+    """
+    # "~" sorts after every "#<id>" and time suffix of the last day
+    high = f"{end}~"
+    first = after["m"] if after else start[:7]
+    events = []
+    for month in _months(first, end[:7]):
+        low = after["sk"] if after and month == after["m"] else start
+        need = limit - len(events)
+        # between() is inclusive: fetch one extra to step over the cursor item
+        items = _query_event_shards(month, low, high, need + 1, fields)
+        items = [i for i in items if not (after and i["GSI1SK"] == after["sk"])]
+        events += items[:need]
+        if len(events) == limit:
+            last = events[-1]
+            return events, {"m": month, "sk": last["GSI1SK"]}
+    return events, None
+
+def _change_stamp(event_id):
+    """(SET clause, values) re-stamping the change keys in an UpdateExpression."""
+    keys = change_keys(event_id, timestamp_key())
+    return ", ".join(f"{k} = :{k}" for k in keys), {f":{k}": v for k, v in keys.items()}
+
+def _status_count_field(status):
+    """Per-status counter on EVENT#/METADATA, e.g. CONFIRMED → confirmedCount."""
+    return f"{status.lower()}Count"
+
+def _count_fields():
+    return ("attendeeCount",) + tuple(_status_count_field(s) for s in ASSIGNMENT_STATUSES)
+
+def _counter_update(event_id, status, delta):
+    """
+    TransactWriteItems Update that moves attendeeCount and the status
+    counter by `delta`. attribute_exists keeps ADD from creating a
+    METADATA stub for an event that no longer exists.
+    """
+    stamp, stamp_values = _change_stamp(event_id)
+    return {"Update": {
+        "Key": event_key(event_id),
+        "UpdateExpression": f"SET {stamp} ADD attendeeCount :delta, #statusCount :delta",
+        "ConditionExpression": "attribute_exists(PK)",
+        "ExpressionAttributeNames": {"#statusCount": _status_count_field(status)},
+        "ExpressionAttributeValues": {":delta": delta, **stamp_values},
+    }}
+
+def _cancellation_codes(error):
+    """Per-item codes of a TransactionCanceledException, in TransactItems order."""
+    return [r.get("Code") for r in error.response.get("CancellationReasons", [])]
+
+def _with_counts(assignments, fields=None):
+    """Add the event's current counters to each assignment (one projected BatchGetItem)."""
+    if not assignments:
+        return assignments
+    fields = fields or _count_fields()
+    counters = events_repo.get_many([a["eventId"] for a in assignments], fields=fields)
+    by_pk = {c["PK"]: c for c in counters}
+    return [
+        {**a, **{f: by_pk.get(event_key(a["eventId"])["PK"], {}).get(f, 0) for f in fields}}
+        for a in assignments
+    ]
+
+def _invoke_self(action, event_id):
+    """Run `action` for the event in a new asynchronous invocation of this Lambda."""
+    lambda_client.invoke(
+        FunctionName=settings.function_name,
+        InvocationType="Event",
+        Payload=json.dumps({"action": action, "eventId": event_id}),
+    )
+
+def _assignment_item(event_item, profile, assigned_by, assigned_at):
+    event_id, user_id = event_item["eventId"], profile["userId"]
+    return {
+        **assignment_key(user_id, event_id),
+        "GSI1PK": event_partition(event_id),
+        "GSI1SK": user_partition(user_id),
+        # "My events", sorted by date
+        "GSI2PK": user_partition(user_id),
+        "GSI2SK": user_events_sort_key(event_item["date"], event_id),
+        "eventId": event_id,
+        "userId": user_id,
+        "email": profile.get("email"),
+        **_event_summary(event_item),
+        "status": "CONFIRMED",
+        "assignedBy": assigned_by,
+        "assignedAt": assigned_at,
+    }
+
+def _get_event_and_profile(event_id, user_id):
+    """Event METADATA and user PROFILE in one BatchGetItem."""
+    items = events_repo.get_items([event_key(event_id), profile_key(user_id)])
+    by_sk = {item["SK"]: item for item in items}
+    return by_sk.get("METADATA"), by_sk.get("PROFILE")
+
+def _assigned_event_ids(user_id):
+    """Every event id assigned to the user (USER#<id> partition, all pages)."""
+    return assignments_repo.event_ids_for_user(user_id, page_size=MAX_PAGE_SIZE)
+
+def _removal_marker(user_id, event_id):
+    """
+    Written with every assignment removal. It lasts as long as the event
+    tombstones, so the user's change feed can still tell the user about
+    the removal, or about the delete of an event whose roster is already purged.
+    """
+    return {**removal_key(user_id, event_id), "eventId": event_id, "ttl": int(time.time()) + TOMBSTONE_TTL}
+
+def _removed_event_ids(user_id):
+    return assignments_repo.removed_event_ids_for_user(user_id, page_size=MAX_PAGE_SIZE)
+
+def _get_events_by_id(event_ids, fields=None):
+    """Event items for the ids, in the same order, via chunked BatchGetItem."""
+    return events_repo.get_many(event_ids, fields)
+
+def _user_event_fields():
+    """What a USER's event list can hold: the assignment summary plus the event counters."""
+    return ASSIGNMENT_FIELDS + _count_fields()
+
 def get_events(event):
     """
     USER  → events assigned to user
-    ADMIN → all events
+    ADMIN → all events dated ?from=..&to=.. (sharded GSI1, merged by date)
+    ?ids=a,b,c → those events (USER: only the assigned ones)
+    ?fields=title,date → only those attributes, projected in DynamoDB
+
+    Every event carries attendeeCount and the per-status counts unless
+    ?fields leaves them out.
     """
     user_id, role = _auth_context(event)
 
+    params = event.get("queryStringParameters") or {}
+    try:
+        lists_events = role == "ADMIN" or params.get("ids")
+        fields = requested_fields(event, EVENT_FIELDS if lists_events else _user_event_fields())
+    except InvalidFieldsRequest as e:
+        return generate_response(400, {"msg": str(e)})
+
+    if params.get("ids"):
+        return get_events_by_ids(user_id, role, params["ids"], fields)
+
     try:
+        scope = f"events:{role}:{user_id}"
         if role == "ADMIN":
-            logger.info("Listing all events (admin)")
-            resp = table.query(
-                IndexName="GSI1",
-                KeyConditionExpression=Key("GSI1PK").eq("EVENT")
-            )
-            return generate_response(200, {"events": resp["Items"]})
+            start, end = _date_range(params)
+            # A cursor only continues the range it was issued for
+            scope = f"{scope}:{start}:{end}"
+        limit, start_key = page_params(event, scope)
+    except InvalidPageRequest as e:
+        return generate_response(400, {"msg": str(e)})
 
-        # USER → assigned events
+    try:
+        if role == "ADMIN":
+            logger.info("Listing events (admin)", extra={"from": start, "to": end})
+            events, position = _list_events_in_range(start, end, limit, start_key, fields)
+            return generate_response(200, {
+                "events": select(events, fields),
+                "from": start,
+                "to": end,
+                "nextCursor": encode_cursor(position, scope),
+            })
+
+        # USER → assignments carry the event summary: one query, sorted by date
         logger.info("Listing user events", extra={"userId": user_id})
-        assignments = table.query(
-            KeyConditionExpression=(
-                Key("PK").eq(f"USER#{user_id}") &
-                Key("SK").begins_with("EVENT#")
+        counts = tuple(f for f in fields if f in _count_fields())
+        stored = tuple(f for f in fields if f not in counts)
+        events, last_key = assignments_repo.for_user(
+            user_id, limit, start_key,
+            # The counters are joined in by eventId
+            fields=(*stored, "eventId") if counts else stored,
+        )
+        if counts:
+            events = _with_counts(events, counts)
+
+        return generate_response(200, {
+            "events": select(events, fields),
+            "nextCursor": encode_cursor(last_key, scope),
+        })
+
+    except Exception:
+        logger.exception("Failed to fetch events")
+        tracer.put_annotation("error_type", "unhandled")
+        return generate_response(500, {"msg": "Internal server error"})
+
+
+def get_events_by_ids(user_id, role, ids_param, fields=EVENT_FIELDS):
+    event_ids = [i for i in dict.fromkeys(ids_param.split(",")) if i]
+    if len(event_ids) > MAX_BATCH_IDS:
+        return generate_response(400, {"msg": f"At most {MAX_BATCH_IDS} ids per request"})
+    if not _valid_ids(event_ids):
+        return generate_response(400, {"msg": "ids must be event ids"})
+
+    try:
+        if role != "ADMIN":
+            assigned = set(_assigned_event_ids(user_id))
+            event_ids = [i for i in event_ids if i in assigned]
+
+        logger.info("Batch reading events", extra={"count": len(event_ids)})
+        return generate_response(200, {"events": select(_get_events_by_id(event_ids, fields), fields)})
+
+    except Exception:
+        logger.exception("Failed to batch read events")
+        tracer.put_annotation("error_type", "unhandled")
+        return generate_response(500, {"msg": "Internal server error"})
+
+
+def get_event_guests(event, event_id):
+    """
+    Roster of an event: the EVENT#<id> side of the assignment adjacency
+    list, read page by page from GSI1 with only the roster fields projected.
+    """
+    user_id, role = _auth_context(event)
+
+    if role != "ADMIN":
+        return generate_response(403, {"msg": "Forbidden"})
+
+    scope = f"roster:{event_id}"
+    try:
+        limit, start_key = page_params(event, scope)
+    except InvalidPageRequest as e:
+        return generate_response(400, {"msg": str(e)})
+
+    try:
+        guests, last_key = assignments_repo.roster(event_id, limit, start_key, fields=ROSTER_FIELDS)
+
+        return generate_response(200, {
+            "eventId": event_id,
+            "guests": guests,
+            "count": len(guests),
+            "nextCursor": encode_cursor(last_key, scope),
+        })
+
+    except Exception:
+        logger.exception("Failed to fetch event roster")
+        tracer.put_annotation("error_type", "unhandled")
+        return generate_response(500, {"msg": "Internal server error"})
+
+
+def reconcile_event_guests(event, event_id):
+    """
+    PUT /event/{id}/guests {"userIds": [...]}: make the roster exactly the
+    given users. The current roster is read from GSI1 and diffed in memory;
+    only the adds and removes are written, as parallel 25-item
+    BatchWriteItem calls, and the counters move by the net delta.
+
+    GSI1 is eventually consistent and batch writes are unconditional, so
+    the adds and removes are confirmed first with a consistent read of the
+    assignments themselves: a user assigned or removed moments earlier by
+    POST/DELETE /event/assign is not written, or counted, twice.
+
+    Not wrapped in idempotent_request: a repeated PUT converges to the same
+    roster anyway, and the per-user results of a large roster do not fit
+    in one idempotency record.
+    """
+    admin_id, role = _auth_context(event)
+
+    if role != "ADMIN":
+        return generate_response(403, {"msg": "Forbidden"})
+
+    try:
+        body = json.loads(event.get("body") or "{}")
+        user_ids = body.get("userIds")
+        if not isinstance(user_ids, list) or not _valid_ids(user_ids):
+            return generate_response(400, {"msg": "userIds must be a list of user ids"})
+        if len(user_ids) > MAX_ROSTER_SIZE:
+            return generate_response(400, {"msg": f"At most {MAX_ROSTER_SIZE} userIds per request"})
+        desired = list(dict.fromkeys(user_ids))
+
+        event_item = events_repo.get(event_id, consistent=True)
+        if event_item is None:
+            return generate_response(404, {"msg": "Event not found"})
+
+        current = _current_roster(event_id)
+        keep = set(desired)
+        candidates = [u for u in desired if u not in current] + [u for u in current if u not in keep]
+        # The GSI1 roster may lag: confirm the changes on the assignments themselves
+        confirmed = {
+            a["userId"]: a.get("status", "CONFIRMED")
+            for a in assignments_repo.get_many(event_id, candidates, fields=("userId", "status"), consistent=True)
+        }
+        current = {u: s for u, s in current.items() if u not in candidates or u in confirmed}
+        current.update(confirmed)
+
+        results = {u: "unchanged" for u in desired if u in current}
+        to_add = [u for u in desired if u not in current]
+        to_remove = [u for u in current if u not in keep]
+
+        profiles = {
+            p["userId"]: p
+            for p in users_repo.get_profiles(to_add, fields=("userId", "email"))
+        }
+        results.update({u: "user_not_found" for u in to_add if u not in profiles})
+
+        assigned_at = datetime.utcnow().isoformat()
+        writes = [
+            ("added", _assignment_item(event_item, profiles[u], admin_id, assigned_at))
+            for u in to_add if u in profiles
+        ] + [
+            ("removed", assignment_key(u, event_id))
+            for u in to_remove
+        ]
+        results.update(_apply_roster_writes(writes))
+
+        deltas = {}
+        for user_id, result in results.items():
+            if result in ("added", "removed"):
+                status = "CONFIRMED" if result == "added" else current[user_id]
+                deltas[status] = deltas.get(status, 0) + (1 if result == "added" else -1)
+        _apply_counter_deltas(event_id, deltas)
+
+        summary = {r: sum(1 for v in results.values() if v == r)
+                   for r in ("added", "removed", "unchanged", "user_not_found", "failed")}
+        logger.info("Roster reconciled", extra={"eventId": event_id, **summary})
+        return generate_response(200, {
+            "eventId": event_id,
+            **summary,
+            "results": [{"userId": u, "result": r} for u, r in results.items()],
+        })
+
+    except Exception:
+        logger.exception("Failed to reconcile event roster")
+        tracer.put_annotation("error_type", "unhandled")
+        return generate_response(500, {"msg": "Internal server error"})
+
+
+def _current_roster(event_id):
+    """{userId: status} of every assignment of the event, across all GSI1 pages."""
+    roster = {}
+    start_key = None
+    while True:
+        items, start_key = assignments_repo.roster(event_id, MAX_PAGE_SIZE, start_key, fields=("userId", "status"))
+        roster.update({a["userId"]: a.get("status", "CONFIRMED") for a in items})
+        if not start_key:
+            return roster
+
+
+def _apply_roster_writes(writes):
+    """
+    Apply (result, item-or-key) writes in parallel 25-request chunks.
+    Returns {userId: result}, or "failed" for writes DynamoDB kept throttling.
+    """
+    def apply_chunk(chunk):
+        outcome = {w[1]["PK"].split("#", 1)[1]: w[0] for w in chunk}
+        removed = [key for result, key in chunk if result == "removed"]
+        markers = [_removal_marker(key["PK"].split("#", 1)[1], event_id_of(key["SK"])) for key in removed]
+        try:
+            assignments_repo.write_many(
+                puts=[item for result, item in chunk if result == "added"] + markers,
+                deletes=removed,
             )
+        except UnprocessedItemsError as e:
+            for request in e.unprocessed:
+                key = request["PutRequest"]["Item"] if "PutRequest" in request else request["DeleteRequest"]["Key"]
+                # A lost marker only hides the removal from the user's change feed
+                if not key["SK"].startswith("REMOVED#"):
+                    outcome[key["PK"].split("#", 1)[1]] = "failed"
+        return outcome
+
+    results = {}
+    chunks = [writes[i:i + BATCH_WRITE_LIMIT] for i in range(0, len(writes), BATCH_WRITE_LIMIT)]
+    with ThreadPoolExecutor(max_workers=BATCH_WRITE_WORKERS) as pool:
+        for outcome in pool.map(apply_chunk, chunks):
+            results.update(outcome)
+    return results
+
+
+def _apply_counter_deltas(event_id, deltas):
+    """ADD {status: delta} to the per-status counters and their sum to attendeeCount."""
+    deltas = {status: d for status, d in deltas.items() if d}
+    if not deltas:
+        return
+    names = {f"#s{i}": _status_count_field(status) for i, status in enumerate(deltas)}
+    values = {f":s{i}": d for i, d in enumerate(deltas.values())}
+    values[":total"] = sum(deltas.values())
+    stamp, stamp_values = _change_stamp(event_id)
+    values.update(stamp_values)
+    try:
+        events_repo.update(
+            event_key(event_id),
+            UpdateExpression=f"SET {stamp} ADD attendeeCount :total" + "".join(f", #s{i} :s{i}" for i in range(len(deltas))),
+            ConditionExpression="attribute_exists(PK)",
+            ExpressionAttributeNames=names,
+            ExpressionAttributeValues=values,
         )
+    except ClientError as e:
+        if e.response["Error"]["Code"] != "ConditionalCheckFailedException":
+            raise
+        # Deleted meanwhile: assignments written after its purge are orphans (dynamo_migrations 0006)
+        logger.info("Event deleted during reconcile", extra={"eventId": event_id})
+
+
+def _changes_since(since):
+    """?since= watermark ("<updatedAt>#<eventId>") or ISO timestamp → GSI3SK bound. Raises ValueError."""
+    moment, _, event_id = since.partition("#")
+    bound = timestamp_key(parse_datetime(moment))
+    return f"{bound}#{event_id}" if event_id else bound
+
 
-        events = []
-        for a in assignments["Items"]:
-            event_id = a["SK"].replace("EVENT#", "")
-            event_item = table.get_item(
-                Key={
-                    "PK": f"EVENT#{event_id}",
-                    "SK": "METADATA"
-                }
-            ).get("Item")
+def get_event_changes(event):
+    """
+    GET /event/changes?since=<watermark>: events created, updated (METADATA)
+    or deleted (TOMBSTONE) after the watermark, oldest change first, read
+    from the GSI3 change feed of every shard. Returns the next watermark.
+    Without ?since= only the current watermark is returned: take it before
+    loading the full list. USER callers see changes of their own events,
+    and in `deleted` the events they were removed from or that were
+    deleted while assigned to them (see _removal_marker).
+    """
+    user_id, role = _auth_context(event)
+
+    if not settings.change_feed_enabled:
+        return generate_response(503, {"msg": "Change feed not available yet, reload the event list"})
+
+    params = event.get("queryStringParameters") or {}
+    try:
+        limit, _ = page_params(event, f"changes:{user_id}")
+        since = _changes_since(params["since"]) if params.get("since") else None
+    except ValueError as e:
+        return generate_response(400, {"msg": str(e)})
+
+    settled = timestamp_key(datetime.now(timezone.utc) - CHANGES_SETTLE)
+    if since is None:
+        return generate_response(200, {"events": [], "deleted": [], "watermark": settled, "hasMore": False})
+    # Tombstones are gone after TOMBSTONE_TTL: older watermarks could miss deletes
+    oldest = timestamp_key(datetime.now(timezone.utc) - timedelta(seconds=TOMBSTONE_TTL))
+    if since < oldest:
+        return generate_response(410, {"msg": "Watermark too old, reload the event list", "resync": True})
+    if since >= settled:
+        return generate_response(200, {"events": [], "deleted": [], "watermark": params["since"], "hasMore": False})
+
+    try:
+        def query_shard(shard):
+            items, last_key = events_repo.changed(change_partition(shard), since, settled, limit)
+            return items, last_key is not None
 
-            if event_item:
-                events.append(event_item)
+        results = list(shard_pool.map(query_shard, range(EVENT_SHARDS)))
+        merged = list(heapq.merge(*(items for items, _ in results), key=lambda i: i["GSI3SK"]))
+        # between() is inclusive: the watermark item itself was already sent
+        merged = [i for i in merged if i["GSI3SK"] != since]
+        more = len(merged) > limit or any(more for _, more in results)
+        changes = merged[:limit]
 
-        return generate_response(200, {"events": events})
+        if role != "ADMIN":
+            assigned = set(_assigned_event_ids(user_id))
+            removed = set(_removed_event_ids(user_id)) - assigned
+            # A removal re-stamps METADATA: for the removed user that change is a delete
+            events = [c for c in changes if c["SK"] == "METADATA" and c["eventId"] in assigned]
+            deleted = [
+                c["eventId"] for c in changes
+                if c["eventId"] in removed or (c["SK"] == "TOMBSTONE" and c["eventId"] in assigned)
+            ]
+        else:
+            events = [c for c in changes if c["SK"] == "METADATA"]
+            deleted = [c["eventId"] for c in changes if c["SK"] == "TOMBSTONE"]
+
+        return generate_response(200, {
+            "events": select(events, EVENT_FIELDS),
+            "deleted": deleted,
+            "watermark": changes[-1]["GSI3SK"] if changes else params["since"],
+            "hasMore": more,
+        })
 
     except Exception:
-        logger.exception("Failed to fetch events")
+        logger.exception("Failed to read event changes")
+        tracer.put_annotation("error_type", "unhandled")
+        return generate_response(500, {"msg": "Internal server error"})
+
+
+def get_recent_events(event):
+    """
+    GET /event/recent          → newest events first (?limit, ?cursor)
+    GET /event/recent?since=w  → events created after watermark w (or an
+                                 ISO timestamp), oldest first, with the next watermark
+    Reads GSI2 CREATED#EVENT#<shard>, ordered by the time-ordered event id.
+    """
+    user_id, role = _auth_context(event)
+
+    if role != "ADMIN":
+        return generate_response(403, {"msg": "Forbidden"})
+
+    params = event.get("queryStringParameters") or {}
+    scope = f"recent-events:{user_id}"
+    try:
+        limit, position = page_params(event, scope)
+        since = created_index.since_key(params["since"]) if params.get("since") else None
+    except ValueError as e:
+        # InvalidPageRequest or a bad ?since=
+        return generate_response(400, {"msg": str(e)})
+
+    try:
+        if since is not None:
+            events, watermark, more = created_index.created_after(table, "EVENT", since, limit)
+            return generate_response(200, {
+                "events": select(events, EVENT_FIELDS),
+                "watermark": watermark or params["since"],
+                "hasMore": more,
+            })
+
+        events, before = created_index.newest(table, "EVENT", limit, (position or {}).get("before"))
+        return generate_response(200, {
+            "events": select(events, EVENT_FIELDS),
+            "nextCursor": encode_cursor({"before": before} if before else None, scope),
+        })
+
+    except Exception:
+        logger.exception("Failed to list recent events")
         tracer.put_annotation("error_type", "unhandled")
         return generate_response(500, {"msg": "Internal server error"})
 
 
+@idempotent_request
 def create_event(event):
     user_id, role = _auth_context(event)
 
@@ -112,29 +714,34 @@ def create_event(event):
                 400, {"msg": "title and date are required"}, event
             )
 
-        event_id = str(uuid.uuid4())
+        try:
+            # Stored as a UTC sort key so GSI order and ranges are chronological
+            date = to_sort_key(date)
+        except ValueError:
+            return generate_response(400, {"msg": "date must be an ISO-8601 date or datetime"})
+
+        event_id = new_id()
+        created_at = datetime.utcnow().isoformat()
 
         item = {
-            "PK": f"EVENT#{event_id}",
-            "SK": "METADATA",
-            "GSI1PK": "EVENT",
-            "GSI1SK": date,
+            **event_key(event_id),
+            **event_index_keys(date, event_id),
             "eventId": event_id,
             "title": title,
             "date": date,
             "location": location,
             "createdBy": user_id,
-            "createdAt": datetime.utcnow().isoformat()
+            "createdAt": created_at,
+            # "Recently created": GSI2 sorted by the time-ordered id
+            **created_index.created_keys("EVENT", event_id),
+            **change_keys(event_id, timestamp_key()),
+            **{field: 0 for field in _count_fields()},
         }
 
-        
-        table.put_item(
-            Item=item,
-            ConditionExpression="attribute_not_exists(PK)"
-        )
+        events_repo.put(item, ConditionExpression="attribute_not_exists(PK)")
 
         logger.info("Event created", extra={"eventId": event_id})
-        return generate_response(201, {"event": item})
+        return generate_response(201, {"event": select([item], EVENT_FIELDS)[0]})
 
     except Exception:
         logger.exception("Failed to create event")
@@ -142,6 +749,7 @@ def create_event(event):
         return generate_response(500, {"msg": "Internal server error"})
 
 
+@idempotent_request
 def update_event(event):
     user_id, role = _auth_context(event)
 
@@ -155,6 +763,12 @@ def update_event(event):
         if not event_id:
             return generate_response(400, {"msg": "eventId required"})
 
+        if "date" in body:
+            try:
+                body["date"] = to_sort_key(body["date"])
+            except ValueError:
+                return generate_response(400, {"msg": "date must be an ISO-8601 date or datetime"})
+
         update_expr = []
         expr_vals = {}
         expr_names = {}
@@ -171,16 +785,31 @@ def update_event(event):
         if not update_expr:
             return generate_response(400, {"msg": "No fields to update"})
 
-        
-        table.update_item(
-            Key={
-                "PK": f"EVENT#{event_id}",
-                "SK": "METADATA"
-            },
-            UpdateExpression="SET " + ", ".join(update_expr),
-            ExpressionAttributeNames=expr_names,
-            ExpressionAttributeValues=expr_vals
-        )
+        if "date" in body:
+            # Re-file the event under its new month bucket and sort key
+            for key, value in event_index_keys(body["date"], event_id).items():
+                update_expr.append(f"{key} = :{key}")
+                expr_vals[f":{key}"] = value
+
+        stamp, stamp_values = _change_stamp(event_id)
+        update_expr.append(stamp)
+        expr_vals.update(stamp_values)
+
+        try:
+            events_repo.update(
+                event_key(event_id),
+                UpdateExpression="SET " + ", ".join(update_expr),
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeNames=expr_names,
+                ExpressionAttributeValues=expr_vals
+            )
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return generate_response(404, {"msg": "Event not found"})
+            raise
+
+        # Assignments hold a copy of the summary: refresh them in the background
+        _invoke_self("propagate_event_summary", event_id)
 
         logger.info("Event updated", extra={"eventId": event_id})
         return generate_response(200, {"msg": "Event updated"})
@@ -192,7 +821,60 @@ def update_event(event):
 
 
 
+def propagate_event_summary(event_id):
+    """
+    Copy the current event summary onto every assignment of the event.
+    Roster pages come from GSI1 (EVENT#<id>); each page is updated by a
+    thread pool of conditional update_item calls, so removed assignments
+    are never recreated.
+    """
+    event_item = events_repo.get(event_id, fields=SUMMARY_FIELDS, consistent=True)
+    if event_item is None:
+        logger.info("Event gone, nothing to propagate", extra={"eventId": event_id})
+        return {"updated": 0}
+
+    summary = _event_summary(event_item)
+    names = {f"#{field}": field for field in SUMMARY_FIELDS}
+    values = {f":{field}": summary[field] for field in SUMMARY_FIELDS}
+    values[":sk"] = user_events_sort_key(summary["date"], event_id)
+    update_expression = "SET " + ", ".join(f"#{f} = :{f}" for f in SUMMARY_FIELDS) + ", GSI2SK = :sk"
+
+    def update(assignment):
+        try:
+            assignments_repo.update(
+                {"PK": assignment["PK"], "SK": assignment["SK"]},
+                UpdateExpression=update_expression,
+                ConditionExpression="attribute_exists(PK)",
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues=values,
+            )
+            return 1
+        except ClientError as e:
+            if e.response["Error"]["Code"] == "ConditionalCheckFailedException":
+                return 0
+            raise
+
+    updated = 0
+    start_key = None
+    with ThreadPoolExecutor(max_workers=PROPAGATION_WORKERS) as pool:
+        while True:
+            roster, start_key = assignments_repo.roster(event_id, MAX_PAGE_SIZE, start_key, fields=("PK", "SK"))
+            updated += sum(pool.map(update, roster))
+            if not start_key:
+                break
+
+    logger.info("Event summary propagated", extra={"eventId": event_id, "updated": updated})
+    return {"updated": updated}
+
+
 def delete_event(event):
+    """
+    Delete the event and its whole roster. METADATA goes first, swapped
+    for a TOMBSTONE in one transaction: from then on assignments to the
+    event fail their counter condition, so the roster can only shrink
+    while it is purged. Large rosters, and purges that fail here, are
+    finished by an asynchronous invocation (202).
+    """
     user_id, role = _auth_context(event)
 
     if role != "ADMIN":
@@ -205,24 +887,83 @@ def delete_event(event):
         if not event_id:
             return generate_response(400, {"msg": "eventId required"})
 
-        
-        table.delete_item(
-            Key={
-                "PK": f"EVENT#{event_id}",
-                "SK": "METADATA"
-            }
-        )
+        deleted = events_repo.get(event_id, fields=("attendeeCount",), consistent=True)
+        if deleted is None:
+            return generate_response(404, {"msg": "Event not found"})
 
+        # The tombstone tells change-feed clients the event is gone
+        tombstone = {
+            **tombstone_key(event_id),
+            "eventId": event_id,
+            "deletedBy": user_id,
+            **change_keys(event_id, timestamp_key()),
+            "ttl": int(time.time()) + TOMBSTONE_TTL,
+        }
+        try:
+            events_repo.transact_write([
+                {"Delete": {
+                    "Key": event_key(event_id),
+                    "ConditionExpression": "attribute_exists(PK)",
+                }},
+                {"Put": {"Item": tombstone}},
+            ])
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            if _cancellation_codes(e)[:1] == ["ConditionalCheckFailed"]:
+                return generate_response(404, {"msg": "Event not found"})
+            raise
+
+        attendees = int(deleted.get("attendeeCount", 0))
+        if attendees > DELETE_SYNC_LIMIT:
+            _invoke_self("purge_event_roster", event_id)
+            logger.info("Event deleted, roster purge queued", extra={"eventId": event_id, "attendees": attendees})
+            return generate_response(202, {"msg": "Event deleted, removing guests", "attendeeCount": attendees})
+
+        try:
+            purged = purge_event_roster(event_id)
+        except (UnprocessedItemsError, ClientError):
+            # METADATA is already gone, so a retry would only get 404: finish in the background
+            logger.exception("Roster purge failed, queued", extra={"eventId": event_id})
+            _invoke_self("purge_event_roster", event_id)
+            return generate_response(202, {"msg": "Event deleted, removing guests", "attendeeCount": attendees})
         logger.info("Event deleted", extra={"eventId": event_id})
-        return generate_response(200, {"msg": "Event deleted"})
+        return generate_response(200, {"msg": "Event deleted", "removedAssignments": purged["deleted"]})
 
     except Exception:
         logger.exception("Failed to delete event")
         tracer.put_annotation("error_type", "unhandled")
         return generate_response(500, {"msg": "Internal server error"})
-    
-    
-    
+
+
+def purge_event_roster(event_id, context=None):
+    """
+    Delete every USER#/EVENT#<id> assignment, leaving a removal marker in
+    its place, one GSI1 roster page at a time, each page as parallel
+    25-item BatchWriteItem calls. Running as an
+    asynchronous invocation (`context` given), it re-invokes itself before
+    the Lambda timeout; the next run starts again from the top of what is left.
+    """
+    deleted = 0
+    start_key = None
+    while True:
+        roster, start_key = assignments_repo.roster(event_id, MAX_PAGE_SIZE, start_key, fields=("PK", "SK"))
+        markers = [_removal_marker(a["PK"].split("#", 1)[1], event_id) for a in roster]
+        assignments_repo.write_many(puts=markers, deletes=roster, workers=BATCH_WRITE_WORKERS)
+        deleted += len(roster)
+        logger.info("Purging event roster", extra={"eventId": event_id, "deleted": deleted})
+        if not start_key:
+            break
+        if context and context.get_remaining_time_in_millis() < PURGE_TIME_RESERVE_MS:
+            _invoke_self("purge_event_roster", event_id)
+            logger.info("Roster purge continues in a new invocation", extra={"eventId": event_id, "deleted": deleted})
+            return {"deleted": deleted, "complete": False}
+
+    logger.info("Event roster purged", extra={"eventId": event_id, "deleted": deleted})
+    return {"deleted": deleted, "complete": True}
+
+
+@idempotent_request
 def assign_user_to_event(event):
     admin_id, role = _auth_context(event)
 
@@ -237,23 +978,38 @@ def assign_user_to_event(event):
         if not user_id or not event_id:
             return generate_response(400, {"msg": "userId and eventId required"})
 
-        item = {
-            "PK": f"USER#{user_id}",
-            "SK": f"EVENT#{event_id}",
-            "GSI1PK": f"EVENT#{event_id}",
-            "GSI1SK": f"USER#{user_id}",
-            "status": "CONFIRMED",
-            "assignedBy": admin_id,
-            "assignedAt": datetime.utcnow().isoformat(),
-        }
+        event_item, profile = _get_event_and_profile(event_id, user_id)
+        if event_item is None:
+            return generate_response(404, {"msg": "Event not found"})
+        if profile is None:
+            return generate_response(404, {"msg": "User not found"})
 
-        table.put_item(
-            Item=item,
-            ConditionExpression="attribute_not_exists(PK) AND attribute_not_exists(SK)"
-        )
+        item = _assignment_item(event_item, profile, admin_id, datetime.utcnow().isoformat())
+
+        # Assignment and counters commit together, so counts never drift
+        try:
+            assignments_repo.transact_write([
+                {"Put": {
+                    "Item": item,
+                    "ConditionExpression": "attribute_not_exists(PK) AND attribute_not_exists(SK)",
+                }},
+                _counter_update(event_id, item["status"], 1),
+            ])
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            codes = _cancellation_codes(e)
+            if codes[:1] == ["ConditionalCheckFailed"]:
+                return generate_response(409, {"msg": "User already assigned to event"})
+            if codes[1:2] == ["ConditionalCheckFailed"]:
+                return generate_response(404, {"msg": "Event not found"})
+            raise
 
         logger.info("User assigned to event", extra={"userId": user_id, "eventId": event_id})
-        return generate_response(201, {"msg": "User assigned to event", "assignment": item})
+        return generate_response(201, {
+            "msg": "User assigned to event",
+            "assignment": select([item], ("userId",) + ASSIGNMENT_FIELDS)[0],
+        })
 
     except Exception:
         logger.exception("Failed to assign user to event")
@@ -275,12 +1031,35 @@ def remove_user_from_event(event):
         if not user_id or not event_id:
             return generate_response(400, {"msg": "userId and eventId required"})
 
-        table.delete_item(
-            Key={
-                "PK": f"USER#{user_id}",
-                "SK": f"EVENT#{event_id}"
-            }
-        )
+        key = assignment_key(user_id, event_id)
+        assignment = assignments_repo.get(user_id, event_id, fields=("status",), consistent=True)
+        if assignment is None:
+            return generate_response(404, {"msg": "Assignment not found"})
+
+        status = assignment["status"]
+        try:
+            assignments_repo.transact_write([
+                {"Delete": {
+                    "Key": key,
+                    # The status we decrement is the one being deleted
+                    "ConditionExpression": "#status = :status",
+                    "ExpressionAttributeNames": {"#status": "status"},
+                    "ExpressionAttributeValues": {":status": status},
+                }},
+                _counter_update(event_id, status, -1),
+                {"Put": {"Item": _removal_marker(user_id, event_id)}},
+            ])
+        except ClientError as e:
+            if e.response["Error"]["Code"] != "TransactionCanceledException":
+                raise
+            codes = _cancellation_codes(e)
+            if codes[:1] == ["ConditionalCheckFailed"]:
+                # Removed or changed concurrently
+                return generate_response(409, {"msg": "Assignment changed, retry"})
+            if codes[1:2] != ["ConditionalCheckFailed"]:
+                raise
+            # Event already deleted: nothing left to count
+            assignments_repo.write_many(puts=[_removal_marker(user_id, event_id)], deletes=[key])
 
         logger.info("User removed from event", extra={"userId": user_id, "eventId": event_id})
         return generate_response(200, {"msg": "User removed from event"})
@@ -16,10 +16,11 @@ NORMAL_USER = {
 }
 
 # ---- EVENT FACTORY ----
-def create_event(user,method, path, body=None):
+def create_event(user,method, path, body=None, query=None):
     return {
         "httpMethod": method,
         "path": path,
+        "queryStringParameters": query,
         "headers": {
             "origin": "http://localhost:3000"
         },
@@ -59,6 +60,42 @@ def test_get_events():
     print(response)
 
 
+def test_get_events_by_ids(event_ids, user=ADMIN_USER):
+    print("\n--- GET EVENTS BY IDS ---")
+    event = create_event(user, "GET", "/event", query={"ids": ",".join(event_ids)})
+    response = lambda_handler(event, None)
+    print(response)
+
+
+def test_get_recent_events(since=None):
+    print("\n--- GET RECENT EVENTS ---")
+    event = create_event(ADMIN_USER, "GET", "/event/recent", query={"since": since} if since else None)
+    response = lambda_handler(event, None)
+    print(response)
+
+
+def test_get_event_changes(since=None, user=ADMIN_USER):
+    print("\n--- GET EVENT CHANGES ---")
+    event = create_event(user, "GET", "/event/changes", query={"since": since} if since else None)
+    response = lambda_handler(event, None)
+    print(response)
+    return json.loads(response["body"]).get("watermark")
+
+
+def test_get_event_guests(event_id):
+    print("\n--- GET EVENT GUESTS ---")
+    event = create_event(ADMIN_USER, "GET", f"/event/{event_id}/guests", query={"limit": "50"})
+    response = lambda_handler(event, None)
+    print(response)
+
+
+def test_reconcile_event_guests(event_id, user_ids):
+    print("\n--- RECONCILE EVENT GUESTS ---")
+    event = create_event(ADMIN_USER, "PUT", f"/event/{event_id}/guests", {"userIds": user_ids})
+    response = lambda_handler(event, None)
+    print(response)
+
+
 def test_update_event(event_id):
     print("\n--- UPDATE EVENT ---")
     event = create_event(
@@ -120,14 +157,23 @@ def test_remove_user(event_id, user_id):
 if __name__ == "__main__":
     print("=== FlyCalcio Events Lambda Tests ===")
 
+    watermark = test_get_event_changes()
     event_id = test_create_event()
     test_get_events()
     test_update_event(event_id)
     test_assign_user(event_id, NORMAL_USER["userId"])
 
     test_get_events()
+    test_get_events_by_ids([event_id], NORMAL_USER)
+    test_get_recent_events()
+    test_get_recent_events(since="2024-01-01T00:00:00Z")
+    test_get_event_guests(event_id)
+    test_reconcile_event_guests(event_id, [NORMAL_USER["userId"], ADMIN_USER["userId"]])
+    test_get_event_guests(event_id)
+    test_reconcile_event_guests(event_id, [NORMAL_USER["userId"]])
     test_remove_user(event_id, NORMAL_USER["userId"])
     test_get_events()
     
     # test_delete_event(event_id)
     test_get_events()
+    test_get_event_changes(watermark)
@@ -1,19 +1,25 @@
 import json
-import os
 import uuid
 from datetime import datetime
 
-import boto3
-from boto3.dynamodb.conditions import Key
-
 from utils import generate_response, logger, tracer
-from dotenv import load_dotenv
-load_dotenv()
+import aws_clients
+from pagination import page_params, encode_cursor
+from repositories import UserRepository, AssignmentRepository, PROFILE_FIELDS, ASSIGNMENT_FIELDS
+from fieldsets import requested_fields, select, InvalidFieldsRequest
+import created_index
+from settings import settings
+
+dynamodb = aws_clients.resource("dynamodb")
+table = dynamodb.Table(settings.db_table)
+users_repo = UserRepository()
+assignments_repo = AssignmentRepository()
 
-dynamodb = boto3.resource("dynamodb")
-table = dynamodb.Table(os.environ["DB_TABLE"])
+# Profile fields listed to admins (never the legacy password hash)
+USER_LIST_PROJECTION = "GSI2SK, userId, email, #role, provider, confirmed, createdAt"
 
 @tracer.capture_lambda_handler
+@aws_clients.log_connection_stats
 def lambda_handler(event, context):
     method = event.get("httpMethod")
     path = event.get("path")
@@ -22,6 +28,8 @@ def lambda_handler(event, context):
         return get_user_data(event)
     if path  == '/private/events' and method == 'GET':
         return get_user_events(event)
+    if path  == '/private/users/recent' and method == 'GET':
+        return get_recent_users(event)
     else:
         return generate_response(400, {"msg": "Invalid route or method."})
 @tracer.capture_method
@@ -30,21 +38,21 @@ def get_user_data(event):
         authorizer = event['requestContext']['authorizer']
         user_id = authorizer['principalId']
         role = authorizer.get('role')
-        
-        # Fetch user data from DynamoDB
-        response = table.get_item(
-            Key = {"PK":f"USER#{user_id}","SK":"PROFILE"}
-        )
-        if 'Item' not in response:
+        try:
+            fields = requested_fields(event, PROFILE_FIELDS)
+        except InvalidFieldsRequest as e:
+            return generate_response(400, {"msg": str(e)}, event=event)
+
+        # Fetch user data from DynamoDB; the allowlist never includes the password hash
+        user = users_repo.get_profile(user_id, fields)
+        if user is None:
             logger.warning(f"User not found: {user_id}")
             return generate_response(404, {"msg": "User not found"}, event=event)
-        user = response['Item']
-        # Remove sensitive information
-        user.pop('password', None)
         return generate_response(200, {"user": user}, event=event)
     
     except Exception as e:
         logger.exception(f"Error retrieving user data: {str(e)}")
+        return generate_response(500, {"msg": "Internal server error"}, event=event)
 
 
 @tracer.capture_method
@@ -54,27 +62,57 @@ def get_user_events(event):
         user_id = authorizer['principalId']
         role = authorizer.get('role')
         
-        # Fetch user data from DynamoDB
-        response = table.get_item(
-            Key = {"PK":f"USER#{user_id}","SK":"PROFILE"}
-        )
-        if 'Item' not in response:
-            logger.warning(f"User not found: {user_id}")
-            return generate_response(404, {"msg": "User not found"}, event=event)
-        user = response['Item']
-        
-        user_events_response = table.query(
-            IndexName="GSI1",
-            KeyConditionExpression=(
-                Key("GSI1PK").eq(f"USER#{user_id}") &
-                Key("GSI1SK").begins_with("EVENT#")
-            ))
-        
-        
-        events= user_events_response.get('Items', [])
-        events = sorted(events, key=lambda x: x["date"], reverse=True)
+        scope = f"private-events:{user_id}"
+        try:
+            limit, start_key = page_params(event, scope)
+            fields = requested_fields(event, ASSIGNMENT_FIELDS)
+        except ValueError as e:
+            return generate_response(400, {"msg": str(e)}, event=event)
+
+        # Assignments carry the event summary and are indexed by date in GSI2
+        events, last_key = assignments_repo.for_user(user_id, limit, start_key, newest_first=True, fields=fields)
         
-        return generate_response(200, {"events": events}, event=event)
+        return generate_response(200, {"events": events, "nextCursor": encode_cursor(last_key, scope)}, event=event)
     
     except Exception as e:
-        logger.exception(f"Error retrieving user data: {str(e)}")
\ No newline at end of file
+        logger.exception(f"Error retrieving user data: {str(e)}")
+        return generate_response(500, {"msg": "Internal server error"}, event=event)
+
+@tracer.capture_method
+def get_recent_users(event):
+    """
+    ADMIN only. Newest users first (?limit, ?cursor), or with ?since= the
+    users registered after a watermark/timestamp, oldest first.
+    """
+    try:
+        authorizer = event['requestContext']['authorizer']
+        user_id = authorizer['principalId']
+        if authorizer.get('role') != 'ADMIN':
+            return generate_response(403, {"msg": "Forbidden"}, event=event)
+
+        params = event.get("queryStringParameters") or {}
+        scope = f"recent-users:{user_id}"
+        try:
+            limit, position = page_params(event, scope)
+            since = created_index.since_key(params["since"]) if params.get("since") else None
+        except ValueError as e:
+            return generate_response(400, {"msg": str(e)}, event=event)
+
+        projection = {"ProjectionExpression": USER_LIST_PROJECTION, "ExpressionAttributeNames": {"#role": "role"}}
+        if since is not None:
+            users, watermark, more = created_index.created_after(table, "USER", since, limit, **projection)
+            return generate_response(200, {
+                "users": select(users, PROFILE_FIELDS),
+                "watermark": watermark or params["since"],
+                "hasMore": more,
+            }, event=event)
+
+        users, before = created_index.newest(table, "USER", limit, (position or {}).get("before"), **projection)
+        return generate_response(200, {
+            "users": select(users, PROFILE_FIELDS),
+            "nextCursor": encode_cursor({"before": before} if before else None, scope),
+        }, event=event)
+
+    except Exception as e:
+        logger.exception(f"Error listing recent users: {str(e)}")
+        return generate_response(500, {"msg": "Internal server error"}, event=event)
@@ -16,10 +16,23 @@ def generate_name(name,env,type):
     return f"flycalcio-{name}-{env}-{type}"
 
 
+# API Gateway accepts authorizer cache TTLs between 0 and 3600 seconds
+MAX_AUTHORIZER_CACHE_TTL = 3600
+
+
 class MyApiStack(Stack):
-    def __init__(self, scope: Construct, construct_id: str, env='dev', **kwargs):
+    def __init__(self, scope: Construct, construct_id: str, env='dev', authorizer_cache_ttl=None, **kwargs):
         super().__init__(scope, construct_id, **kwargs)
 
+        # Seconds API Gateway reuses an authorizer policy for the same Authorization
+        # header. The policy covers every route of the caller's role, so one
+        # authorizer run serves the session. Keep it below ACCESS_TOKEN_EXPIRATION:
+        # a cached Allow outlives the token by at most this long.
+        if authorizer_cache_ttl is None:
+            authorizer_cache_ttl = int(self.node.try_get_context("authorizer_cache_ttl") or 300)
+        if not 0 <= authorizer_cache_ttl <= MAX_AUTHORIZER_CACHE_TTL:
+            raise ValueError(f"authorizer_cache_ttl must be between 0 and {MAX_AUTHORIZER_CACHE_TTL}")
+
         
         # Create one shared execution role
         shared_lambda_role = iam.Role(
@@ -70,6 +83,8 @@ class MyApiStack(Stack):
                 type=dynamo.AttributeType.STRING
             ),
             billing_mode=dynamo.BillingMode.PAY_PER_REQUEST,
+            # Epoch seconds; expires refresh-token families
+            time_to_live_attribute="ttl",
             removal_policy=RemovalPolicy.DESTROY
         )
 
@@ -86,6 +101,40 @@ class MyApiStack(Stack):
             ),
             projection_type=dynamo.ProjectionType.ALL
         )
+
+        # GSI for a user's events sorted by date (USER#<id> / <date>#<eventId>)
+        app_table.add_global_secondary_index(
+            index_name="GSI2",
+            partition_key=dynamo.Attribute(
+                name="GSI2PK",
+                type=dynamo.AttributeType.STRING
+            ),
+            sort_key=dynamo.Attribute(
+                name="GSI2SK",
+                type=dynamo.AttributeType.STRING
+            ),
+            projection_type=dynamo.ProjectionType.ALL
+        )
+
+        # GSI for the event change feed (CHANGES#EVENT#<shard> / <updatedAt>#<eventId>).
+        # CloudFormation creates one GSI per table update, so it ships in a
+        # second deploy: the first (change_feed_index false) creates GSI2,
+        # then cdk.json flips change_feed_index to true. Items carry the
+        # GSI3 keys either way, so the index backfills when created.
+        change_feed_index = str(self.node.try_get_context("change_feed_index")).lower() == "true"
+        if change_feed_index:
+            app_table.add_global_secondary_index(
+                index_name="GSI3",
+                partition_key=dynamo.Attribute(
+                    name="GSI3PK",
+                    type=dynamo.AttributeType.STRING
+                ),
+                sort_key=dynamo.Attribute(
+                    name="GSI3SK",
+                    type=dynamo.AttributeType.STRING
+                ),
+                projection_type=dynamo.ProjectionType.ALL
+            )
         
        
         
@@ -96,6 +145,33 @@ class MyApiStack(Stack):
         # Grant read access to secrets
         for secret in [jwt_secret,jwt_refresh_secret]:
             secret.grant_read(shared_lambda_role)
+
+        # Background work (e.g. event summary propagation) is handed off by a
+        # Lambda asynchronously invoking itself
+        shared_lambda_role.add_to_policy(iam.PolicyStatement(
+            actions=["lambda:InvokeFunction"],
+            resources=[f"arn:aws:lambda:{self.region}:{self.account}:function:{self.stack_name}-*"]
+        ))
+
+        # Asymmetric access tokens (RS256 / EdDSA): the private key is created
+        # out of band with `python src/common/python/jwt_keys.py generate` and
+        # only the auth Lambda's role may read it. Verifiers use src/authorizer/jwks.json.
+        jwt_algorithm = self.node.try_get_context("jwt_algorithm") or "HS256"
+        jwt_signing_key = secretsmanager.Secret.from_secret_name_v2(
+            self,
+            "JwtSigningKey",
+            generate_name('jwt-signing-key','dev','secret')
+        )
+        auth_lambda_role = iam.Role(
+            self, generate_name('authlambdarole','dev','role'),
+            assumed_by=iam.ServicePrincipal("lambda.amazonaws.com"),
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name("service-role/AWSLambdaBasicExecutionRole")
+            ]
+        )
+        app_table.grant_read_write_data(auth_lambda_role)
+        for secret in [jwt_secret,jwt_refresh_secret,jwt_signing_key]:
+            secret.grant_read(auth_lambda_role)
         
         
         # ---- Global environment dict ----
@@ -112,6 +188,26 @@ class MyApiStack(Stack):
             "ACCESS_TOKEN_EXPIRATION":"600",
             "REFRESH_TOKEN_EXPIRATION":"86400",
             "DEFAULT_CORS_ORIGIN":"https://finalyze.alessiogiovannini.com",
+            "SECRET_CACHE_TTL":"300",
+            "SECRET_CACHE_MAX_STALE":"3600",
+            "AUTH_TOKEN_CACHE_SIZE":"2048",
+            "AUTH_TOKEN_CACHE_MAX_TTL":"300",
+            "JWT_ALGORITHM": jwt_algorithm,
+            "REFRESH_REUSE_GRACE_SECONDS":"30",
+            "REVOCATION_FILTER_REFRESH":"60",
+            "DEFAULT_PAGE_SIZE":"50",
+            "MAX_PAGE_SIZE":"200",
+            "EVENT_SHARDS":"4",
+            "DELETE_SYNC_LIMIT":"500",
+            "MAX_ROSTER_SIZE":"10000",
+            "IDEMPOTENCY_TTL":"86400",
+            "CREATED_SHARDS":"4",
+            "TOMBSTONE_TTL":"2592000",
+            # GET /event/changes answers 503 until GSI3 exists
+            "CHANGE_FEED_ENABLED": "true" if change_feed_index else "false",
+            # X-Ray active tracing is not enabled on the functions: keep the
+            # Tracer (and aws_xray_sdk) out of cold starts. Flip both together.
+            "POWERTOOLS_TRACE_DISABLED":"true",
             'DB_TABLE': app_table.table_name
             
         }
@@ -149,8 +245,23 @@ class MyApiStack(Stack):
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="handler.lambda_handler",
             code=_lambda.Code.from_asset("src/auth"),
-            environment=global_env,
-            role=shared_lambda_role,
+            environment={
+                **global_env,
+                "JWT_SIGNING_KEY_SECRET_NAME": jwt_signing_key.secret_name,
+                # Calibrated for memory_size below with the auth Lambda's
+                # "calibrate_password_hash" action, see passwords.py
+                "PASSWORD_HASHER": "bcrypt",
+                "PASSWORD_HASH_ROUNDS": str(self.node.try_get_context("password_hash_rounds") or 10),
+                # Audience of Google ID tokens: the frontend's OAuth client id.
+                # Unset, Google sign-in is refused.
+                "GOOGLE_CLIENT_ID": self.node.try_get_context("google_client_id") or "",
+                # Unknown emails cost a GSI1 query until dynamo_migrations 0001
+                # has run: then set login_repair to false in cdk.json
+                "LOGIN_REPAIR_ENABLED": "false" if str(self.node.try_get_context("login_repair")).lower() == "false" else "true",
+                # AWS client timeouts are sized to fit the function timeout, see aws_clients.py
+                "LAMBDA_TIMEOUT": "90",
+            },
+            role=auth_lambda_role,
             layers=[utils_layer,common_layer],
             timeout=Duration.seconds(90),
             memory_size=1024
@@ -171,7 +282,7 @@ class MyApiStack(Stack):
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="handler.lambda_handler",
             code=_lambda.Code.from_asset("src/private"),
-            environment=global_env,
+            environment={**global_env, "LAMBDA_TIMEOUT": "30"},
             role=shared_lambda_role,
             timeout= Duration.seconds(30),
             layers=[utils_layer,common_layer],
@@ -184,9 +295,11 @@ class MyApiStack(Stack):
             runtime=_lambda.Runtime.PYTHON_3_12,
             handler="handler.lambda_handler",
             code=_lambda.Code.from_asset("src/events"),
-            environment=global_env,
+            environment={**global_env, "LAMBDA_TIMEOUT": "60"},
             role=shared_lambda_role,
             layers=[utils_layer,common_layer],
+            # Roster purges and summary propagation run in this function
+            timeout=Duration.seconds(60),
             memory_size=1024
         )
         
@@ -218,7 +331,7 @@ class MyApiStack(Stack):
                     "https://guests.flycalcio.pl"
                 ],
                 allow_methods=["GET", "POST", "PUT", "DELETE", "OPTIONS"],
-                allow_headers=["Authorization", "Content-Type", "X-Amz-Date", "X-Api-Key", "X-Amz-Security-Token"],
+                allow_headers=["Authorization", "Content-Type", "X-Amz-Date", "X-Api-Key", "X-Amz-Security-Token", "Idempotency-Key"],
                 # allow_credentials=True,
                 max_age=Duration.seconds(3600)
             )
@@ -249,7 +362,7 @@ class MyApiStack(Stack):
             identity_sources=[
                 apigw.IdentitySource.header("Authorization")
             ],
-            results_cache_ttl=Duration.seconds(0)
+            results_cache_ttl=Duration.seconds(authorizer_cache_ttl)
         )
         
 
@@ -332,6 +445,26 @@ class MyApiStack(Stack):
                 )
             ],
         )
+
+        # /event, /event/assign, /event/{id}/guests ... (protected, routed by the events handler)
+        event_resource = api.root.add_resource("event")
+        for resource in [event_resource, event_resource.add_resource("{proxy+}")]:
+            resource.add_method(
+                "ANY",
+                events_integration,
+                authorizer=authorizer,
+                authorization_type=apigw.AuthorizationType.CUSTOM,
+                method_responses=[
+                    apigw.MethodResponse(
+                        status_code="200",
+                        response_parameters={
+                            "method.response.header.Access-Control-Allow-Origin": True,
+                            "method.response.header.Access-Control-Allow-Headers": True,
+                            "method.response.header.Access-Control-Allow-Methods": True,
+                        },
+                    )
+                ],
+            )
         
 
         
@@ -0,0 +1,45 @@
+import dataclasses
+import importlib
+import os
+from unittest import mock
+
+import pytest
+
+import settings as settings_module
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeClock:
+    """A clock tests move by hand; callable like time.monotonic, or used as the time module."""
+
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture(scope="session")
+def import_configured():
+    """
+    Import a handler module under settings with the given overrides and a
+    region, so its module-level clients can be built without a .env:
+
+        import_configured("events.handler", db_table="events-test")
+    """
+    def load(module_name, **overrides):
+        configured = dataclasses.replace(settings_module.settings, **overrides)
+        with mock.patch.object(settings_module, "settings", configured), \
+                mock.patch.dict(os.environ, {"AWS_DEFAULT_REGION": "eu-west-1"}):
+            return importlib.import_module(module_name)
+    return load
@@ -0,0 +1,88 @@
+"""
+Local stand-in for https://www.googleapis.com/oauth2/v1/certs.
+
+Serves {kid: PEM certificate} with a configurable Cache-Control max-age and
+can sign Google-style ID tokens with the matching private keys.
+"""
+import datetime
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import jwt
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+
+
+def _self_signed_cert(private_key):
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, "stub.googleapis.com")])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(private_key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now - datetime.timedelta(days=1))
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(private_key, hashes.SHA256())
+    )
+    return cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+class GoogleCertsStub:
+    def __init__(self, max_age=3600):
+        self.max_age = max_age
+        self.keys = {}
+        self.certs = {}
+        self.requests = 0
+        self.add_key("stub-key-1")
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests += 1
+                body = json.dumps(stub.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={stub.max_age}, must-revalidate, no-transform")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/oauth2/v1/certs"
+
+    def add_key(self, kid):
+        private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+        self.keys[kid] = private_key
+        self.certs[kid] = _self_signed_cert(private_key)
+
+    def id_token(self, kid="stub-key-1", audience="client-id", email="user@gmail.com", **claims):
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": audience,
+            "sub": "1234567890",
+            "email": email,
+            "email_verified": True,
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        return jwt.encode(payload, self.keys[kid], algorithm="RS256", headers={"kid": kid})
+
+    def start(self):
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,59 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+AUTHORIZER = os.path.join(os.path.dirname(__file__), "..", "src", "authorizer")
+# Modules of src/authorizer that share a name with the common layer's
+SHADOWED = ("utils",)
+
+METHOD_ARN = "arn:aws:execute-api:eu-central-1:123456789012:abcdef123/dev/GET/private/me"
+PREFIX = "arn:aws:execute-api:eu-central-1:123456789012:abcdef123/dev"
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture
+def handler(monkeypatch):
+    """authorizer.handler, imported with src/authorizer on sys.path only for this test."""
+    saved = {name: sys.modules.get(name) for name in SHADOWED}
+    monkeypatch.syspath_prepend(AUTHORIZER)
+    yield importlib.import_module("authorizer.handler")
+    for name, module in saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_api_arn_prefix(handler):
+    assert handler.api_arn_prefix(METHOD_ARN) == PREFIX
+
+
+def test_user_policy_covers_user_routes_only(handler):
+    resources = handler.role_resources("USER", METHOD_ARN)
+    assert f"{PREFIX}/*/private/*" in resources
+    assert f"{PREFIX}/GET/events" in resources
+    assert f"{PREFIX}/*/events" not in resources
+    assert not any("guests" in r for r in resources)
+
+
+def test_admin_policy_covers_all_protected_routes(handler):
+    resources = handler.role_resources("ADMIN", METHOD_ARN)
+    for route in ["*/private/*", "*/events", "*/events/*", "*/guests", "*/guests/*"]:
+        assert f"{PREFIX}/{route}" in resources
+
+
+def test_unknown_role_gets_no_routes(handler):
+    assert handler.role_resources("GUEST", METHOD_ARN) == []
+
+
+def test_policy_context_is_stringified(handler):
+    policy = handler.generate_policy("u1", "Allow", handler.role_resources("USER", METHOD_ARN), context={"id": "u1", "exp": 10})
+    assert policy["context"] == {"id": "u1", "exp": "10"}
+    assert policy["policyDocument"]["Statement"][0]["Resource"][0].startswith(PREFIX)
@@ -0,0 +1,90 @@
+import json
+
+import pytest
+
+import aws_clients
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class Sent(Exception):
+    """Stops a request at before-send, carrying its body."""
+
+
+class FakePool:
+    def __init__(self, requests, connections):
+        self.num_requests = requests
+        self.num_connections = connections
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients(monkeypatch):
+    monkeypatch.setenv("AWS_DEFAULT_REGION", "eu-west-1")
+    aws_clients.reset()
+    yield
+    aws_clients.reset()
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_clients_are_built_once_per_service_and_region():
+    assert aws_clients.client("lambda") is aws_clients.client("lambda")
+    assert aws_clients.client("lambda", "eu-central-1") is not aws_clients.client("lambda")
+    assert aws_clients.resource("dynamodb") is aws_clients.resource("dynamodb")
+
+
+def test_dynamodb_client_sends_attribute_values_as_given(monkeypatch):
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "test")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "test")
+    dynamodb = aws_clients.client("dynamodb")
+    assert dynamodb is not aws_clients.resource("dynamodb").meta.client
+
+    def capture(request, **kwargs):
+        raise Sent(json.loads(request.body))
+
+    dynamodb.meta.events.register("before-send.dynamodb.GetItem", capture)
+    with pytest.raises(Sent) as sent:
+        dynamodb.get_item(TableName="t", Key={"PK": {"S": "EVENT#1"}})
+
+    assert sent.value.args[0]["Key"] == {"PK": {"S": "EVENT#1"}}
+
+
+def test_clients_use_the_tuned_config():
+    config = aws_clients.client("secretsmanager").meta.config
+    assert config.retries["mode"] == "adaptive"
+    assert config.tcp_keepalive is True
+    assert config.max_pool_connections == aws_clients.MAX_POOL_CONNECTIONS
+    assert config.read_timeout == aws_clients.READ_TIMEOUT
+    assert config.connect_timeout == aws_clients.CONNECT_TIMEOUT
+
+
+def test_read_attempts_fit_the_lambda_timeout():
+    # Leaves one attempt's worth of the timeout to return an error response
+    assert aws_clients.READ_TIMEOUT * (aws_clients.MAX_ATTEMPTS + 1) <= aws_clients.LAMBDA_TIMEOUT
+
+
+def test_connection_stats_count_reuse(monkeypatch):
+    aws_clients.client("lambda")
+    aws_clients.resource("dynamodb")
+    assert aws_clients.connection_stats() == {
+        "lambda": {"requests": 0, "connections": 0, "reused": 0},
+        "dynamodb": {"requests": 0, "connections": 0, "reused": 0},
+    }
+
+    monkeypatch.setattr(aws_clients, "_pools", lambda c: [FakePool(10, 1), FakePool(3, 2)])
+    assert aws_clients.connection_stats()["dynamodb"] == {"requests": 13, "connections": 3, "reused": 10}
+
+
+def test_handlers_log_connection_stats_per_invocation(monkeypatch):
+    logged = []
+    monkeypatch.setattr(aws_clients.logger, "info", lambda msg, extra: logged.append(extra))
+
+    @aws_clients.log_connection_stats
+    def handler(event, context):
+        aws_clients.client("lambda")
+        return {"statusCode": 200}
+
+    assert handler({}, None) == {"statusCode": 200}
+    assert logged == [{"awsConnections": {"lambda": {"requests": 0, "connections": 0, "reused": 0}}}]
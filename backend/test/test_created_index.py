@@ -0,0 +1,81 @@
+from datetime import datetime, timedelta, timezone
+
+import created_index
+from created_index import created_keys, newest, created_after, since_key
+from ids import new_id, min_id_at
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeIndexTable:
+    """Query over GSI2 for the Key conditions created_index builds."""
+
+    def __init__(self, items):
+        self.items = items
+
+    def query(self, IndexName, KeyConditionExpression, ScanIndexForward=True, Limit=None, **kwargs):
+        assert IndexName == "GSI2"
+        partition, sort = KeyConditionExpression._values
+        pk = partition._values[1]
+        operator, bound = sort.expression_operator, sort._values[1]
+        compare = {"<": lambda k: k < bound, ">": lambda k: k > bound}[operator]
+        matches = sorted((i for i in self.items if i["GSI2PK"] == pk and compare(i["GSI2SK"])),
+                         key=lambda i: i["GSI2SK"], reverse=not ScanIndexForward)
+        resp = {"Items": matches[:Limit]}
+        if len(matches) > Limit:
+            resp["LastEvaluatedKey"] = {"GSI2SK": matches[Limit - 1]["GSI2SK"]}
+        return resp
+
+
+def event(created_at=None):
+    event_id = new_id()
+    item = {"eventId": event_id, **created_keys("EVENT", event_id)}
+    if created_at:
+        item["GSI2SK"] = min_id_at(created_at)[:-12] + event_id[-12:]
+    return item
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_newest_pages_through_all_shards_in_order():
+    items = [event() for _ in range(37)]
+    table = FakeIndexTable(items)
+
+    seen, before = [], None
+    while True:
+        page, before = newest(table, "EVENT", 10, before)
+        seen += page
+        if not before:
+            break
+
+    assert [i["eventId"] for i in seen] == [i["eventId"] for i in reversed(items)]
+    assert len({i["GSI2PK"] for i in items}) == created_index.CREATED_SHARDS
+
+
+def test_delta_returns_items_after_watermark_and_holds_back_recent_ones():
+    now = datetime.now(timezone.utc)
+    old = [event(now - timedelta(minutes=10 - i)) for i in range(5)]
+    fresh = event(now)
+    table = FakeIndexTable(old + [fresh])
+
+    items, watermark, more = created_after(table, "EVENT", since_key(old[1]["GSI2SK"]), 10)
+
+    assert [i["eventId"] for i in items] == [i["eventId"] for i in old[2:]]
+    assert watermark == old[-1]["GSI2SK"]
+    assert not more
+
+    items, watermark, _ = created_after(table, "EVENT", since_key(watermark), 10)
+    assert items == [] and watermark is None
+
+
+def test_since_accepts_timestamps():
+    now = datetime.now(timezone.utc)
+    items = [event(now - timedelta(minutes=m)) for m in (30, 20, 10)]
+    table = FakeIndexTable(items)
+
+    since = (now - timedelta(minutes=20)).isoformat()
+    found, _, _ = created_after(table, "EVENT", since_key(since), 10)
+
+    assert [i["eventId"] for i in found] == [i["eventId"] for i in items[1:]]
@@ -0,0 +1,48 @@
+import pytest
+
+from dates import to_sort_key, parse_datetime
+
+# ------------------------
+# Tests
+# ------------------------
+
+@pytest.mark.parametrize("value, expected", [
+    ("2026-05-17", "2026-05-17T00:00:00Z"),
+    ("2026-05-17T18:00", "2026-05-17T18:00:00Z"),
+    ("2026-05-17T20:00:00+02:00", "2026-05-17T18:00:00Z"),
+    ("2026-05-17T01:30:00+03:00", "2026-05-16T22:30:00Z"),
+    ("2026-05-17T18:00:00.123Z", "2026-05-17T18:00:00Z"),
+])
+def test_iso_dates_become_utc_sort_keys(value, expected):
+    assert to_sort_key(value) == expected
+
+
+def test_sort_keys_order_chronologically_across_offsets():
+    values = ["2026-05-17T20:00:00+02:00", "2026-05-17T18:30:00Z", "2026-05-17T17:00:00-03:00"]
+    assert sorted(values, key=to_sort_key) == [values[0], values[1], values[2]]
+
+
+@pytest.mark.parametrize("value", ["17/05/2026", "next friday", "", None, 20260517])
+def test_strict_mode_rejects_non_iso(value):
+    with pytest.raises(ValueError):
+        to_sort_key(value)
+
+
+def test_lenient_mode_for_backfills():
+    assert to_sort_key("17/05/2026 18:00", lenient=True, dayfirst=True) == "2026-05-17T18:00:00Z"
+    assert to_sort_key("05/17/2026", lenient=True) == "2026-05-17T00:00:00Z"
+
+
+def test_parse_datetime_is_aware_utc():
+    parsed = parse_datetime("2026-05-17T20:00:00+02:00")
+    assert parsed.utcoffset().total_seconds() == 0
+    assert parsed.hour == 18
+
+
+def test_timestamp_keys_are_fixed_width_utc():
+    from datetime import datetime, timedelta, timezone
+    from dates import timestamp_key
+
+    moment = datetime(2026, 5, 17, 20, 0, 0, 1234, tzinfo=timezone(timedelta(hours=2)))
+    assert timestamp_key(moment) == "2026-05-17T18:00:00.001234Z"
+    assert len(timestamp_key()) == len(timestamp_key(moment))
@@ -0,0 +1,131 @@
+import pytest
+
+import dynamo_batch
+from dynamo_batch import batch_get, batch_write, UnprocessedItemsError
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeDynamoDB:
+    """BatchGetItem over an in-memory table, leaving `throttle` keys unprocessed per call."""
+
+    def __init__(self, items, throttle=0):
+        self.items = {(i["PK"], i["SK"]): i for i in items}
+        self.throttle = throttle
+        self.calls = []
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        keys = request["Keys"]
+        assert len(keys) <= 100
+        self.calls.append(len(keys))
+        served, unprocessed = keys[self.throttle:], keys[:self.throttle]
+        resp = {"Responses": {table_name: [self.items[(k["PK"], k["SK"])] for k in served if (k["PK"], k["SK"]) in self.items]}}
+        if unprocessed:
+            resp["UnprocessedKeys"] = {table_name: {**request, "Keys": unprocessed}}
+        return resp
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        assert len(requests) <= 25
+        self.calls.append(len(requests))
+        served, unprocessed = requests[self.throttle:], requests[:self.throttle]
+        for r in served:
+            if "PutRequest" in r:
+                item = r["PutRequest"]["Item"]
+                self.items[(item["PK"], item["SK"])] = item
+            else:
+                key = r["DeleteRequest"]["Key"]
+                self.items.pop((key["PK"], key["SK"]), None)
+        return {"UnprocessedItems": {table_name: unprocessed}} if unprocessed else {}
+
+
+def event_item(i):
+    return {"PK": f"EVENT#{i}", "SK": "METADATA", "title": f"Match {i}"}
+
+
+def event_key(i):
+    return {"PK": f"EVENT#{i}", "SK": "METADATA"}
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(dynamo_batch, "_backoff", lambda attempt: None)
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_keys_are_chunked_and_order_is_kept():
+    db = FakeDynamoDB([event_item(i) for i in range(250)])
+    keys = [event_key(i) for i in reversed(range(250))]
+
+    items = batch_get(db, "table", keys)
+
+    assert [item["PK"] for item in items] == [k["PK"] for k in keys]
+    assert db.calls == [100, 100, 50]
+
+
+def test_missing_items_are_skipped_and_duplicates_fetched_once():
+    db = FakeDynamoDB([event_item(1), event_item(3)])
+    items = batch_get(db, "table", [event_key(3), event_key(2), event_key(1), event_key(3)])
+
+    assert [item["PK"] for item in items] == ["EVENT#3", "EVENT#1", "EVENT#3"]
+    assert db.calls == [3]
+
+
+def test_unprocessed_keys_are_retried():
+    db = FakeDynamoDB([event_item(i) for i in range(10)], throttle=3)
+    original = db.batch_get_item
+
+    def throttle_once(RequestItems):
+        resp = original(RequestItems)
+        db.throttle = 0
+        return resp
+
+    db.batch_get_item = throttle_once
+    items = batch_get(db, "table", [event_key(i) for i in range(10)])
+
+    assert len(items) == 10
+    assert db.calls == [10, 3]
+
+
+def test_gives_up_after_max_retries():
+    db = FakeDynamoDB([event_item(1)], throttle=1)
+    with pytest.raises(UnprocessedItemsError):
+        batch_get(db, "table", [event_key(1)])
+
+
+def test_batch_write_chunks_puts_and_deletes():
+    db = FakeDynamoDB([event_item(i) for i in range(40)])
+
+    written = batch_write(db, "table",
+                          puts=[event_item(i) for i in range(100, 130)],
+                          deletes=[event_key(i) for i in range(40)] + [event_key(0)],
+                          workers=4)
+
+    assert written == 70
+    assert sorted(db.calls) == [20, 25, 25]
+    assert set(db.items) == {(f"EVENT#{i}", "METADATA") for i in range(100, 130)}
+
+
+def test_batch_write_retries_unprocessed_items():
+    db = FakeDynamoDB([event_item(i) for i in range(10)], throttle=4)
+    original = db.batch_write_item
+
+    def throttle_once(RequestItems):
+        resp = original(RequestItems)
+        db.throttle = 0
+        return resp
+
+    db.batch_write_item = throttle_once
+    assert batch_write(db, "table", deletes=[event_key(i) for i in range(10)]) == 10
+    assert db.items == {}
+    assert db.calls == [10, 4]
+
+
+def test_batch_write_gives_up_after_max_retries():
+    db = FakeDynamoDB([event_item(1)], throttle=1)
+    with pytest.raises(UnprocessedItemsError):
+        batch_write(db, "table", deletes=[event_key(1)])
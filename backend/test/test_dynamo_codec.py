@@ -0,0 +1,78 @@
+from decimal import Decimal
+
+import pytest
+from boto3.dynamodb.types import TypeDeserializer, TypeSerializer
+
+from dynamo_codec import decode, decode_item, encode, encode_item
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+ITEM = {
+    "PK": "EVENT#0190b6b2-0000-7000-8000-000000000001",
+    "SK": "METADATA",
+    "title": "Match day",
+    "attendeeCount": 42,
+    "ratio": 0.25,
+    "published": True,
+    "notes": None,
+    "tags": ["derby", 3, {"nested": False}],
+    "location": {"city": "Milan", "seats": 80000},
+    "labels": {"a", "b"},
+    "blob": b"\x00\x01",
+}
+
+
+def native(value):
+    """TypeDeserializer output with Decimals turned into int/float, for comparison."""
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() and "." not in str(value) else float(value)
+    if isinstance(value, dict):
+        return {k: native(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return [native(v) for v in value]
+    if isinstance(value, set):
+        return {native(v) for v in value}
+    if hasattr(value, "value"):  # boto3 Binary
+        return bytes(value.value)
+    return value
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_round_trip():
+    assert decode_item(encode_item(ITEM)) == ITEM
+
+
+def test_decodes_like_type_deserializer_but_native():
+    serialized = {k: TypeSerializer().serialize(v) for k, v in
+                  {**ITEM, "ratio": Decimal("0.25")}.items()}
+    expected = {k: native(TypeDeserializer().deserialize(v)) for k, v in serialized.items()}
+    assert decode_item(serialized) == expected
+
+
+def test_numbers_decode_to_int_or_float():
+    assert decode({"N": "10"}) == 10 and isinstance(decode({"N": "10"}), int)
+    assert decode({"N": "-3"}) == -3
+    assert decode({"N": "1.5"}) == 1.5
+    assert decode({"N": "1E+3"}) == 1000.0
+    assert decode({"NS": ["1", "2.5"]}) == {1, 2.5}
+
+
+def test_bool_is_not_encoded_as_number():
+    assert encode(True) == {"BOOL": True}
+    assert encode(1) == {"N": "1"}
+    assert encode(Decimal("2.50")) == {"N": "2.50"}
+
+
+def test_empty_values():
+    assert decode_item(None) is None
+    assert encode_item({}) == {}
+    with pytest.raises(ValueError):
+        encode(set())
+    with pytest.raises(ValueError):
+        encode(float("nan"))
+    with pytest.raises(TypeError):
+        encode(object())
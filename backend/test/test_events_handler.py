@@ -0,0 +1,571 @@
+import dataclasses
+import json
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+from dates import timestamp_key
+from dynamo_batch import UnprocessedItemsError
+from repositories import EVENT_FIELDS, assignment_key, change_keys, event_index_keys, event_key, user_events_sort_key
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture(scope="module")
+def handler(import_configured):
+    """events.handler, imported with a table name and region it can build its clients with."""
+    return import_configured("events.handler", db_table="events-test")
+
+
+class FakeAssignments:
+    """GSI1 roster pages, possibly stale, the consistent base-table view, and recorded writes."""
+
+    def __init__(self, roster, stored):
+        self.roster_items = roster
+        self.stored = stored
+        self.consistent_reads = []
+        self.writes = []
+        self.transactions = []
+        # Cancellation codes the next transaction fails with, in TransactItems order
+        self.cancel = None
+        self.throttled = False
+        self.updates = []
+        # Assignment PKs deleted after the roster page listed them
+        self.gone = set()
+
+    def roster(self, event_id, limit, start_key=None, fields=None):
+        start = start_key or 0
+        page = self.roster_items[start:start + limit]
+        return list(page), (start + limit if start + limit < len(self.roster_items) else None)
+
+    def get_many(self, event_id, user_ids, fields=None, consistent=False):
+        self.consistent_reads.append(consistent)
+        return [{"userId": u, "status": self.stored[u]} for u in user_ids if u in self.stored]
+
+    def write_many(self, puts=(), deletes=(), workers=1):
+        if self.throttled:
+            raise UnprocessedItemsError("throttled", [{"DeleteRequest": {"Key": k}} for k in deletes])
+        self.writes.append((list(puts), list(deletes)))
+        return len(self.writes[-1][0]) + len(self.writes[-1][1])
+
+    def update(self, key, **request):
+        # A conditional update of an assignment removed meanwhile
+        if key["PK"] in self.gone:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        self.updates.append((key, request))
+
+    def get(self, user_id, event_id, fields=None, consistent=False):
+        self.consistent_reads.append(consistent)
+        return {"status": self.stored[user_id]} if user_id in self.stored else None
+
+    def transact_write(self, actions):
+        self.transactions.append(actions)
+        if self.cancel:
+            raise cancelled(*self.cancel)
+
+
+class FakeEvents:
+    """EventRepository over a list of items: gets, the GSI1 date and GSI3 change-feed queries, recorded writes."""
+
+    def __init__(self, items=()):
+        self.items = list(items)
+        self.limits = []
+        self.updates = []
+        self.transactions = []
+
+    def get(self, event_id, fields=None, consistent=False):
+        key = event_key(event_id)
+        return next((dict(i) for i in self.items if (i.get("PK"), i.get("SK")) == (key["PK"], key["SK"])), None)
+
+    def get_items(self, keys, fields=None, consistent=False):
+        wanted = [(k["PK"], k["SK"]) for k in keys]
+        return [dict(i) for i in self.items if (i.get("PK"), i.get("SK")) in wanted]
+
+    def put(self, item, **request):
+        self.items.append(item)
+
+    def update(self, key, **request):
+        self.updates.append((key, request))
+
+    def transact_write(self, actions):
+        self.transactions.append(actions)
+
+    def dated(self, partition, low, high, limit, fields=None):
+        self.limits.append(limit)
+        found = sorted(
+            (i for i in self.items if i["GSI1PK"] == partition and low <= i["GSI1SK"] <= high),
+            key=lambda i: i["GSI1SK"],
+        )[:limit]
+        return [{f: i[f] for f in fields if f in i} if fields else dict(i) for i in found]
+
+    def changed(self, partition, low, high, limit):
+        found = sorted(
+            (i for i in self.items if i.get("GSI3PK") == partition and low <= i["GSI3SK"] <= high),
+            key=lambda i: i["GSI3SK"],
+        )
+        page = found[:limit]
+        return page, ({"GSI3SK": page[-1]["GSI3SK"]} if len(found) > limit else None)
+
+
+class FakeUsers:
+    def get_profiles(self, user_ids, fields=None):
+        return [{"userId": u, "email": f"{u}@example.com"} for u in user_ids]
+
+
+def cancelled(*codes):
+    return ClientError({
+        "Error": {"Code": "TransactionCanceledException"},
+        "CancellationReasons": [{"Code": code} for code in codes],
+    }, "TransactWriteItems")
+
+
+def match(event_id="e1", **attributes):
+    return {**event_key(event_id), "eventId": event_id, "title": "Match", "date": "2026-05-17", "location": None,
+            **attributes}
+
+
+def profile(user_id):
+    return {"PK": f"USER#{user_id}", "SK": "PROFILE", "userId": user_id, "email": f"{user_id}@example.com"}
+
+
+def admin_request(method="GET", path="/event", body=None, params=None, role="ADMIN"):
+    return {
+        "httpMethod": method,
+        "path": path,
+        "body": json.dumps(body) if body is not None else None,
+        "queryStringParameters": params,
+        "requestContext": {"authorizer": {"principalId": "admin-1", "role": role}},
+    }
+
+
+def ids(n):
+    return [f"00000000-0000-4000-8000-{i:012d}" for i in range(n)]
+
+
+def dated_events(dates):
+    return [
+        {"eventId": event_id, "date": date, "title": f"Match {event_id[-3:]}", **event_index_keys(date, event_id)}
+        for event_id, date in zip(ids(len(dates)), dates)
+    ]
+
+
+def changes(*ages):
+    """A METADATA (or, for negative ages, TOMBSTONE) change per age in seconds before now."""
+    now = datetime.now(timezone.utc)
+    return [
+        {
+            **event_key(event_id),
+            "SK": "TOMBSTONE" if age < 0 else "METADATA",
+            "eventId": event_id,
+            **change_keys(event_id, timestamp_key(now - timedelta(seconds=abs(age)))),
+        }
+        for event_id, age in zip(ids(len(ages)), ages)
+    ]
+
+
+def read_changes(handler, since=None, limit=None, role="ADMIN"):
+    params = {k: v for k, v in (("since", since), ("limit", limit)) if v is not None}
+    response = handler.get_event_changes(admin_request(path="/event/changes", params=params, role=role))
+    return response["statusCode"], json.loads(response["body"])
+
+
+def guests(n):
+    return [assignment_key(u, "e1") for u in ids(n)]
+
+
+@pytest.fixture
+def invoked(handler, monkeypatch):
+    """(action, eventId) of every asynchronous self-invocation."""
+    invoked = []
+    monkeypatch.setattr(handler, "_invoke_self", lambda action, event_id: invoked.append((action, event_id)))
+    return invoked
+
+
+def delete_event(handler):
+    response = handler.delete_event(admin_request("DELETE", body={"eventId": "e1"}))
+    return response["statusCode"], json.loads(response["body"])
+
+
+def all_pages(handler, start, end, limit, fields=None):
+    pages, position = [], None
+    while True:
+        events, position = handler._list_events_in_range(start, end, limit, position, fields)
+        pages.append(events)
+        if position is None:
+            return pages
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_reconcile_confirms_stale_roster_before_writing(handler, monkeypatch):
+    a, b, c = ids(3)
+    events = FakeEvents([match()])
+    # GSI1 still lists c, already removed; a was assigned a moment ago and is not listed yet
+    assignments = FakeAssignments(roster=[{"userId": c, "status": "CONFIRMED"}], stored={a: "CONFIRMED"})
+    monkeypatch.setattr(handler, "events_repo", events)
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+    monkeypatch.setattr(handler, "users_repo", FakeUsers())
+
+    response = handler.reconcile_event_guests(admin_request("PUT", "/event/e1/guests", {"userIds": [a, b]}), "e1")
+
+    body = json.loads(response["body"])
+    assert response["statusCode"] == 200
+    assert {r["userId"]: r["result"] for r in body["results"]} == {a: "unchanged", b: "added"}
+    assert assignments.consistent_reads == [True]
+    (puts, deletes), = assignments.writes
+    assert [p["userId"] for p in puts] == [b] and deletes == []
+    assert puts[0]["PK"] == assignment_key(b, "e1")["PK"]
+    assert puts[0]["GSI1PK"] == "EVENT#e1" and puts[0]["GSI2PK"] == f"USER#{b}"
+    # attendeeCount moves by the one real add
+    (key, update), = events.updates
+    assert key == event_key("e1")
+    assert update["ExpressionAttributeValues"][":total"] == 1
+
+
+def test_reconcile_removal_leaves_a_marker_for_the_change_feed(handler, monkeypatch):
+    a, c = ids(2)
+    events = FakeEvents([match()])
+    assignments = FakeAssignments(roster=[{"userId": a, "status": "CONFIRMED"}, {"userId": c, "status": "CONFIRMED"}],
+                                  stored={a: "CONFIRMED", c: "CONFIRMED"})
+    monkeypatch.setattr(handler, "events_repo", events)
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+    monkeypatch.setattr(handler, "users_repo", FakeUsers())
+
+    response = handler.reconcile_event_guests(admin_request("PUT", "/event/e1/guests", {"userIds": [a]}), "e1")
+
+    assert json.loads(response["body"])["removed"] == 1
+    (puts, deletes), = assignments.writes
+    assert deletes == [assignment_key(c, "e1")]
+    marker, = puts
+    assert (marker["PK"], marker["SK"]) == (f"USER#{c}", "REMOVED#e1") and marker["ttl"] > 0
+    (_, update), = events.updates
+    assert update["ExpressionAttributeValues"][":s0"] == -1
+
+
+def test_range_pages_step_across_months_and_shards(handler, monkeypatch):
+    dates = [f"2026-{m:02d}-{d:02d}" for m in (3, 4, 6) for d in (1, 9, 9, 17, 28)]
+    events = dated_events(dates)
+    assert len({e["GSI1PK"] for e in events}) > 3  # spread over shards too
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(events))
+
+    pages = all_pages(handler, "2026-03-01", "2026-06-30", limit=4)
+
+    listed = [e["eventId"] for page in pages for e in page]
+    assert listed == [e["eventId"] for e in sorted(events, key=lambda e: e["GSI1SK"])]
+    assert all(len(page) == 4 for page in pages[:-1])
+
+
+def test_range_page_overfetches_one_and_drops_the_cursor_item(handler, monkeypatch):
+    events = dated_events(["2026-05-01", "2026-05-02", "2026-05-03"])
+    repo = FakeEvents(events)
+    monkeypatch.setattr(handler, "events_repo", repo)
+
+    first, position = handler._list_events_in_range("2026-05-01", "2026-05-31", 2)
+    assert position == {"m": "2026-05", "sk": first[-1]["GSI1SK"]}
+
+    repo.limits.clear()
+    second, position = handler._list_events_in_range("2026-05-01", "2026-05-31", 2, position)
+    # between() includes the cursor item: one extra per shard, then dropped
+    assert set(repo.limits) == {3}
+    assert [e["eventId"] for e in second] == [events[2]["eventId"]]
+    assert position is None
+
+
+def test_range_respects_bounds_and_projects_the_sort_key(handler, monkeypatch):
+    events = dated_events(["2026-04-30", "2026-05-01", "2026-05-31T21:00:00Z", "2026-06-01"])
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(events))
+
+    listed, position = handler._list_events_in_range("2026-05-01", "2026-05-31", 10, fields=("title",))
+
+    assert [e["GSI1SK"][:10] for e in listed] == ["2026-05-01", "2026-05-31"]
+    assert set(listed[0]) == {"title", "GSI1SK"}
+    assert position is None
+
+
+def test_changes_without_watermark_start_at_the_settled_now(handler, monkeypatch):
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(changes(60)))
+
+    status, body = read_changes(handler)
+
+    assert status == 200 and body["events"] == [] and body["deleted"] == []
+    settled = datetime.now(timezone.utc) - handler.CHANGES_SETTLE
+    assert body["watermark"] <= timestamp_key(settled)
+
+
+def test_changes_after_watermark_oldest_first_across_shards(handler, monkeypatch):
+    items = changes(60, 50, -40, 30, 0)
+    assert len({i["GSI3PK"] for i in items}) > 1
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(items))
+
+    status, body = read_changes(handler, since=items[0]["GSI3SK"])
+
+    assert status == 200
+    # The watermark item was sent before; the change at "now" is not settled yet
+    assert [e["eventId"] for e in body["events"]] == [items[1]["eventId"], items[3]["eventId"]]
+    assert set(body["events"][0]) <= set(EVENT_FIELDS)
+    assert body["deleted"] == [items[2]["eventId"]]
+    assert body["watermark"] == items[3]["GSI3SK"]
+    assert body["hasMore"] is False
+
+
+def test_changes_page_by_limit_and_resume_from_the_watermark(handler, monkeypatch):
+    items = changes(90, 80, 70, 60, 50)
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(items))
+
+    _, first = read_changes(handler, since=timestamp_key(datetime.now(timezone.utc) - timedelta(minutes=5)), limit="2")
+    _, second = read_changes(handler, since=first["watermark"], limit="3")
+
+    assert first["hasMore"] is True and second["hasMore"] is False
+    listed = [e["eventId"] for e in first["events"] + second["events"]]
+    assert listed == [i["eventId"] for i in items]
+
+
+def test_watermark_older_than_tombstones_asks_for_resync(handler):
+    too_old = datetime.now(timezone.utc) - timedelta(seconds=handler.TOMBSTONE_TTL + 60)
+
+    status, body = read_changes(handler, since=timestamp_key(too_old))
+
+    assert status == 410 and body["resync"] is True
+
+
+def test_user_sees_changes_and_deletes_of_own_events_only(handler, monkeypatch):
+    kept, left, gone, purged, other, other_gone = items = changes(60, 50, -40, -30, 20, -10)
+    monkeypatch.setattr(handler, "events_repo", FakeEvents(items))
+    # `gone` is deleted but not purged yet; `purged` lost its assignments already
+    monkeypatch.setattr(handler, "_assigned_event_ids", lambda user_id: [kept["eventId"], gone["eventId"]])
+    monkeypatch.setattr(handler, "_removed_event_ids", lambda user_id: [left["eventId"], purged["eventId"]])
+
+    _, body = read_changes(handler, since=timestamp_key(datetime.now(timezone.utc) - timedelta(minutes=5)), role="USER")
+
+    assert [e["eventId"] for e in body["events"]] == [kept["eventId"]]
+    # The removal re-stamped `left`: for this user it is a delete
+    assert body["deleted"] == [left["eventId"], gone["eventId"], purged["eventId"]]
+
+
+def test_changes_answer_503_until_the_index_exists(handler, monkeypatch):
+    monkeypatch.setattr(handler, "settings", dataclasses.replace(handler.settings, change_feed_enabled=False))
+
+    status, _ = read_changes(handler, since=timestamp_key())
+
+    assert status == 503
+
+
+def test_created_event_is_returned_without_internal_keys(handler, monkeypatch):
+    events = FakeEvents()
+    monkeypatch.setattr(handler, "events_repo", events)
+
+    response = handler.create_event(admin_request("POST", body={"title": "Derby", "date": "2026-05-17"}))
+
+    assert response["statusCode"] == 201
+    event = json.loads(response["body"])["event"]
+    assert set(event) <= set(EVENT_FIELDS) and event["title"] == "Derby"
+    stored, = events.items
+    assert "GSI1PK" in stored and "createdBy" in stored
+
+
+def test_assign_puts_the_assignment_and_counts_it_in_one_transaction(handler, monkeypatch):
+    assignments = FakeAssignments(roster=[], stored={})
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match(), profile("u1")]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.assign_user_to_event(admin_request("POST", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == 201
+    assignment = json.loads(response["body"])["assignment"]
+    assert assignment["userId"] == "u1" and assignment["title"] == "Match"
+    assert not any(k.startswith("GSI") or k in ("PK", "SK") for k in assignment)
+    (put, counter), = assignments.transactions
+    assert put["Put"]["Item"]["PK"] == "USER#u1" and "attribute_not_exists(PK)" in put["Put"]["ConditionExpression"]
+    assert counter["Update"]["Key"] == event_key("e1")
+    assert counter["Update"]["ExpressionAttributeValues"][":delta"] == 1
+
+
+@pytest.mark.parametrize("codes, status", [
+    (("ConditionalCheckFailed", "None"), 409),
+    (("None", "ConditionalCheckFailed"), 404),
+])
+def test_assign_maps_cancellation_reasons(handler, monkeypatch, codes, status):
+    assignments = FakeAssignments(roster=[], stored={})
+    assignments.cancel = codes
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match(), profile("u1")]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.assign_user_to_event(admin_request("POST", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == status
+
+
+def test_remove_deletes_only_the_status_it_decrements(handler, monkeypatch):
+    assignments = FakeAssignments(roster=[], stored={"u1": "CONFIRMED"})
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.remove_user_from_event(admin_request("DELETE", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == 200
+    assert assignments.consistent_reads == [True]
+    (delete, counter, marker), = assignments.transactions
+    assert delete["Delete"]["Key"] == assignment_key("u1", "e1")
+    assert delete["Delete"]["ExpressionAttributeValues"] == {":status": "CONFIRMED"}
+    assert counter["Update"]["ExpressionAttributeNames"] == {"#statusCount": "confirmedCount"}
+    assert counter["Update"]["ExpressionAttributeValues"][":delta"] == -1
+    assert marker["Put"]["Item"]["SK"] == "REMOVED#e1"
+
+
+def test_remove_of_a_changed_assignment_asks_for_a_retry(handler, monkeypatch):
+    assignments = FakeAssignments(roster=[], stored={"u1": "CONFIRMED"})
+    assignments.cancel = ("ConditionalCheckFailed", "None", "None")
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.remove_user_from_event(admin_request("DELETE", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == 409 and assignments.writes == []
+
+
+def test_remove_from_a_deleted_event_still_deletes_the_assignment(handler, monkeypatch):
+    assignments = FakeAssignments(roster=[], stored={"u1": "CONFIRMED"})
+    assignments.cancel = ("None", "ConditionalCheckFailed", "None")
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.remove_user_from_event(admin_request("DELETE", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == 200
+    ([marker], deletes), = assignments.writes
+    assert deletes == [assignment_key("u1", "e1")] and marker["SK"] == "REMOVED#e1"
+
+
+def test_remove_of_a_missing_assignment_is_404(handler, monkeypatch):
+    assignments = FakeAssignments(roster=[], stored={})
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    response = handler.remove_user_from_event(admin_request("DELETE", "/event/assign", {"userId": "u1", "eventId": "e1"}))
+
+    assert response["statusCode"] == 404 and assignments.transactions == []
+
+
+def test_delete_swaps_metadata_for_a_tombstone_then_purges(handler, monkeypatch, invoked):
+    events = FakeEvents([match(attendeeCount=2)])
+    assignments = FakeAssignments(roster=guests(2), stored={})
+    monkeypatch.setattr(handler, "events_repo", events)
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    status, body = delete_event(handler)
+
+    assert status == 200 and body["removedAssignments"] == 2
+    (delete, put), = events.transactions
+    assert delete["Delete"] == {"Key": event_key("e1"), "ConditionExpression": "attribute_exists(PK)"}
+    tombstone = put["Put"]["Item"]
+    assert (tombstone["PK"], tombstone["SK"]) == ("EVENT#e1", "TOMBSTONE") and tombstone["GSI3SK"].endswith("#e1")
+    (markers, deletes), = assignments.writes
+    assert deletes == guests(2) and [m["SK"] for m in markers] == ["REMOVED#e1"] * 2
+    assert invoked == []
+
+
+def test_delete_of_a_large_roster_purges_in_the_background(handler, monkeypatch, invoked):
+    attendees = handler.DELETE_SYNC_LIMIT + 1
+    assignments = FakeAssignments(roster=guests(attendees), stored={})
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match(attendeeCount=attendees)]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    status, body = delete_event(handler)
+
+    assert status == 202 and body["attendeeCount"] == attendees
+    assert invoked == [("purge_event_roster", "e1")]
+    assert assignments.writes == []
+
+
+def test_delete_queues_the_purge_when_writes_stay_throttled(handler, monkeypatch, invoked):
+    assignments = FakeAssignments(roster=guests(2), stored={})
+    assignments.throttled = True
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match(attendeeCount=2)]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    status, _ = delete_event(handler)
+
+    assert status == 202
+    assert invoked == [("purge_event_roster", "e1")]
+
+
+def test_delete_of_a_missing_event_is_404(handler, monkeypatch, invoked):
+    events = FakeEvents()
+    monkeypatch.setattr(handler, "events_repo", events)
+
+    status, _ = delete_event(handler)
+
+    assert status == 404 and events.transactions == []
+
+
+def test_purge_hands_over_before_the_lambda_times_out(handler, monkeypatch, invoked):
+    assignments = FakeAssignments(roster=guests(5), stored={})
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+    monkeypatch.setattr(handler, "MAX_PAGE_SIZE", 2)
+    remaining = iter([handler.PURGE_TIME_RESERVE_MS + 1, handler.PURGE_TIME_RESERVE_MS - 1])
+    context = SimpleNamespace(get_remaining_time_in_millis=lambda: next(remaining))
+
+    assert handler.purge_event_roster("e1", context) == {"deleted": 4, "complete": False}
+    assert [deletes for _, deletes in assignments.writes] == [guests(5)[:2], guests(5)[2:4]]
+    assert invoked == [("purge_event_roster", "e1")]
+
+
+def test_propagation_moves_the_assignments_to_the_new_date(handler, monkeypatch):
+    assignments = FakeAssignments(roster=guests(3), stored={})
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match(date="2026-06-01", title="Derby")]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    assert handler.propagate_event_summary("e1") == {"updated": 3}
+
+    assert [key for key, _ in assignments.updates] == guests(3)
+    _, request = assignments.updates[0]
+    assert request["ConditionExpression"] == "attribute_exists(PK)"
+    values = request["ExpressionAttributeValues"]
+    assert values[":sk"] == user_events_sort_key("2026-06-01", "e1")
+    assert values[":date"] == "2026-06-01" and values[":title"] == "Derby"
+
+
+def test_propagation_does_not_recreate_removed_assignments(handler, monkeypatch):
+    roster = guests(3)
+    assignments = FakeAssignments(roster=roster, stored={})
+    assignments.gone = {roster[1]["PK"]}
+    monkeypatch.setattr(handler, "events_repo", FakeEvents([match()]))
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    assert handler.propagate_event_summary("e1") == {"updated": 2}
+    assert roster[1] not in [key for key, _ in assignments.updates]
+
+
+def test_propagation_of_a_deleted_event_writes_nothing(handler, monkeypatch):
+    assignments = FakeAssignments(roster=guests(2), stored={})
+    monkeypatch.setattr(handler, "events_repo", FakeEvents())
+    monkeypatch.setattr(handler, "assignments_repo", assignments)
+
+    assert handler.propagate_event_summary("e1") == {"updated": 0}
+    assert assignments.updates == []
+
+
+def test_update_refiles_the_event_and_hands_propagation_over(handler, monkeypatch, invoked):
+    events = FakeEvents([match()])
+    monkeypatch.setattr(handler, "events_repo", events)
+
+    response = handler.update_event(admin_request("PUT", body={"eventId": "e1", "date": "2026-06-01T18:00:00Z"}))
+
+    assert response["statusCode"] == 200
+    (key, request), = events.updates
+    assert key == event_key("e1")
+    values = request["ExpressionAttributeValues"]
+    assert (values[":GSI1PK"], values[":GSI1SK"]) == tuple(event_index_keys("2026-06-01T18:00:00Z", "e1").values())
+    assert invoked == [("propagate_event_summary", "e1")]
+
+
+def test_update_of_a_missing_event_hands_nothing_over(handler, monkeypatch, invoked):
+    def missing(key, **request):
+        raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+    events = FakeEvents()
+    monkeypatch.setattr(events, "update", missing)
+    monkeypatch.setattr(handler, "events_repo", events)
+
+    response = handler.update_event(admin_request("PUT", body={"eventId": "e1", "title": "Derby"}))
+
+    assert response["statusCode"] == 404 and invoked == []
@@ -0,0 +1,28 @@
+import pytest
+
+from fieldsets import InvalidFieldsRequest, requested_fields, select
+
+ALLOWED = ("eventId", "title", "date", "location")
+
+
+def request(fields=None):
+    return {"queryStringParameters": {"fields": fields} if fields is not None else None}
+
+
+def test_defaults_to_the_allowlist():
+    assert requested_fields(request(), ALLOWED) == ALLOWED
+
+
+def test_parses_and_deduplicates():
+    assert requested_fields(request(" title,date,,title "), ALLOWED) == ("title", "date")
+
+
+@pytest.mark.parametrize("fields", ["", ",", "title,PK", "createdBy"])
+def test_rejects_empty_and_unknown_fields(fields):
+    with pytest.raises(InvalidFieldsRequest):
+        requested_fields(request(fields), ALLOWED)
+
+
+def test_select_drops_everything_else():
+    items = [{"PK": "EVENT#1", "GSI1SK": "2026-05-17#1", "title": "Derby", "date": "2026-05-17"}, {"PK": "EVENT#2"}]
+    assert select(items, ("title", "date")) == [{"title": "Derby", "date": "2026-05-17"}, {}]
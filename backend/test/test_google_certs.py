@@ -0,0 +1,82 @@
+import jwt
+import pytest
+
+from auth.src.google_certs import GoogleCertCache, parse_max_age
+from .google_certs_stub import GoogleCertsStub
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture
+def stub():
+    stub = GoogleCertsStub(max_age=60).start()
+    yield stub
+    stub.stop()
+
+
+@pytest.fixture
+def cache(stub, clock):
+    return GoogleCertCache(url=stub.url, clock=clock)
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_parse_max_age():
+    assert parse_max_age({"Cache-Control": "public, max-age=19204, must-revalidate"}) == 19204
+    assert parse_max_age({"Cache-Control": "max-age=100", "Age": "40"}) == 60
+    assert parse_max_age({}, default=5) == 5
+
+
+def test_certs_are_fetched_once_within_max_age(stub, cache):
+    for _ in range(3):
+        claims = cache.verify(stub.id_token(), audience="client-id")
+    assert claims["email"] == "user@gmail.com"
+    assert stub.requests == 1
+
+
+def test_certs_are_refetched_after_max_age(stub, cache, clock):
+    cache.verify(stub.id_token(), audience="client-id")
+    clock.now += 61
+    cache.verify(stub.id_token(), audience="client-id")
+    assert stub.requests == 2
+
+
+def test_unknown_kid_forces_refresh(stub, cache):
+    cache.verify(stub.id_token(), audience="client-id")
+    stub.add_key("stub-key-2")
+    cache.verify(stub.id_token(kid="stub-key-2"), audience="client-id")
+    assert stub.requests == 2
+
+
+def test_wrong_audience_is_rejected(stub, cache):
+    with pytest.raises(ValueError):
+        cache.verify(stub.id_token(audience="someone-else"), audience="client-id")
+
+
+def test_wrong_issuer_is_rejected(stub, cache):
+    with pytest.raises(ValueError):
+        cache.verify(stub.id_token(iss="https://evil.example.com"), audience="client-id")
+
+
+def test_missing_audience_is_rejected(stub, cache):
+    with pytest.raises(ValueError):
+        cache.verify(stub.id_token(), audience=None)
+    assert stub.requests == 0
+
+
+def test_unknown_kids_refetch_at_most_once_per_interval(stub, clock):
+    # Shorter than the stub's max-age: only forced refetches happen here
+    cache = GoogleCertCache(url=stub.url, clock=clock, min_refresh_interval=30)
+    junk = jwt.encode({"aud": "client-id"}, stub.keys["stub-key-1"], algorithm="RS256", headers={"kid": "junk"})
+    cache.verify(stub.id_token(), audience="client-id")
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            cache.verify(junk, audience="client-id")
+    assert stub.requests == 2
+
+    clock.now += cache.min_refresh_interval
+    with pytest.raises(ValueError):
+        cache.verify(junk, audience="client-id")
+    assert stub.requests == 3
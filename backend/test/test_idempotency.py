@@ -0,0 +1,154 @@
+import json
+
+import pytest
+from aws_lambda_powertools.utilities.idempotency import BasePersistenceLayer
+from aws_lambda_powertools.utilities.idempotency.exceptions import (
+    IdempotencyItemAlreadyExistsError,
+    IdempotencyItemNotFoundError,
+)
+
+import idempotency
+from idempotency import idempotent_request
+from utils import generate_response
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class MemoryStore(BasePersistenceLayer):
+    """Idempotency records in a dict, with the same put-if-absent contract as DynamoDB."""
+
+    def __init__(self):
+        super().__init__()
+        self.records = {}
+
+    def _get_record(self, idempotency_key):
+        try:
+            return self.records[idempotency_key]
+        except KeyError:
+            raise IdempotencyItemNotFoundError()
+
+    def _put_record(self, data_record):
+        existing = self.records.get(data_record.idempotency_key)
+        if existing and not existing.is_expired:
+            raise IdempotencyItemAlreadyExistsError()
+        self.records[data_record.idempotency_key] = data_record
+
+    def _update_record(self, data_record):
+        self.records[data_record.idempotency_key] = data_record
+
+    def _delete_record(self, data_record):
+        self.records.pop(data_record.idempotency_key, None)
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch):
+    memory = MemoryStore()
+    monkeypatch.setattr(idempotency, "_persistence_store", memory)
+    return memory
+
+
+def request(key="key-1", body=None, principal="admin-1", path="/event"):
+    headers = {"Idempotency-Key": key} if key else {}
+    return {
+        "httpMethod": "POST",
+        "path": path,
+        "headers": headers,
+        "body": json.dumps(body or {"title": "Match"}),
+        "requestContext": {"authorizer": {"principalId": principal}},
+    }
+
+
+def counting_handler(status=201):
+    calls = []
+
+    @idempotent_request
+    def create(event):
+        calls.append(event)
+        return generate_response(status, {"id": len(calls)})
+
+    return create, calls
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_retry_replays_stored_response():
+    create, calls = counting_handler()
+
+    first = create(request())
+    second = create(request())
+
+    assert len(calls) == 1
+    assert json.loads(second["body"]) == json.loads(first["body"]) == {"id": 1}
+    assert second["headers"]["Idempotent-Replayed"] == "true"
+    assert "Idempotent-Replayed" not in first["headers"]
+
+
+def test_requests_without_key_always_run():
+    create, calls = counting_handler()
+
+    create(request(key=None))
+    create(request(key=None))
+
+    assert len(calls) == 2
+
+
+def test_keys_are_scoped_to_principal_and_path():
+    create, calls = counting_handler()
+
+    create(request())
+    create(request(principal="admin-2"))
+    create(request(path="/event/assign"))
+
+    assert len(calls) == 3
+
+
+def test_same_key_different_body_is_rejected():
+    create, calls = counting_handler()
+
+    create(request(body={"title": "Match"}))
+    response = create(request(body={"title": "Other match"}))
+
+    assert response["statusCode"] == 422
+    assert len(calls) == 1
+
+
+def test_server_errors_are_not_stored(store):
+    create, calls = counting_handler(status=500)
+
+    assert create(request())["statusCode"] == 500
+    assert create(request())["statusCode"] == 500
+
+    assert len(calls) == 2
+    assert store.records == {}
+
+
+def test_client_errors_are_stored():
+    create, calls = counting_handler(status=409)
+
+    create(request())
+    response = create(request())
+
+    assert response["statusCode"] == 409
+    assert len(calls) == 1
+
+
+def test_responses_too_large_to_store_are_returned_not_stored(store):
+    calls = []
+
+    @idempotent_request
+    def reconcile(event):
+        calls.append(event)
+        # 10000 per-user results: about 800 KB, over DynamoDB's 400 KB item limit
+        results = [{"userId": f"{i:036d}", "result": "unchanged"} for i in range(10000)]
+        return generate_response(200, {"results": results})
+
+    first = reconcile(request())
+    assert first["statusCode"] == 200
+    assert len(first["body"]) > 400 * 1024
+    assert store.records == {}
+
+    # Not left in progress: the retry runs again instead of getting 409
+    assert reconcile(request())["statusCode"] == 200
+    assert len(calls) == 2
@@ -0,0 +1,65 @@
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+
+import ids
+from ids import new_id, parse_id, id_timestamp, min_id_at, creation_sort_key
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_new_ids_are_uuid7_and_strictly_increasing():
+    values = [new_id() for _ in range(5000)]
+
+    assert all(uuid.UUID(v).version == 7 for v in values)
+    assert values == sorted(values)
+    assert len(set(values)) == len(values)
+
+
+def test_ids_stay_ordered_when_the_clock_goes_back(monkeypatch):
+    first = new_id()
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 0)
+
+    assert new_id() > first
+
+
+def test_sequence_overflow_borrows_next_millisecond(monkeypatch):
+    monkeypatch.setattr(ids.time, "time_ns", lambda: 1_700_000_000_000 * 1_000_000)
+    monkeypatch.setattr(ids, "_last_ms", 0)
+    values = [new_id() for _ in range(ids._SEQUENCE_MAX + 10)]
+
+    assert values == sorted(values)
+    assert id_timestamp(values[-1]) > id_timestamp(values[0])
+
+
+def test_both_formats_are_accepted():
+    legacy = str(uuid.uuid4())
+    assert parse_id(legacy).version == 4
+    assert parse_id(new_id()).version == 7
+    assert id_timestamp(legacy) is None
+
+    for bad in ["", "EVENT#1", None, str(uuid.uuid1())]:
+        with pytest.raises(ValueError):
+            parse_id(bad)
+
+
+def test_id_timestamp_and_range_bound():
+    before = datetime.now(timezone.utc)
+    value = new_id()
+
+    assert abs((id_timestamp(value) - before).total_seconds()) < 1
+    assert min_id_at(before.replace(microsecond=0)) <= value
+
+
+def test_legacy_ids_get_creation_ordered_keys():
+    old, newer = str(uuid.uuid4()), str(uuid.uuid4())
+    old_key = creation_sort_key(old, "2025-01-01T10:00:00")
+    newer_key = creation_sort_key(newer, "2025-06-01T10:00:00")
+
+    assert old_key < newer_key < new_id()
+    assert creation_sort_key(old, "2025-01-01T10:00:00") == old_key
+    assert parse_id(old_key).version == 7
+    with pytest.raises(ValueError):
+        creation_sort_key(old)
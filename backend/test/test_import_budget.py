@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+COMMON = os.path.join(BACKEND, "src", "common", "python")
+
+# Cold `import handler` budget per function, in ms of cumulative import
+# time (-X importtime), including the AWS clients built at import.
+# Roughly twice what a laptop measures: room for a slower machine, not
+# for a new eager dependency.
+BUDGETS_MS = {
+    "auth": 500,
+    "authorizer": 800,
+    "events": 1000,
+    "private": 1000,
+    "public": 600,
+    "guests": 600,
+}
+
+# Modules a cold import must not load: they belong to other routes, or
+# to tracing, which is off
+NOT_AT_IMPORT = {
+    "auth": ("aws_xray_sdk", "google.auth", "src.loging_google", "src.register", "idempotency"),
+    "authorizer": ("aws_xray_sdk", "google.auth"),
+    "events": ("aws_xray_sdk", "jwt", "bcrypt"),
+    "private": ("aws_xray_sdk", "jwt", "bcrypt"),
+    "public": ("aws_xray_sdk", "jwt", "bcrypt"),
+    "guests": ("aws_xray_sdk", "jwt", "bcrypt"),
+}
+
+
+def parse_importtime(output):
+    """{module: cumulative µs} from `python -X importtime` stderr."""
+    times = {}
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+def cold_import(function):
+    """Import times of a fresh interpreter importing the function's handler, as on Lambda."""
+    env = {
+        **os.environ,
+        "PYTHONPATH": COMMON,
+        "LAMBDA_TASK_ROOT": os.path.join(BACKEND, "src", function),
+        "POWERTOOLS_TRACE_DISABLED": "true",
+        "AWS_DEFAULT_REGION": "eu-west-1",
+        "DB_TABLE": "import-budget-test",
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import handler"],
+        cwd=os.path.join(BACKEND, "src", function),
+        env=env, capture_output=True, text=True, timeout=60,
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+    return parse_importtime(result.stderr)
+
+
+def test_parse_importtime():
+    output = (
+        "import time: self [us] | cumulative | imported package\n"
+        "import time:       120 |        120 |   _io\n"
+        "import time:      3000 |      45000 | handler\n"
+    )
+    assert parse_importtime(output) == {"_io": 120, "handler": 45000}
+
+
+@pytest.mark.parametrize("function", sorted(BUDGETS_MS))
+def test_cold_import_stays_in_budget(function):
+    # Best of two: the first run may also be warming the disk cache
+    runs = [cold_import(function) for _ in range(2)]
+    loaded = runs[0]
+
+    eager = [m for m in NOT_AT_IMPORT[function] if m in loaded]
+    assert not eager, f"{function} imports {eager} at cold start"
+
+    took_ms = min(run["handler"] for run in runs) / 1000
+    assert took_ms <= BUDGETS_MS[function], f"{function} cold import took {took_ms:.0f} ms"
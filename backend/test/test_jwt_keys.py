@@ -0,0 +1,56 @@
+import jwt
+import pytest
+
+import jwt_keys
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture(params=["EdDSA", "RS256"])
+def algorithm(request):
+    return request.param
+
+
+@pytest.fixture
+def signing_key(monkeypatch, algorithm):
+    """A SigningKey whose secret is served from memory instead of Secrets Manager."""
+    secrets = {}
+    monkeypatch.setattr(jwt_keys.secret_cache, "get_secret", lambda name: secrets[name])
+
+    def _make(kid):
+        secret, public_jwk = jwt_keys.generate_key_pair(kid, algorithm)
+        secrets["signing-key"] = secret
+        return jwt_keys.SigningKey("signing-key", algorithm), public_jwk
+    return _make
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_token_is_verified_by_kid(signing_key):
+    key, public_jwk = signing_key("2026-10")
+    token = key.sign({"id": "u1"})
+
+    assert jwt.get_unverified_header(token)["kid"] == "2026-10"
+    assert jwt_keys.KeyRing({"keys": [public_jwk]}).verify(token) == {"id": "u1"}
+
+
+def test_old_and_new_keys_verify_during_rotation(signing_key):
+    key, old_jwk = signing_key("old")
+    old_token = key.sign({"id": "u1"})
+    key, new_jwk = signing_key("new")
+    new_token = key.sign({"id": "u1"})
+
+    ring = jwt_keys.KeyRing({"keys": [old_jwk, new_jwk]})
+    assert ring.verify(old_token)["id"] == "u1"
+    assert ring.verify(new_token)["id"] == "u1"
+
+
+def test_unknown_kid_is_rejected(signing_key):
+    key, _ = signing_key("retired")
+    token = key.sign({"id": "u1"})
+    _, other_jwk = jwt_keys.generate_key_pair("current", "EdDSA")
+
+    with pytest.raises(jwt.InvalidTokenError):
+        jwt_keys.KeyRing({"keys": [other_jwk]}).verify(token)
@@ -0,0 +1,136 @@
+import os
+import sys
+import types
+
+import pytest
+from botocore.exceptions import ClientError
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "dynamo_migrations"))
+
+from runner import run, Checkpoint, TokenBucket, load_migration
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeTable:
+    """Segmented Scan (by key hash) and conditional update_item over a dict."""
+
+    def __init__(self, items, page_size=3, fail_after=None):
+        self.items = {(i["PK"], i["SK"]): dict(i) for i in items}
+        self.page_size = page_size
+        self.fail_after = fail_after
+        self.scans = 0
+        self.writes = 0
+
+    def scan(self, Segment, TotalSegments, ExclusiveStartKey=None, **kwargs):
+        self.scans += 1
+        if self.fail_after is not None and self.scans > self.fail_after:
+            raise RuntimeError("connection lost")
+        keys = sorted(k for k in self.items if hash(k) % TotalSegments == Segment)
+        if ExclusiveStartKey:
+            keys = [k for k in keys if k > (ExclusiveStartKey["PK"], ExclusiveStartKey["SK"])]
+        page = keys[:self.page_size]
+        resp = {"Items": [dict(self.items[k]) for k in page], "ScannedCount": len(page)}
+        if len(keys) > self.page_size:
+            resp["LastEvaluatedKey"] = {"PK": page[-1][0], "SK": page[-1][1]}
+        return resp
+
+    def update_item(self, Key, UpdateExpression, ConditionExpression, ExpressionAttributeValues, **kwargs):
+        item = self.items[(Key["PK"], Key["SK"])]
+        if item.get("value") != ExpressionAttributeValues[":old"]:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+        self.writes += 1
+        item["value"] = ExpressionAttributeValues[":new"]
+
+
+def double(ctx, item):
+    if item["value"] % 2:
+        return "skipped"
+    updated = ctx.update_item(
+        Key={"PK": item["PK"], "SK": item["SK"]},
+        UpdateExpression="SET #value = :new",
+        ConditionExpression="#value = :old",
+        ExpressionAttributeValues={":new": item["value"] * 2 + 1, ":old": item["value"]},
+    )
+    return "doubled" if updated else "conflict"
+
+
+DOUBLE = types.SimpleNamespace(apply=double)
+
+
+def items(n):
+    return [{"PK": f"ITEM#{i:03d}", "SK": "DATA", "value": i * 2} for i in range(n)]
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_every_item_is_migrated_once_across_segments():
+    table = FakeTable(items(50))
+    stats = run(table, DOUBLE, segments=4, log=lambda msg: None)
+
+    assert stats["doubled"] == 50
+    assert stats["scanned"] == 50
+    assert all(i["value"] % 2 for i in table.items.values())
+
+
+def test_dry_run_writes_nothing():
+    table = FakeTable(items(10))
+    stats = run(table, DOUBLE, segments=2, dry_run=True, log=lambda msg: None)
+
+    assert stats["doubled"] == 10
+    assert table.writes == 0
+
+
+def test_resume_from_checkpoint(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    table = FakeTable(items(40), fail_after=5)
+    with pytest.raises(RuntimeError):
+        run(table, DOUBLE, segments=2, checkpoint=Checkpoint(path, 2), log=lambda msg: None)
+    done_before = table.writes
+    assert 0 < done_before < 40
+
+    table.fail_after = None
+    stats = run(table, DOUBLE, segments=2, checkpoint=Checkpoint(path, 2), log=lambda msg: None)
+
+    assert all(i["value"] % 2 for i in table.items.values())
+    # Finished pages are not scanned again
+    assert stats["doubled"] == 40
+    assert table.writes == 40
+
+
+def test_checkpoint_rejects_other_segment_count(tmp_path):
+    path = str(tmp_path / "checkpoint.json")
+    Checkpoint(path, 2).save(0, None, {})
+    with pytest.raises(ValueError):
+        Checkpoint(path, 4)
+
+
+def test_token_bucket_limits_rate():
+    now = [0.0]
+    bucket = TokenBucket(10, clock=lambda: now[0], sleep=lambda s: now.__setitem__(0, now[0] + s))
+
+    for _ in range(30):
+        bucket.acquire()
+
+    # 10 from the initial burst, then 10 per second
+    assert now[0] == pytest.approx(2.0)
+
+
+def test_event_date_migration_normalizes_keys():
+    migration = load_migration("0005_normalize_event_dates")
+    writes = []
+    ctx = types.SimpleNamespace(update_item=lambda **kw: writes.append(kw) or True)
+
+    event = {"PK": "EVENT#e1", "SK": "METADATA", "eventId": "e1", "date": "2026-05-17T20:00+02:00"}
+    assert migration.apply(ctx, event) == "normalized"
+    values = writes[0]["ExpressionAttributeValues"]
+    assert values[":new"] == "2026-05-17T18:00:00Z"
+    assert values[":GSI1SK"] == "2026-05-17T18:00:00Z#e1"
+    assert values[":GSI1PK"].startswith("EVENTS#2026-05#")
+
+    assignment = {"PK": "USER#u1", "SK": "EVENT#e1", "eventId": "e1", "date": "2026-05-17T18:00:00Z",
+                  "GSI2SK": "2026-05-17T18:00:00Z#e1"}
+    assert migration.apply(ctx, assignment) == "unchanged"
+    assert migration.apply(ctx, {**assignment, "date": "not a date"}) == "unparseable"
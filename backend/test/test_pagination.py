@@ -0,0 +1,58 @@
+import pytest
+
+import pagination
+from pagination import encode_cursor, decode_cursor, page_params, InvalidPageRequest
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture(autouse=True)
+def signing_secret(monkeypatch):
+    monkeypatch.setattr(pagination.secret_cache, "get_secret", lambda name: "test-secret")
+
+
+LAST_KEY = {"PK": "USER#u1", "SK": "EVENT#e9"}
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_cursor_round_trip():
+    cursor = encode_cursor(LAST_KEY, "events:USER:u1")
+    assert decode_cursor(cursor, "events:USER:u1") == LAST_KEY
+
+
+def test_no_last_key_means_no_cursor():
+    assert encode_cursor(None, "scope") is None
+    assert decode_cursor(None, "scope") is None
+
+
+def test_tampered_cursor_is_rejected():
+    cursor = encode_cursor(LAST_KEY, "events:USER:u1")
+    forged = encode_cursor({"PK": "USER#u2", "SK": "EVENT#e1"}, "events:USER:u1").split(".")[0]
+    with pytest.raises(InvalidPageRequest):
+        decode_cursor(f"{forged}.{cursor.split('.')[1]}", "events:USER:u1")
+
+
+def test_cursor_is_bound_to_its_scope():
+    cursor = encode_cursor(LAST_KEY, "events:USER:u1")
+    with pytest.raises(InvalidPageRequest):
+        decode_cursor(cursor, "events:USER:u2")
+
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(InvalidPageRequest):
+        decode_cursor("not-a-cursor", "scope")
+
+
+def test_page_params():
+    cursor = encode_cursor(LAST_KEY, "s")
+    assert page_params({"queryStringParameters": {"limit": "10", "cursor": cursor}}, "s") == (10, LAST_KEY)
+    assert page_params({"queryStringParameters": None}, "s") == (pagination.DEFAULT_PAGE_SIZE, None)
+
+
+@pytest.mark.parametrize("limit", ["0", "100000", "ten"])
+def test_invalid_limits_are_rejected(limit):
+    with pytest.raises(InvalidPageRequest):
+        page_params({"queryStringParameters": {"limit": limit}}, "s")
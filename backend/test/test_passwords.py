@@ -0,0 +1,61 @@
+import hashlib
+
+import pytest
+
+import passwords
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture(autouse=True)
+def fast_bcrypt(monkeypatch):
+    """Keep the default hasher cheap for tests."""
+    monkeypatch.setattr(passwords, "_default_hasher", passwords.BcryptHasher(rounds=4))
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_new_hashes_verify_without_rehash():
+    hashed = passwords.hash_password("s3cret")
+    assert hashed.startswith("$2b$04$")
+    assert passwords.verify_password("s3cret", hashed) == (True, None)
+    assert passwords.verify_password("wrong", hashed) == (False, None)
+
+
+def test_legacy_sha256_hash_is_upgraded():
+    legacy = hashlib.sha256(b"s3cret").hexdigest()
+    valid, new_hash = passwords.verify_password("s3cret", legacy)
+    assert valid
+    assert new_hash.startswith("$2b$04$")
+    assert passwords.verify_password("s3cret", new_hash) == (True, None)
+
+
+def test_wrong_password_on_legacy_hash_is_not_upgraded():
+    legacy = hashlib.sha256(b"s3cret").hexdigest()
+    assert passwords.verify_password("wrong", legacy) == (False, None)
+
+
+def test_legacy_password_longer_than_bcrypt_accepts_is_not_upgraded():
+    password = "a" * 80
+    legacy = hashlib.sha256(password.encode()).hexdigest()
+    assert passwords.verify_password(password, legacy) == (True, None)
+
+
+def test_outdated_work_factor_is_upgraded():
+    old = passwords.BcryptHasher(rounds=5).hash("s3cret")
+    valid, new_hash = passwords.verify_password("s3cret", old)
+    assert valid
+    assert new_hash.startswith("$2b$04$")
+
+
+def test_unknown_formats_are_rejected():
+    assert passwords.verify_password("s3cret", "plaintext") == (False, None)
+    assert passwords.verify_password("s3cret", None) == (False, None)
+
+
+def test_calibrate_reports_rounds_within_target():
+    result = passwords.calibrate(target_ms=10_000, samples=1, min_rounds=4, max_rounds=5)
+    assert result["recommended_rounds"] == 5
+    assert [r["rounds"] for r in result["results"]] == [4, 5]
@@ -0,0 +1,152 @@
+import copy
+from types import SimpleNamespace
+
+import pytest
+from botocore.exceptions import ClientError
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeTable:
+    """REFRESH#<familyId> / FAMILY items in memory, with the conditions rotate relies on."""
+
+    def __init__(self):
+        self.items = {}
+        self.updates = 0
+
+    def put_item(self, Item):
+        self.items[Item["PK"]] = copy.deepcopy(Item)
+
+    def get_item(self, Key, **kwargs):
+        item = self.items.get(Key["PK"])
+        return {"Item": copy.deepcopy(item)} if item else {}
+
+    def update_item(self, Key, UpdateExpression, ExpressionAttributeValues, ConditionExpression=None, **kwargs):
+        self.updates += 1
+        item = self.items[Key["PK"]]
+        values = ExpressionAttributeValues
+        if ConditionExpression:
+            # rotate: currentJti = :old AND attribute_not_exists(revokedAt)
+            if item.get("currentJti") != values[":old"] or "revokedAt" in item:
+                raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "UpdateItem")
+            item.update(currentJti=values[":new"], previousJti=values[":old"], rotatedAt=values[":now"],
+                        lastIssued=values[":pair"], ttl=values[":ttl"])
+        else:
+            # revoke_family
+            item.update(revokedAt=values[":now"], revokeReason=values[":reason"])
+            item.pop("lastIssued", None)
+
+
+class FakeRevocationList:
+    def __init__(self):
+        self.revoked = set()
+
+    def is_revoked(self, family_id):
+        return family_id in self.revoked
+
+    def add(self, family_id):
+        self.revoked.add(family_id)
+
+
+@pytest.fixture(scope="module")
+def module(import_configured):
+    """src.refresh_store, imported with a table name and region it can build its clients with."""
+    return import_configured("auth.src.refresh_store", db_table="auth-test")
+
+
+@pytest.fixture
+def fakes(module, monkeypatch, clock):
+    fakes = SimpleNamespace(table=FakeTable(), revocations=FakeRevocationList(), clock=clock)
+    monkeypatch.setattr(module, "table", fakes.table)
+    monkeypatch.setattr(module, "time", fakes.clock)
+    monkeypatch.setattr(module, "get_revocation_list", lambda: fakes.revocations)
+    # Tokens that name their family and jti, so tests can read them back as claims
+    monkeypatch.setattr(module, "generate_access_token", lambda *a, family_id=None: f"access-{family_id}")
+    monkeypatch.setattr(module, "generate_refresh_token", lambda *a, family_id=None, token_id=None: f"refresh-{token_id}")
+    return fakes
+
+
+def claims_of(pair):
+    """Claims of the refresh token of a pair from start_family/rotate."""
+    return {
+        "id": "u1", "email": "u1@example.com", "role": "USER",
+        "fid": pair["access_token"].removeprefix("access-"),
+        "jti": pair["refresh_token"].removeprefix("refresh-"),
+    }
+
+
+def login(module):
+    return module.start_family("u1", "u1@example.com", "USER")
+
+
+def refresh(module, pair):
+    """Present the refresh token of pair, as refresh_access_token does."""
+    return module.rotate(claims_of(pair), pair["refresh_token"])
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_rotation_moves_the_family_to_the_new_token(module, fakes):
+    first = login(module)
+    second = refresh(module, first)
+
+    assert claims_of(second)["fid"] == claims_of(first)["fid"]
+    family = fakes.table.items[f"REFRESH#{claims_of(first)['fid']}"]
+    assert family["currentJti"] == claims_of(second)["jti"]
+    assert family["previousJti"] == claims_of(first)["jti"]
+
+
+def test_replay_within_grace_window_returns_the_last_pair(module, fakes):
+    first = login(module)
+    issued = refresh(module, first)
+
+    fakes.clock.now += module.REFRESH_REUSE_GRACE_SECONDS
+    assert refresh(module, first) == issued
+    assert "revokedAt" not in fakes.table.items[f"REFRESH#{claims_of(first)['fid']}"]
+
+
+def test_last_pair_is_not_stored_in_the_clear(module, fakes):
+    first = login(module)
+    issued = refresh(module, first)
+
+    family = fakes.table.items[f"REFRESH#{claims_of(first)['fid']}"]
+    assert issued["refresh_token"].encode() not in family["lastIssued"]
+    # Knowing the old jti from the item is not enough to read it back
+    with pytest.raises(module.RefreshTokenRevoked):
+        module.rotate(claims_of(first), "forged")
+
+
+def test_reuse_after_grace_window_revokes_the_family(module, fakes):
+    first = login(module)
+    second = refresh(module, first)
+
+    fakes.clock.now += module.REFRESH_REUSE_GRACE_SECONDS + 1
+    with pytest.raises(module.RefreshTokenRevoked):
+        refresh(module, first)
+
+    family = fakes.table.items[f"REFRESH#{claims_of(first)['fid']}"]
+    assert family["revokeReason"] == "reuse" and "lastIssued" not in family
+    assert fakes.revocations.is_revoked(claims_of(first)["fid"])
+    # The legitimate holder's token dies with the family
+    with pytest.raises(module.RefreshTokenRevoked):
+        refresh(module, second)
+
+
+def test_revoked_family_is_rejected_without_a_write(module, fakes):
+    first = login(module)
+    fakes.revocations.add(claims_of(first)["fid"])
+
+    with pytest.raises(module.RefreshTokenRevoked):
+        refresh(module, first)
+    assert fakes.table.updates == 0
+
+
+def test_token_without_family_starts_one(module, fakes):
+    legacy = {"id": "u1", "email": "u1@example.com", "role": "USER", "jti": "old"}
+    started = claims_of(module.rotate(legacy, "legacy-token"))
+
+    family = fakes.table.items[f"REFRESH#{started['fid']}"]
+    assert family["userId"] == "u1" and family["currentJti"] == started["jti"]
+    assert fakes.table.updates == 0
@@ -0,0 +1,166 @@
+import pytest
+
+from dynamo_batch import UnprocessedItemsError
+from dynamo_codec import decode_item, encode_item
+from repositories import (
+    AssignmentRepository,
+    EventRepository,
+    UserRepository,
+    assignment_key,
+    change_keys,
+    event_index_keys,
+    event_key,
+    event_shard,
+    projection,
+)
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeClient:
+    """Low-level client over AttributeValue items; records every request."""
+
+    def __init__(self, items=(), pages=None):
+        self.items = {(i["PK"], i["SK"]): encode_item(i) for i in items}
+        # Query responses served in order, as native (items, last_key) pairs
+        self.pages = list(pages or [])
+        self.calls = []
+
+    def get_item(self, **request):
+        self.calls.append(("get_item", request))
+        key = decode_item(request["Key"])
+        item = self.items.get((key["PK"], key["SK"]))
+        return {"Item": item} if item else {}
+
+    def batch_get_item(self, RequestItems):
+        (table_name, request), = RequestItems.items()
+        self.calls.append(("batch_get_item", request))
+        keys = [decode_item(k) for k in request["Keys"]]
+        found = [self.items[(k["PK"], k["SK"])] for k in keys if (k["PK"], k["SK"]) in self.items]
+        return {"Responses": {table_name: found}}
+
+    def update_item(self, **request):
+        self.calls.append(("update_item", request))
+        return {"Attributes": {"attendeeCount": {"N": "3"}}} if request.get("ReturnValues") else {}
+
+    def transact_write_items(self, TransactItems):
+        self.calls.append(("transact_write_items", TransactItems))
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        self.calls.append(("batch_write_item", requests))
+        # Throttles every delete
+        unprocessed = [r for r in requests if "DeleteRequest" in r]
+        return {"UnprocessedItems": {table_name: unprocessed}} if unprocessed else {}
+
+    def query(self, **request):
+        self.calls.append(("query", request))
+        items, last_key = self.pages.pop(0)
+        resp = {"Items": [encode_item(i) for i in items]}
+        if last_key:
+            resp["LastEvaluatedKey"] = encode_item(last_key)
+        return resp
+
+
+def event(i, **attributes):
+    return {**event_key(str(i)), "eventId": str(i), "attendeeCount": i, **attributes}
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_event_keys_share_one_stable_shard():
+    event_id = "00000000-0000-4000-8000-000000000007"
+    shard = event_shard(event_id, shards=4)
+    assert shard == event_shard(event_id, shards=4) and 0 <= shard < 4
+
+    assert event_index_keys("2026-05-17", event_id, shards=4) == {
+        "GSI1PK": f"EVENTS#2026-05#{shard}", "GSI1SK": f"2026-05-17#{event_id}",
+    }
+    assert change_keys(event_id, "t1", shards=4) == {
+        "updatedAt": "t1", "GSI3PK": f"CHANGES#EVENT#{shard}", "GSI3SK": f"t1#{event_id}",
+    }
+
+
+def test_projection_uses_placeholders_for_every_name():
+    expression, names = projection(["status", "email"], always=("PK", "SK"))
+    assert expression == "#p0, #p1, #p2, #p3"
+    assert names == {"#p0": "PK", "#p1": "SK", "#p2": "status", "#p3": "email"}
+    assert projection(None) == (None, None)
+
+
+def test_get_decodes_to_native_types():
+    repo = EventRepository(FakeClient([event(7, title="Derby")]), "t")
+    item = repo.get("7")
+    assert item["attendeeCount"] == 7 and type(item["attendeeCount"]) is int
+    assert repo.get("missing") is None
+
+
+def test_get_many_keeps_order_and_projects_keys():
+    client = FakeClient([event(1), event(2), event(3)])
+    items = EventRepository(client, "t").get_many(["3", "missing", "1"], fields=["attendeeCount"])
+    assert [i["eventId"] for i in items] == ["3", "1"]
+    (_, request), = client.calls
+    assert set(request["ExpressionAttributeNames"].values()) == {"PK", "SK", "attendeeCount"}
+
+
+def test_assignments_are_read_consistently_on_request():
+    client = FakeClient([{**assignment_key("u1", "e"), "userId": "u1", "status": "CONFIRMED"}])
+    found = AssignmentRepository(client, "t").get_many("e", ["u1", "u2"], fields=("userId",), consistent=True)
+    assert [a["userId"] for a in found] == ["u1"]
+    assert client.calls[0][1]["ConsistentRead"] is True
+
+
+def test_query_round_trips_cursor_keys():
+    last_key = {"PK": "USER#u", "SK": "EVENT#1", "GSI2PK": "USER#u", "GSI2SK": "2026-05-17#1"}
+    client = FakeClient(pages=[([{"eventId": "1"}], last_key)])
+    items, position = AssignmentRepository(client, "t").for_user("u", 10, start_key=last_key, newest_first=True)
+
+    assert items == [{"eventId": "1"}] and position == last_key
+    (_, request), = client.calls
+    assert request["ExclusiveStartKey"] == encode_item(last_key)
+    assert request["ExpressionAttributeValues"] == {":pk": {"S": "USER#u"}}
+    assert request["ScanIndexForward"] is False
+
+
+def test_event_ids_for_user_reads_every_page():
+    client = FakeClient(pages=[
+        ([assignment_key("u", "1"), assignment_key("u", "2")], assignment_key("u", "2")),
+        ([assignment_key("u", "3")], None),
+    ])
+    assert AssignmentRepository(client, "t").event_ids_for_user("u") == ["1", "2", "3"]
+    assert len(client.calls) == 2
+
+
+def test_login_read_is_consistent():
+    login = {"PK": "EMAIL#a@b.c", "SK": "EMAIL", "userId": "u"}
+    client = FakeClient([login])
+    assert UserRepository(client, "t").get_login({"PK": "EMAIL#a@b.c", "SK": "EMAIL"}) == login
+    assert client.calls[0][1]["ConsistentRead"] is True
+
+
+def test_writes_encode_native_values_for_the_table():
+    client = FakeClient()
+    repo = EventRepository(client, "t")
+
+    assert repo.update(event_key("1"), UpdateExpression="ADD attendeeCount :d",
+                       ExpressionAttributeValues={":d": 1}, ReturnValues="UPDATED_NEW") == {"attendeeCount": 3}
+    repo.transact_write([{"Put": {"Item": event(2), "ConditionExpression": "attribute_not_exists(PK)"}}])
+
+    (_, update), (_, (action,)) = client.calls
+    assert update["TableName"] == "t" and update["Key"] == encode_item(event_key("1"))
+    assert update["ExpressionAttributeValues"] == {":d": {"N": "1"}}
+    assert action["Put"]["TableName"] == "t" and action["Put"]["Item"] == encode_item(event(2))
+
+
+def test_write_many_reports_unprocessed_requests_decoded(monkeypatch):
+    monkeypatch.setattr("dynamo_batch.BATCH_MAX_RETRIES", 0)
+    client = FakeClient()
+
+    with pytest.raises(UnprocessedItemsError) as raised:
+        AssignmentRepository(client, "t").write_many(puts=[event(1)], deletes=[{**assignment_key("u", "2"), "status": "X"}])
+
+    (_, requests), = client.calls
+    assert requests[1] == {"DeleteRequest": {"Key": encode_item(assignment_key("u", "2"))}}
+    assert raised.value.unprocessed == [{"DeleteRequest": {"Key": assignment_key("u", "2")}}]
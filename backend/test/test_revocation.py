@@ -0,0 +1,75 @@
+from revocation import BloomFilter, RevocationList, REVOKED_PARTITION
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeTable:
+    """Serves the REVOKED#REFRESH partition and family items from memory."""
+
+    def __init__(self, revoked):
+        self.revoked = revoked
+        self.queries = 0
+        self.gets = 0
+
+    def query(self, **kwargs):
+        self.queries += 1
+        return {"Items": [{"GSI1PK": REVOKED_PARTITION, "GSI1SK": fid} for fid in self.revoked]}
+
+    def get_item(self, Key, **kwargs):
+        self.gets += 1
+        family_id = Key["PK"].split("#", 1)[1]
+        if family_id in self.revoked:
+            return {"Item": {"revokedAt": 1}}
+        return {}
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(bits=4096, hashes=5)
+    values = [f"family-{i}" for i in range(200)]
+    for v in values:
+        bloom.add(v)
+    assert all(v in bloom for v in values)
+
+
+def test_bloom_filter_false_positive_rate_is_low():
+    bloom = BloomFilter(bits=1 << 16, hashes=7)
+    for i in range(1000):
+        bloom.add(f"revoked-{i}")
+    false_positives = sum(f"active-{i}" in bloom for i in range(10000))
+    assert false_positives < 50
+
+
+def test_active_family_needs_no_item_read(clock):
+    table = FakeTable(revoked={"bad"})
+    revocations = RevocationList(table=table, refresh_interval=60, clock=clock)
+
+    assert revocations.is_revoked("good") is False
+    assert revocations.is_revoked("bad") is True
+    assert table.gets == 1
+    assert table.queries == 1
+
+
+def test_filter_reloads_after_interval(clock):
+    table = FakeTable(revoked=set())
+    revocations = RevocationList(table=table, refresh_interval=60, clock=clock)
+    assert revocations.is_revoked("fam") is False
+
+    table.revoked.add("fam")
+    assert revocations.is_revoked("fam") is False
+    clock.now += 61
+    assert revocations.is_revoked("fam") is True
+    assert table.queries == 2
+
+
+def test_local_revocations_apply_immediately(clock):
+    table = FakeTable(revoked=set())
+    revocations = RevocationList(table=table, refresh_interval=60, clock=clock)
+    revocations.is_revoked("fam")
+
+    table.revoked.add("fam")
+    revocations.add("fam")
+    assert revocations.is_revoked("fam") is True
@@ -0,0 +1,125 @@
+import pytest
+from botocore.exceptions import ClientError
+
+from secret_cache import SecretCache
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeSecretsManager:
+    """Minimal stand-in for the secretsmanager client."""
+
+    def __init__(self):
+        self.versions = {"AWSCURRENT": ("v1", "secret-1")}
+        self.calls = 0
+        self.stages = []
+        self.error = None
+
+    def get_secret_value(self, SecretId, VersionStage):
+        self.calls += 1
+        self.stages.append(VersionStage)
+        if self.error:
+            raise ClientError({"Error": {"Code": self.error}}, "GetSecretValue")
+        if VersionStage not in self.versions:
+            raise ClientError({"Error": {"Code": "ResourceNotFoundException"}}, "GetSecretValue")
+        version_id, value = self.versions[VersionStage]
+        return {"VersionId": version_id, "SecretString": value}
+
+
+@pytest.fixture
+def client():
+    return FakeSecretsManager()
+
+
+@pytest.fixture
+def cache(client, clock):
+    return SecretCache(client=client, ttl=10, max_stale=100, min_refresh_interval=5, clock=clock)
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_fresh_values_are_served_from_memory(cache, client):
+    assert cache.get("jwt") == "secret-1"
+    assert cache.get("jwt") == "secret-1"
+    assert client.calls == 1
+
+
+def test_expired_value_is_refetched(cache, client, clock):
+    cache.get("jwt")
+    clock.now += 200
+    client.versions["AWSCURRENT"] = ("v2", "secret-2")
+    assert cache.get("jwt") == "secret-2"
+    assert client.calls == 2
+
+
+def test_throttling_falls_back_to_stale_value(cache, client, clock):
+    cache.get("jwt")
+    clock.now += 200
+    client.error = "ThrottlingException"
+    assert cache.get("jwt") == "secret-1"
+
+
+def test_other_errors_are_raised(cache, client, clock):
+    cache.get("jwt")
+    clock.now += 200
+    client.error = "AccessDeniedException"
+    with pytest.raises(ClientError):
+        cache.get("jwt")
+
+
+def test_refresh_if_rotated_is_rate_limited(cache, client, clock):
+    cache.get("jwt")
+    client.versions["AWSCURRENT"] = ("v2", "secret-2")
+    assert cache.refresh_if_rotated("jwt") is False
+    clock.now += 6
+    assert cache.refresh_if_rotated("jwt") is True
+    assert cache.get("jwt") == "secret-2"
+
+
+def test_call_with_rotation_accepts_previous_version(cache, client):
+    client.versions = {"AWSCURRENT": ("v2", "secret-2"), "AWSPREVIOUS": ("v1", "secret-1")}
+    cache.get("jwt")
+
+    def verify(secret):
+        if secret != "secret-1":
+            raise ValueError("bad signature")
+        return "ok"
+
+    # signed before the rotation: current fails, AWSPREVIOUS verifies
+    assert cache.call_with_rotation("jwt", verify, retry_on=ValueError) == "ok"
+
+
+def test_call_with_rotation_reraises_without_previous_version(cache):
+    def verify(secret):
+        raise ValueError("bad signature")
+
+    with pytest.raises(ValueError):
+        cache.call_with_rotation("jwt", verify, retry_on=ValueError)
+
+
+def test_missing_previous_version_is_remembered(cache, client, clock):
+    def verify(secret):
+        raise ValueError("bad signature")
+
+    for _ in range(5):
+        with pytest.raises(ValueError):
+            cache.call_with_rotation("jwt", verify, retry_on=ValueError)
+    assert client.stages == ["AWSCURRENT", "AWSPREVIOUS"]
+
+    # Looked up again once the interval has passed
+    clock.now += 6
+    client.versions["AWSPREVIOUS"] = ("v0", "secret-0")
+    assert cache.get_optional("jwt", "AWSPREVIOUS") == "secret-0"
+
+
+def test_rotation_forgets_the_missing_previous_version(cache, client, clock):
+    cache.get("jwt")
+    clock.now += 3
+    assert cache.get_optional("jwt", "AWSPREVIOUS") is None
+
+    client.versions = {"AWSCURRENT": ("v2", "secret-2"), "AWSPREVIOUS": ("v1", "secret-1")}
+    clock.now += 3
+    assert cache.refresh_if_rotated("jwt") is True
+    assert cache.get_optional("jwt", "AWSPREVIOUS") == "secret-1"
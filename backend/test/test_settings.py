@@ -0,0 +1,80 @@
+import dataclasses
+
+import pytest
+
+from settings import ConfigError, Settings, load
+
+LAMBDA = {"LAMBDA_TASK_ROOT": "/var/task", "DB_TABLE": "app-table"}
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_defaults_off_lambda_use_the_local_stage():
+    s = load({})
+    assert s.stage == "local"
+    assert not s.on_lambda and not s.tracing_enabled
+    assert s.password_hash_rounds == 4
+    assert s.refresh_token_expiration == 86400
+    assert s.cursor_secret_name == s.jwt_secret_name
+
+
+def test_lambda_defaults_to_dev():
+    s = load(LAMBDA)
+    assert s.stage == "dev"
+    assert s.password_hash_rounds == Settings.password_hash_rounds
+    assert s.access_token_expiration == 600
+    assert s.tracing_enabled
+
+
+def test_stage_overrides_apply_and_environment_wins():
+    s = load({**LAMBDA, "ENVIRONMENT": "prod"})
+    assert s.jwt_secret_name == "flycalcio-jwtkey-prod-secret"
+    assert s.cursor_secret_name == "flycalcio-jwtkey-prod-secret"
+
+    s = load({**LAMBDA, "ENVIRONMENT": "prod", "JWT_SECRET_NAME": "arn:custom"})
+    assert s.jwt_secret_name == "arn:custom"
+
+
+def test_values_are_parsed_to_the_field_type():
+    s = load({
+        "ACCESS_TOKEN_EXPIRATION": "120", "LAMBDA_TIMEOUT": "30",
+        "AWS_READ_TIMEOUT": "2.5", "AWS_CONNECT_TIMEOUT": "",
+        "POWERTOOLS_TRACE_DISABLED": "true", "AWS_LAMBDA_FUNCTION_NAME": "auth",
+    })
+    assert s.access_token_expiration == 120
+    assert s.lambda_timeout == 30.0
+    assert s.aws_read_timeout == 2.5
+    assert s.aws_connect_timeout is None
+    assert s.function_name == "auth"
+
+
+def test_tracing_follows_powertools_switch():
+    assert not load({**LAMBDA, "POWERTOOLS_TRACE_DISABLED": "true"}).tracing_enabled
+
+
+def test_settings_are_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        load({}).db_table = "other"
+
+
+@pytest.mark.parametrize("environ, message", [
+    ({"ACCESS_TOKEN_EXPIRATION": "ten"}, "ACCESS_TOKEN_EXPIRATION must be a number"),
+    ({"MAX_PAGE_SIZE": "0"}, "MAX_PAGE_SIZE must be > 0"),
+    ({"DEFAULT_PAGE_SIZE": "500"}, "DEFAULT_PAGE_SIZE must not exceed MAX_PAGE_SIZE"),
+    ({"ACCESS_TOKEN_EXPIRATION": "90000"}, "must not exceed REFRESH_TOKEN_EXPIRATION"),
+    ({"PASSWORD_HASHER": "md5"}, "PASSWORD_HASHER must be one of"),
+    ({"JWT_ALGORITHM": "none"}, "JWT_ALGORITHM must be one of"),
+    ({"ENVIRONMENT": "staging"}, "ENVIRONMENT must be one of"),
+    ({"LAMBDA_TASK_ROOT": "/var/task"}, "DB_TABLE is required"),
+    ({**LAMBDA, "ENVIRONMENT": "prod", "PASSWORD_HASH_ROUNDS": "4"}, "at least 10 in prod"),
+])
+def test_invalid_configuration_fails_at_load(environ, message):
+    with pytest.raises(ConfigError, match=message):
+        load(environ)
+
+
+def test_every_problem_is_reported_at_once():
+    with pytest.raises(ConfigError) as raised:
+        load({"MAX_PAGE_SIZE": "0", "EVENT_SHARDS": "-1"})
+    assert "MAX_PAGE_SIZE" in str(raised.value) and "EVENT_SHARDS" in str(raised.value)
@@ -0,0 +1,51 @@
+import pytest
+
+from authorizer.token_cache import TokenCache
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+@pytest.fixture
+def cache(clock):
+    return TokenCache(max_size=2, max_ttl=60, clock=clock)
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_hit_after_put(cache):
+    assert cache.get("token-a") is None
+    cache.put("token-a", {"id": "u1", "exp": 2000})
+    assert cache.get("token-a") == {"id": "u1", "exp": 2000}
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_with_token_exp(cache, clock):
+    cache.put("token-a", {"id": "u1", "exp": 1010})
+    clock.now = 1011
+    assert cache.get("token-a") is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_entries_expire_after_max_ttl(cache, clock):
+    cache.put("token-a", {"id": "u1", "exp": 5000})
+    clock.now = 1061
+    assert cache.get("token-a") is None
+
+
+def test_already_expired_tokens_are_not_cached(cache):
+    cache.put("token-a", {"id": "u1", "exp": 999})
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_is_evicted(cache):
+    cache.put("token-a", {"id": "a"})
+    cache.put("token-b", {"id": "b"})
+    cache.get("token-a")
+    cache.put("token-c", {"id": "c"})
+
+    assert cache.get("token-b") is None
+    assert cache.get("token-a") == {"id": "a"}
+    assert cache.stats()["evictions"] == 1
@@ -0,0 +1,141 @@
+import dataclasses
+
+import pytest
+from botocore.exceptions import ClientError
+
+# ------------------------
+# Fixtures
+# ------------------------
+
+class FakeUsers:
+    """PROFILE and EMAIL# items in memory, and the GSI1 USER listing of legacy profiles."""
+
+    def __init__(self, profiles=None, logins=(), listed=()):
+        self.profiles = profiles or {}
+        self.logins = {login["PK"]: login for login in logins}
+        self.listed = list(listed)
+        self.lookups = 0
+        # Cancellation codes the next transaction fails with, in TransactItems order
+        self.cancel = None
+        self.transactions = []
+
+    def get_profile(self, user_id, fields=None, consistent=False):
+        return self.profiles.get(user_id)
+
+    def get_login(self, key):
+        return self.logins.get(key["PK"])
+
+    def find_by_email(self, email):
+        self.lookups += 1
+        return next((p for p in self.listed if p["email"] == email), None)
+
+    def put(self, item, **request):
+        # attribute_not_exists(PK)
+        if item["PK"] in self.logins:
+            raise ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem")
+        self.logins[item["PK"]] = item
+
+    def transact_write(self, actions):
+        if self.cancel:
+            raise ClientError({
+                "Error": {"Code": "TransactionCanceledException"},
+                "CancellationReasons": [{"Code": code} for code in self.cancel],
+            }, "TransactWriteItems")
+        self.transactions.append(actions)
+
+
+@pytest.fixture(scope="module")
+def users(import_configured):
+    """src.users, imported with a table name and region it can build its clients with."""
+    return import_configured("auth.src.users", db_table="auth-test")
+
+
+@pytest.fixture
+def repo(users, monkeypatch):
+    repo = FakeUsers(
+        profiles={"u1": {"email": "A@example.com"}},
+        logins=[{**users.email_key("a@example.com"), "userId": "u1", "email": "A@example.com", "role": "USER"}],
+    )
+    monkeypatch.setattr(users, "users_repo", repo)
+    return repo
+
+
+def legacy_profile(email, password="hash"):
+    """A user registered before EMAIL# items, found through GSI1 USER / <email>."""
+    return {"PK": "USER#u2", "SK": "PROFILE", "userId": "u2", "email": email, "role": "USER", "password": password}
+
+# ------------------------
+# Tests
+# ------------------------
+
+def test_set_role_updates_profile_and_login_record_together(users, repo):
+    assert users.set_role("u1", "ADMIN") is True
+
+    (profile, login), = repo.transactions
+    assert profile["Update"]["Key"] == {"PK": "USER#u1", "SK": "PROFILE"}
+    assert login["Update"]["Key"] == users.email_key("a@example.com")
+    assert login["Update"]["ExpressionAttributeValues"] == {":role": "ADMIN", ":userId": "u1"}
+
+
+def test_set_role_of_unknown_user_writes_nothing(users, repo):
+    assert users.set_role("missing", "ADMIN") is False
+    assert repo.transactions == []
+
+
+def test_set_role_reports_a_cancelled_transaction(users, repo):
+    repo.cancel = ("ConditionalCheckFailed", "None")
+    assert users.set_role("u1", "ADMIN") is False
+
+
+def test_create_user_writes_login_record_and_profile_together(users, repo):
+    profile = users.create_user("b@example.com", password="hash")
+
+    (login, stored), = repo.transactions
+    assert login["Put"]["Item"] == {**users.email_key("b@example.com"), "userId": profile["userId"],
+                                    "email": "b@example.com", "role": "USER", "password": "hash"}
+    assert stored["Put"]["Item"] == profile and "password" not in profile
+    assert all(a["Put"]["ConditionExpression"] == "attribute_not_exists(PK)" for a in repo.transactions[0])
+
+
+def test_create_user_with_a_taken_email_raises(users, repo):
+    repo.cancel = ("ConditionalCheckFailed", "None")
+    with pytest.raises(users.EmailAlreadyRegistered):
+        users.create_user("a@example.com")
+
+
+def test_create_user_reraises_other_cancellations(users, repo):
+    repo.cancel = ("None", "ConditionalCheckFailed")
+    with pytest.raises(ClientError):
+        users.create_user("b@example.com")
+
+
+def test_login_record_is_read_without_the_fallback(users, repo):
+    assert users.get_login("A@example.com")["userId"] == "u1"
+    assert repo.lookups == 0
+
+
+def test_missing_login_record_is_repaired_from_the_profile(users, repo):
+    repo.listed = [legacy_profile("c@example.com")]
+
+    login = users.get_login("c@example.com")
+
+    assert login == {**users.email_key("c@example.com"), "userId": "u2", "email": "c@example.com",
+                     "role": "USER", "password": "hash"}
+    assert repo.get_login(users.email_key("c@example.com")) == login
+
+
+def test_repair_is_skipped_once_backfilled(users, repo, monkeypatch):
+    repo.listed = [legacy_profile("c@example.com")]
+    monkeypatch.setattr(users, "settings", dataclasses.replace(users.settings, login_repair_enabled=False))
+
+    assert users.get_login("c@example.com") is None
+    assert repo.lookups == 0
+
+
+def test_repair_race_returns_the_record_written_first(users, repo):
+    repo.listed = [legacy_profile("a@example.com", password="old")]
+
+    # The EMAIL# item appeared between the get and the conditional put
+    login = users._repair_login("a@example.com")
+
+    assert login["userId"] == "u1" and "password" not in login
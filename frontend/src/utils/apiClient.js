@@ -24,57 +24,67 @@ apiClient.interceptors.request.use(
   }
 );
 
+// One refresh in flight per tab: concurrent 403s wait for the same request
+// instead of each exchanging (and burning) the refresh token.
+let refreshPromise = null;
+
+const logout = () => {
+  localStorage.removeItem('access_token');
+  localStorage.removeItem('refresh_token');
+  window.location.href = "/login"; // Redirect to login page
+};
+
+const refreshTokens = () => {
+  if (!refreshPromise) {
+    const refreshToken = localStorage.getItem('refresh_token');
+    // Plain axios: a failing refresh must not re-enter this interceptor
+    refreshPromise = axios
+      .post(`${apiClient.defaults.baseURL}auth/refresh`, { refresh_token: refreshToken }, {
+        headers: { 'Content-Type': 'application/json' }
+      })
+      .then((response) => {
+        localStorage.setItem('access_token', response.data.access_token);
+        localStorage.setItem('refresh_token', response.data.refresh_token);
+        return response.data.access_token;
+      })
+      .finally(() => {
+        refreshPromise = null;
+      });
+  }
+  return refreshPromise;
+};
+
 apiClient.interceptors.response.use(
   (response) => response, // Return the successful response
   async (error) => {
-    console.log(error)
-    if (error.response && error.response.status === 403) {
+    const originalRequest = error.config;
+
+    if (error.response && error.response.status === 403 && originalRequest && !originalRequest._retry) {
       // Token expired or unauthorized
-      const refreshToken = localStorage.getItem('refresh_token');
-      console.log("Refresh token:", refreshToken);
-      if (refreshToken) {
-        try {
-          // Maximum number of attempts to refresh the token
-          let retryCount = 0;
-          const maxRetries = 3;
-          
-          // Attempt to refresh the token while retrying
-          while (retryCount < maxRetries) {
-            retryCount++;
-            try {
-              // Send the refresh token to the server to get a new access token
-              const response = await apiClient.post('/auth/refresh', { refreshToken });
-              
-              // Store the new access and refresh tokens
-              localStorage.setItem('access_token', response.data.access_token);
-              localStorage.setItem('refresh_token', response.data.refresh_token);
-                
-              // Retry the original request with the new access token
-              error.config.headers['Authorization'] = `Bearer ${response.data.access_token}`;
-              
-              return apiClient(error.config); // Retry the request
-            } catch (refreshError) {
-              console.error("Refresh token error, retrying...", refreshError);
-              // If refresh token fails, retry up to maxRetries
-            }
-          }
-
-          // If we reached max retries and still failed, log the user out
-          localStorage.removeItem('access_token');
-          localStorage.removeItem('refresh_token');
-          window.location.href = "/login"; // Redirect to login page
-          
-        } catch (refreshError) {
-          // Handle if refresh token request fails (network error, etc.)
-          console.error("Refresh token failed", refreshError);
-          // Log out user and redirect to login
-          localStorage.removeItem('access_token');
-          localStorage.removeItem('refresh_token');
-          window.location.href = "/login"; // Redirect to login page
-        }
-      } else {
+      originalRequest._retry = true;
+
+      if (!localStorage.getItem('refresh_token')) {
         // If no refresh token is found, redirect to login directly
-        window.location.href = "/login";
+        logout();
+        return Promise.reject(error);
+      }
+
+      // Another tab may already have refreshed: retry with its token first
+      const sentToken = (originalRequest.headers.Authorization || '').split(' ').pop();
+      const storedToken = localStorage.getItem('access_token');
+      if (storedToken && storedToken !== sentToken) {
+        originalRequest.headers.Authorization = `Bearer ${storedToken}`;
+        return apiClient(originalRequest);
+      }
+
+      try {
+        const accessToken = await refreshTokens();
+        originalRequest.headers.Authorization = `Bearer ${accessToken}`;
+        return apiClient(originalRequest); // Retry the request
+      } catch (refreshError) {
+        // Refresh token expired, revoked or reused: the session is over
+        console.error("Refresh token failed", refreshError);
+        logout();
       }
     }
 